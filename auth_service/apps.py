@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AuthServiceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'auth_service'
+
+    def ready(self):
+        # Connects the user cache invalidation signals
+        from auth_service.utils import user_cache  # noqa: F401
@@ -0,0 +1,84 @@
+"""
+Benchmarks the login key derivation of every KDF version (see auth_service.utils.hashing).
+
+For each version the command reports the wall clock and CPU time a login spends deriving
+keys, and the cost of testing one password guess along each path an attacker holding a
+database copy can take:
+- against the stored auth key: the full login derivation
+- against the vault records: the vault key derivation, then a trial decryption (not timed,
+  it is a single AES operation)
+
+An attacker takes the cheaper path, so that minimum is the attacker cost per guess.
+
+With client key derivation the browser runs the current version's derivation and the
+server only checks the auth key against the stored verifier (one HMAC), which is reported
+last. The attacker cost per guess is unchanged: the verifier is keyed and its preimage is
+the auth key, which still takes the full derivation to test a guess.
+
+Usage:
+    python manage.py benchmark_kdf
+    python manage.py benchmark_kdf --rounds 20
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from auth_service.utils.hashing import (
+    KDF_VERSION, KDF_VERSION_LEGACY, derive_keys, derive_vault_key, is_auth_verifier_match, make_auth_verifier,
+)
+
+EMAIL = 'benchmark@example.com'
+MASTER_PASSWORD = 'correct horse battery staple'
+
+
+def _median_times(rounds, func, *args):
+    """Runs func rounds times
+    Returns: Median wall clock and median CPU time in milliseconds"""
+    wall, cpu = [], []
+    for _ in range(rounds):
+        start, start_cpu = time.perf_counter(), time.process_time()
+        func(*args)
+        wall.append((time.perf_counter() - start) * 1e3)
+        cpu.append((time.process_time() - start_cpu) * 1e3)
+    return statistics.median(wall), statistics.median(cpu)
+
+
+class Command(BaseCommand):
+    help = "Compare login CPU cost and attacker cost per guess of the KDF versions"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=10, help="Derivations per measurement (default: 10)")
+
+    def handle(self, *args, **options):
+        rounds = options['rounds']
+        if rounds < 1:
+            raise CommandError("--rounds must be at least 1")
+
+        _, vault_cpu = _median_times(rounds, derive_vault_key, EMAIL, MASTER_PASSWORD)
+        logins = {}
+        for version in (KDF_VERSION_LEGACY, KDF_VERSION):
+            wall, cpu = _median_times(rounds, derive_keys, EMAIL, MASTER_PASSWORD, version)
+            logins[version] = cpu
+            self.stdout.write(self.style.MIGRATE_HEADING(f"KDF version {version}"))
+            self.stdout.write(f"  {'login derivation (wall clock)':<45} {wall:>10,.2f} ms")
+            self.stdout.write(f"  {'login derivation (CPU)':<45} {cpu:>10,.2f} ms")
+            self.stdout.write(f"  {'attacker guess against auth key (CPU)':<45} {cpu:>10,.2f} ms")
+            self.stdout.write(f"  {'attacker guess against vault records (CPU)':<45} {vault_cpu:>10,.2f} ms")
+            self.stdout.write(f"  {'attacker cost per guess (cheapest path)':<45} {min(cpu, vault_cpu):>10,.2f} ms")
+
+        auth_key = derive_keys(EMAIL, MASTER_PASSWORD, KDF_VERSION)[1]
+        verifier = make_auth_verifier(auth_key)
+        # A single verification is too fast to time on its own, time batches of 1000
+        _, verify_cpu = _median_times(rounds, lambda: [is_auth_verifier_match(verifier, auth_key) for _ in range(1000)])
+        verify_cpu /= 1000
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Client key derivation (KDF version {KDF_VERSION})"))
+        self.stdout.write(f"  {'login verification (CPU)':<45} {verify_cpu:>10,.4f} ms")
+        attacker_cpu = min(logins[KDF_VERSION], vault_cpu)
+        self.stdout.write(f"  {'attacker cost per guess (cheapest path)':<45} {attacker_cpu:>10,.2f} ms")
+
+        ratio = logins[KDF_VERSION] / logins[KDF_VERSION_LEGACY]
+        self.stdout.write(self.style.SUCCESS(
+            f"Version {KDF_VERSION} login CPU is {ratio:.0%} of version {KDF_VERSION_LEGACY}, "
+            f"client key derivation login CPU is {verify_cpu / logins[KDF_VERSION]:.3%} of version {KDF_VERSION}"
+        ))
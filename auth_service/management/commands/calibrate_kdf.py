@@ -0,0 +1,158 @@
+"""
+Calibrates the vault key KDF parameters for new accounts (see auth_service.utils.kdf).
+
+The command times derivations on this machine and picks parameters that take about the
+target time within the per-derivation memory budget:
+- pbkdf2_sha256: iterations scaled from a timed probe
+- scrypt: r=8 and the largest power of two n within the memory budget (halved while a
+  derivation is slower than the target), then p raised towards the target
+- argon2id: the memory budget as memory_cost, then time_cost raised towards the target
+  (only if argon2-cffi is installed)
+Raising p or time_cost stops before a step would leave the memory budget. Parameters never
+go below the minimums for new accounts (KDF.minimums), and an algorithm whose minimum does
+not fit the memory budget is reported and not recommended.
+
+Derivations run on the KDF executor, so the server needs the per-derivation memory times
+AUTH_KDF_MAX_WORKERS. Unless --max-memory-mib is given, the budget is KDF_MEMORY_SHARE of
+the instance memory (--instance-memory-mib, the 256 MiB of an App Engine F2 by default)
+split between the KDF workers, which leaves the rest to Django and the database
+connections. Memory-hard algorithms (scrypt, argon2id) make each attacker guess cost that
+memory as well as the time, so they are preferred over PBKDF2.
+
+Usage:
+    python manage.py calibrate_kdf
+    python manage.py calibrate_kdf --instance-memory-mib 512
+    python manage.py calibrate_kdf --algorithm scrypt --target-ms 250 --max-memory-mib 32
+"""
+
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from auth_service.utils.kdf import KDFS, get_kdf
+
+PASSWORD = b'correct horse battery staple'
+SALT = b'calibrate@example.com'
+MIB = 1 << 20
+
+# Memory of the App Engine instance class in app.yaml (F2) and the share of it KDF workers may use
+INSTANCE_MEMORY_MIB = 256
+KDF_MEMORY_SHARE = 0.125
+
+
+def _time_ms(kdf, params, rounds=3):
+    """Returns: Median time in milliseconds of deriving a key with params"""
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        kdf.derive(PASSWORD, SALT, params)
+        times.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(times)
+
+
+def _raise_until(kdf, params, key, target_ms, max_memory):
+    """Raises params[key] by the ratio of the target to the measured time until a derivation
+    reaches the target, or the next step would need more than max_memory bytes
+    Returns: Calibrated parameters and their time in milliseconds"""
+    elapsed = _time_ms(kdf, params)
+    while elapsed < target_ms * 0.9:
+        raised = dict(params, **{key: max(params[key] + 1, int(params[key] * target_ms / elapsed))})
+        if kdf.memory(raised) > max_memory:
+            break
+        params = raised
+        elapsed = _time_ms(kdf, params)
+    return params, elapsed
+
+
+def calibrate_pbkdf2(kdf, target_ms, max_memory):
+    probe = {'iterations': 10000}
+    iterations = int(probe['iterations'] * target_ms / _time_ms(kdf, probe))
+    params = {'iterations': max(kdf.minimums['iterations'], round(iterations, -3))}
+    return params, _time_ms(kdf, params)
+
+
+def calibrate_scrypt(kdf, target_ms, max_memory):
+    r = kdf.minimums['r']
+    n = max(kdf.minimums['n'], 1 << max(1, (max_memory // (128 * r) - 1).bit_length() - 1))
+    params = {'n': n, 'r': r, 'p': 1}
+    while n > kdf.minimums['n'] and kdf.memory(params) > max_memory:
+        n //= 2
+        params['n'] = n
+    while n > kdf.minimums['n'] and _time_ms(kdf, params, rounds=1) > target_ms:
+        n //= 2
+        params['n'] = n
+    if kdf.memory(params) > max_memory:
+        return params, None
+    return _raise_until(kdf, params, 'p', target_ms, max_memory)
+
+
+def calibrate_argon2id(kdf, target_ms, max_memory):
+    params = {
+        'time_cost': kdf.minimums['time_cost'],
+        'memory_cost': max(kdf.minimums['memory_cost'], max_memory // 1024),
+        'parallelism': 1,
+    }
+    if kdf.memory(params) > max_memory:
+        return params, None
+    return _raise_until(kdf, params, 'time_cost', target_ms, max_memory)
+
+
+CALIBRATORS = {
+    'pbkdf2_sha256': calibrate_pbkdf2,
+    'scrypt': calibrate_scrypt,
+    'argon2id': calibrate_argon2id,
+}
+
+
+class Command(BaseCommand):
+    help = "Pick vault key KDF parameters for new accounts that fit a time and memory budget"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--algorithm', choices=sorted(KDFS),
+                            help="Calibrate one algorithm (default: every available algorithm)")
+        parser.add_argument('--target-ms', type=float, default=150,
+                            help="Target derivation time in milliseconds (default: 150)")
+        parser.add_argument('--instance-memory-mib', type=int, default=INSTANCE_MEMORY_MIB,
+                            help=f"Memory of one server instance in MiB (default: {INSTANCE_MEMORY_MIB})")
+        parser.add_argument('--max-memory-mib', type=float,
+                            help="Memory budget of one derivation in MiB (default: the KDF share of the "
+                                 "instance memory divided by AUTH_KDF_MAX_WORKERS)")
+
+    def handle(self, *args, **options):
+        workers = settings.AUTH_KDF_MAX_WORKERS
+        target_ms, max_memory_mib = options['target_ms'], options['max_memory_mib']
+        if max_memory_mib is None:
+            max_memory_mib = options['instance_memory_mib'] * KDF_MEMORY_SHARE / workers
+        if target_ms <= 0 or max_memory_mib <= 0:
+            raise CommandError("--target-ms, --instance-memory-mib and --max-memory-mib must be positive")
+        algorithms = [options['algorithm']] if options['algorithm'] else [a for a in CALIBRATORS if a in KDFS]
+
+        self.stdout.write(f"Memory budget per derivation: {max_memory_mib:,.2f} MiB")
+        recommended = None
+        for algorithm in algorithms:
+            kdf = get_kdf(algorithm)
+            params, elapsed = CALIBRATORS[algorithm](kdf, target_ms, int(max_memory_mib * MIB))
+            memory = kdf.memory(params) / MIB
+            self.stdout.write(self.style.MIGRATE_HEADING(algorithm))
+            if elapsed is None:
+                self.stdout.write(f"  minimum {json.dumps(params)} needs {memory:,.2f} MiB, over the memory budget")
+                continue
+            self.stdout.write(f"  {'parameters':<30} {json.dumps(params)}")
+            self.stdout.write(f"  {'derivation time':<30} {elapsed:>10,.2f} ms")
+            self.stdout.write(f"  {'memory per derivation':<30} {memory:>10,.2f} MiB")
+            self.stdout.write(f"  {f'memory for {workers} KDF workers':<30} {memory * workers:>10,.2f} MiB")
+            if recommended is None or kdf.memory(params):
+                recommended = (algorithm, params)
+
+        if 'argon2id' not in KDFS:
+            self.stdout.write("argon2id is unavailable, install argon2-cffi to calibrate it")
+        if recommended is None:
+            raise CommandError("No algorithm fits the memory budget at its minimum parameters")
+        algorithm, params = recommended
+        self.stdout.write(self.style.SUCCESS(
+            "Settings for new accounts (memory-hard algorithms are preferred, existing accounts keep theirs):"
+        ))
+        self.stdout.write(f"AUTH_KDF_ALGORITHM={algorithm}")
+        self.stdout.write(f"AUTH_KDF_PARAMS='{json.dumps(params, separators=(',', ':'))}'")
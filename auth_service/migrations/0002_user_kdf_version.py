@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_service', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='kdf_version',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+    ]
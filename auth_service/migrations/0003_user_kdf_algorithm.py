@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:17
+
+import auth_service.utils.kdf
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_service', '0002_user_kdf_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='kdf_algorithm',
+            field=models.CharField(default='pbkdf2_sha256', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='kdf_params',
+            field=models.JSONField(default=auth_service.utils.kdf.legacy_kdf_params),
+        ),
+    ]
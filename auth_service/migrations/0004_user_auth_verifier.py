@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_service', '0003_user_kdf_algorithm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='auth_verifier',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
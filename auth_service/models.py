@@ -1,14 +1,26 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from auth_service.utils.hashing import KDF_VERSION_LEGACY
+from auth_service.utils.kdf import LEGACY_ALGORITHM, legacy_kdf_params
 
 
 class User(AbstractUser):
     """
     Custom User model to extend Django's AbstractUser to include
-    an auth_key field
+    an auth_key field and the KDF scheme version it was derived with
     """
     # AES 256-bit/32 byte key is 64 chars when converted to hex
     auth_key = models.CharField(max_length=64, null=True, blank=True)
+    # See auth_service.utils.hashing: rows created before versioning hold version 1 keys,
+    # registration stores the current version and login upgrades older versions
+    kdf_version = models.PositiveSmallIntegerField(default=KDF_VERSION_LEGACY)
+    # Vault key KDF fixed at registration (see auth_service.utils.kdf), rows created before
+    # it was stored use 100,000 PBKDF2 iterations
+    kdf_algorithm = models.CharField(max_length=32, default=LEGACY_ALGORITHM)
+    kdf_params = models.JSONField(default=legacy_kdf_params)
+    # HMAC verifier of the current auth key (see auth_service.utils.hashing), replaces
+    # auth_key on the next master password login
+    auth_verifier = models.CharField(max_length=64, null=True, blank=True)
 
     def __str__(self):
         return self.username
@@ -19,12 +19,18 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.models import AbstractUser
 from django_otp.plugins.otp_totp.models import TOTPDevice
-from auth_service.utils.hashing import derive_vault_key, derive_auth_key, is_auth_key_match
+from auth_service.utils.hashing import (
+    KDF_VERSION, derive_keys, expand_auth_key, is_auth_key_match, is_auth_verifier_match, make_auth_verifier,
+)
+from auth_service.utils.kdf import PBKDF2SHA256, default_kdf
 from auth_service.utils.mfa import create_signed_token, validate_signed_token
 import qrcode
 import io
 import base64
 
+# Algorithms browsers can derive with WebCrypto (see deriveLoginKeys in the frontend)
+CLIENT_KDF_ALGORITHMS = frozenset({PBKDF2SHA256.name})
+
 User = get_user_model()
 
 
@@ -66,8 +72,10 @@ class RegisterSerializer(serializers.ModelSerializer):
 
         Handles:
             - Extract credentials from validated_data
-            - Derive determinstic 256 bit AES auth and vault keys using PBKDF2
-            - Create a new User instance with the derived auth key
+            - Derive determinstic 256 bit AES auth and vault keys with the current
+              KDF version and the configured vault key KDF (see auth_service.utils.hashing)
+            - Create a new User instance with the verifier of the derived auth key,
+              KDF version, algorithm and parameters
 
         Receives:
             - validated_data (dict): Validated registration data
@@ -80,8 +88,8 @@ class RegisterSerializer(serializers.ModelSerializer):
         master_password = validated_data['password']
 
         # Derive vault key and auth key
-        vault_key = derive_vault_key(email, master_password)
-        auth_key = derive_auth_key(vault_key, master_password)
+        algorithm, params = default_kdf()
+        vault_key, auth_key = derive_keys(email, master_password, KDF_VERSION, algorithm, params)
 
         self.validated_data['vault_key'] = vault_key
 
@@ -89,7 +97,10 @@ class RegisterSerializer(serializers.ModelSerializer):
         user = User.objects.create(
             username=username,
             email=email,
-            auth_key=auth_key.hex()
+            auth_verifier=make_auth_verifier(auth_key),
+            kdf_version=KDF_VERSION,
+            kdf_algorithm=algorithm,
+            kdf_params=params
         )
         user.save()
 
@@ -114,38 +125,73 @@ class LoginSerializer(serializers.Serializer):
     Serializer for authenticating an existing user
 
     Handles:
-        - Validating user credentials against stored auth key
-        - Deriving and comparing deterministic keys
+        - Master password login: deriving the keys on the server and comparing
+          the auth key with the stored verifier (or legacy auth key)
+        - Client key derivation login: the client derives the keys itself and
+          sends only the auth key, which is checked with one HMAC
+        - Migrating legacy auth keys of any KDF version to a verifier after a
+          successful master password login
     """
     username = serializers.CharField(write_only=True, required=True)
-    password = serializers.CharField(write_only=True, required=True)
+    password = serializers.CharField(write_only=True, required=False)
+    auth_key = serializers.RegexField(r'^[0-9a-fA-F]{64}$', write_only=True, required=False)
 
     def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Validate user credentials by comparing derived and stored auth keys
+        Validate user credentials by comparing the auth key with the stored verifier
 
         Raises:
             - serializers.ValidationError:
+                - If neither or both of password and auth_key are given
                 - If the user doesn't exist
+                - If the account has no verifier yet and an auth_key is given
                 - If the the provided credentials are invalid
 
         Returns:
-            - attrs(dict): Validated data with the authenticated User instance
+            - attrs(dict): Validated data with the authenticated User instance and
+              the vault key (None when the client derived it)
         """
         username = attrs.get('username')
         master_password = attrs.get('password')
+        client_auth_key = attrs.get('auth_key')
+
+        if (master_password is None) == (client_auth_key is None):
+            raise serializers.ValidationError({"password": "Provide either the password or the auth_key."})
 
         try:
             user = User.objects.get(username=username)
         except User.DoesNotExist:
             raise serializers.ValidationError({"user": "User not found"})
 
-        # Derive the auth key and compared with the stored auth key
-        vault_key = derive_vault_key(user.email, master_password)
-        auth_key = derive_auth_key(vault_key, master_password)
+        if client_auth_key is not None:
+            # Client key derivation, the server never sees the master password or vault key
+            if not user.auth_verifier:
+                raise serializers.ValidationError(
+                    {"auth_key": "Log in with the master password once to enable client key derivation."}
+                )
+            if not is_auth_verifier_match(user.auth_verifier, client_auth_key):
+                raise serializers.ValidationError('Invalid username or password.')
+            attrs['user'] = user
+            attrs['vault_key'] = None
+            return attrs
+
+        # Derive the auth key with the user's KDF version and compare with the stored credential
+        vault_key, auth_key = derive_keys(
+            user.email, master_password, user.kdf_version, user.kdf_algorithm, user.kdf_params
+        )
+
+        if user.auth_verifier:
+            if not is_auth_verifier_match(user.auth_verifier, auth_key):
+                raise serializers.ValidationError('Invalid username or password.')
+        else:
+            if not is_auth_key_match(user.auth_key, auth_key):
+                raise serializers.ValidationError('Invalid username or password.')
 
-        if not is_auth_key_match(user.auth_key, auth_key):
-            raise serializers.ValidationError('Invalid username or password.')
+            # The vault key is the same in every version, so the migration only re-derives the auth key
+            user.auth_verifier = make_auth_verifier(expand_auth_key(vault_key, master_password))
+            user.auth_key = None
+            user.kdf_version = KDF_VERSION
+            user.save(update_fields=['auth_key', 'auth_verifier', 'kdf_version'])
 
         attrs['user'] = user
         attrs['vault_key'] = vault_key
@@ -167,6 +213,51 @@ class LoginSerializer(serializers.Serializer):
         }
 
 
+class PreLoginSerializer(serializers.Serializer):
+    """
+    Serializer for the key derivation parameters of an existing user
+
+    Handles:
+        - Looking up the user a client is about to log in as
+        - Returning what the client needs to derive the auth key itself,
+          including the vault key salt (the account email)
+    """
+    username = serializers.CharField(write_only=True, required=True)
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate the username and fetch the corresponding user.
+
+        Raises:
+            - serializers.ValidationError: If the user doesn't exist
+
+        Returns:
+            - dict: Validated data containing the user instance
+        """
+        try:
+            attrs['user'] = User.objects.get(username=attrs.get('username'))
+        except User.DoesNotExist:
+            raise serializers.ValidationError({"user": "User not found"})
+        return attrs
+
+    def to_representation(self, instance: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Control what's returned for the user's key derivation parameters.
+
+        Returns:
+            - dict: KDF version, algorithm, parameters and salt, and whether the
+              account accepts a client-derived auth key
+        """
+        user = instance['user']
+        return {
+            "kdf_version": KDF_VERSION,
+            "kdf_algorithm": user.kdf_algorithm,
+            "kdf_params": user.kdf_params,
+            "salt": user.email,
+            "client_key_derivation": bool(user.auth_verifier) and user.kdf_algorithm in CLIENT_KDF_ALGORITHMS,
+        }
+
+
 class MFASetupSerializer(serializers.Serializer):
     """
     Serializer for initializing MFA setup.
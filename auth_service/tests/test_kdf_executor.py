@@ -0,0 +1,138 @@
+"""
+Auth Service KDF Executor Tests
+
+This module provides tests for auth_service.utils.kdf_executor and the
+503/Retry-After responses of the login and registration endpoints.
+"""
+
+import threading
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_service.utils.kdf_executor import KDFExecutor, KDFUnavailable, get_kdf_executor
+
+User = get_user_model()
+
+
+class KDFExecutorTests(TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def occupy(self, executor, count):
+        """Start count derivations that block until self.release is set"""
+        started = threading.Semaphore(0)
+
+        def blocked():
+            started.release()
+            self.release.wait(5)
+
+        threads = [threading.Thread(target=executor.run, args=(blocked,)) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for _ in range(min(count, executor.max_workers)):
+            started.acquire(timeout=5)
+        return threads
+
+    def test_run_returns_result(self):
+        """Ensure derivations run on the executor and are counted"""
+        executor = KDFExecutor(max_workers=2, max_queue=2)
+        self.addCleanup(executor.shutdown)
+        self.assertEqual(executor.run(pow, 2, 10), 1024)
+        with self.assertRaises(ZeroDivisionError):
+            executor.run(divmod, 1, 0)
+        metrics = executor.metrics()
+        self.assertEqual((metrics['completed'], metrics['active'], metrics['queue_depth']), (2, 0, 0))
+
+    def test_rejects_when_queue_full(self):
+        """Ensure derivations are rejected at once when every worker and queue slot is taken"""
+        executor = KDFExecutor(max_workers=1, max_queue=1, retry_after=7)
+        self.addCleanup(executor.shutdown)
+        threads = self.occupy(executor, 2)
+
+        with self.assertRaises(KDFUnavailable) as context:
+            executor.run(pow, 2, 2)
+        self.assertEqual(context.exception.retry_after, 7)
+        metrics = executor.metrics()
+        self.assertEqual((metrics['active'], metrics['queue_depth'], metrics['rejected']), (1, 1, 1))
+
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(executor.run(pow, 2, 2), 4)
+        self.assertEqual(executor.metrics()['completed'], 3)
+
+    def test_queue_timeout(self):
+        """Ensure a queued derivation that does not start in time is cancelled and frees its slot"""
+        executor = KDFExecutor(max_workers=1, max_queue=1, timeout=0.05)
+        self.addCleanup(executor.shutdown)
+        threads = self.occupy(executor, 1)
+
+        with self.assertRaises(KDFUnavailable):
+            executor.run(pow, 2, 2)
+        metrics = executor.metrics()
+        self.assertEqual((metrics['timed_out'], metrics['queue_depth']), (1, 0))
+
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(executor.run(pow, 2, 3), 8)
+        self.assertGreater(executor.metrics()['max_wait_ms'], 0)
+
+    def test_invalid_configuration(self):
+        """Ensure an executor without workers is rejected"""
+        with self.assertRaises(ValueError):
+            KDFExecutor(max_workers=0)
+
+
+@override_settings(AUTH_KDF_MAX_WORKERS=1, AUTH_KDF_MAX_QUEUE=0, AUTH_KDF_RETRY_AFTER=3)
+class KDFUnavailableViewTests(APITestCase):
+
+    def setUp(self):
+        csrf_response = self.client.get(reverse('auth_service:csrf-token-api'))
+        self.csrf = csrf_response.cookies.get('csrftoken').value
+        self.client.cookies['csrftoken'] = self.csrf
+        User.objects.create(username='bcurley', email='curleyr@oregonstate.edu', auth_key='00' * 32)
+
+        # Occupy the only worker of the executor used by the views
+        release, started = threading.Event(), threading.Event()
+        self.addCleanup(release.set)
+        thread = threading.Thread(target=get_kdf_executor().run, args=(lambda: started.set() or release.wait(5),))
+        thread.start()
+        self.addCleanup(thread.join)
+        started.wait(5)
+
+    def test_login_and_register_rejected_with_retry_after(self):
+        """Ensure saturated key derivation returns 503 with Retry-After instead of waiting"""
+        for url, data in (
+            (reverse('auth_service:login-api'), {"username": "bcurley", "password": "ThisIsMyStrongPassword123"}),
+            (reverse('auth_service:register-api'), {
+                "username": "rcurley", "email": "rcurley@oregonstate.edu",
+                "password": "ThisIsMyStrongPassword123", "password2": "ThisIsMyStrongPassword123",
+            }),
+        ):
+            response = self.client.post(url, data, format='json', HTTP_X_CSRFTOKEN=self.csrf)
+            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            self.assertEqual(response['Retry-After'], '3')
+            self.assertIn('error', response.data)
+        self.assertFalse(User.objects.filter(username='rcurley').exists())
+
+    def test_kdf_status_requires_admin(self):
+        """Ensure the KDF status endpoint is not available to anonymous or regular users"""
+        url = reverse('auth_service:kdf-status-api')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_authenticate(user=User.objects.get(username='bcurley'))
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_kdf_status_reports_metrics(self):
+        """Ensure the KDF status endpoint exports queue depth and wait times"""
+        admin = User.objects.create(username='admin', email='admin@oregonstate.edu', is_staff=True)
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(reverse('auth_service:kdf-status-api'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['max_workers'], response.data['active']), (1, 1))
+        self.assertIn('queue_depth', response.data)
+        self.assertIn('wait_p95_ms', response.data)
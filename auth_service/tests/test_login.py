@@ -13,6 +13,9 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from django_otp.plugins.otp_totp.models import TOTPDevice
+from auth_service.utils.hashing import KDF_VERSION, KDF_VERSION_LEGACY, derive_keys, make_auth_verifier
+from auth_service.utils.kdf import default_kdf, legacy_kdf_params
+from auth_service.utils.mfa import validate_signed_token
 
 User = get_user_model()
 
@@ -125,6 +128,167 @@ class LoginTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('error', response.data)
 
+    def test_registration_uses_current_kdf_version(self):
+        """
+        Ensure newly registered users store the verifier of an auth key of the current KDF version
+        """
+        user = User.objects.get(username=self.username)
+        self.assertEqual(user.kdf_version, KDF_VERSION)
+        self.assertIsNone(user.auth_key)
+        self.assertEqual(user.auth_verifier, make_auth_verifier(
+            derive_keys(self.email, self.password, KDF_VERSION, *default_kdf())[1]
+        ))
+
+    def test_login_upgrades_legacy_kdf_version(self):
+        """
+        Ensure a user with a legacy auth key can log in, is migrated to a verifier of the
+        current KDF version and keeps the same vault key
+        """
+        vault_key, legacy_auth_key = derive_keys(self.email, self.password, KDF_VERSION_LEGACY)
+        User.objects.filter(username=self.username).update(
+            auth_key=legacy_auth_key.hex(), auth_verifier=None, kdf_version=KDF_VERSION_LEGACY,
+            kdf_params=legacy_kdf_params()
+        )
+
+        url = reverse('auth_service:login-api')
+        data = {
+            "username": self.username,
+            "password": self.password
+        }
+        for _ in range(2):
+            response = self.client.post(url, data, format='json',
+                                        HTTP_X_CSRFTOKEN=self.client.cookies['csrftoken'].value)
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+            user = User.objects.get(username=self.username)
+            self.assertEqual(user.kdf_version, KDF_VERSION)
+            self.assertIsNone(user.auth_key)
+            self.assertEqual(
+                user.auth_verifier, make_auth_verifier(derive_keys(self.email, self.password, KDF_VERSION)[1])
+            )
+            self.assertEqual(derive_keys(self.email, self.password, user.kdf_version)[0], vault_key)
+
+    def test_login_invalid_password_does_not_upgrade(self):
+        """
+        Ensure a failed login leaves a legacy auth key untouched
+        """
+        legacy_auth_key = derive_keys(self.email, self.password, KDF_VERSION_LEGACY)[1].hex()
+        User.objects.filter(username=self.username).update(
+            auth_key=legacy_auth_key, auth_verifier=None, kdf_version=KDF_VERSION_LEGACY,
+            kdf_params=legacy_kdf_params()
+        )
+
+        url = reverse('auth_service:login-api')
+        data = {
+            "username": self.username,
+            "password": 'ThisIsMyStrongPassword12'
+        }
+        response = self.client.post(url, data, format='json', HTTP_X_CSRFTOKEN=self.client.cookies['csrftoken'].value)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        user = User.objects.get(username=self.username)
+        self.assertEqual((user.auth_key, user.kdf_version), (legacy_auth_key, KDF_VERSION_LEGACY))
+        self.assertIsNone(user.auth_verifier)
+
+    def test_login_with_client_derived_auth_key(self):
+        """
+        Ensure a client that derives the keys itself logs in with the auth key alone,
+        and the MFA flow does not carry a vault key
+        """
+        auth_key = derive_keys(self.email, self.password, KDF_VERSION, *default_kdf())[1].hex()
+
+        url = reverse('auth_service:login-api')
+        data = {
+            "username": self.username,
+            "auth_key": auth_key
+        }
+        response = self.client.post(url, data, format='json', HTTP_X_CSRFTOKEN=self.client.cookies['csrftoken'].value)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        token = validate_signed_token(response.cookies['mfa-setup-token'].value, salt='mfa-setup', max_age=300)
+        self.assertIsNone(token['vault_key'])
+
+    def test_login_client_auth_key_rejects_invalid_keys(self):
+        """
+        Ensure a wrong auth key, the stored verifier itself and a password together
+        with an auth key are all rejected
+        """
+        user = User.objects.get(username=self.username)
+        url = reverse('auth_service:login-api')
+        for data in (
+            {"username": self.username, "auth_key": '00' * 32},
+            {"username": self.username, "auth_key": user.auth_verifier},
+            {"username": self.username, "auth_key": 'zz' * 32},
+            {"username": self.username, "password": self.password,
+             "auth_key": derive_keys(self.email, self.password, KDF_VERSION, *default_kdf())[1].hex()},
+        ):
+            response = self.client.post(url, data, format='json',
+                                        HTTP_X_CSRFTOKEN=self.client.cookies['csrftoken'].value)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_login_client_auth_key_requires_migration(self):
+        """
+        Ensure a legacy account only accepts a client-derived auth key after its next
+        master password login has migrated it to a verifier
+        """
+        legacy_auth_key = derive_keys(self.email, self.password, KDF_VERSION_LEGACY)[1].hex()
+        User.objects.filter(username=self.username).update(
+            auth_key=legacy_auth_key, auth_verifier=None, kdf_version=KDF_VERSION_LEGACY,
+            kdf_params=legacy_kdf_params()
+        )
+
+        url = reverse('auth_service:login-api')
+        prelogin_url = reverse('auth_service:prelogin-api')
+        client_data = {
+            "username": self.username,
+            "auth_key": derive_keys(self.email, self.password, KDF_VERSION)[1].hex()
+        }
+        response = self.client.post(prelogin_url, {"username": self.username}, format='json')
+        self.assertFalse(response.data['client_key_derivation'])
+        response = self.client.post(url, client_data, format='json',
+                                    HTTP_X_CSRFTOKEN=self.client.cookies['csrftoken'].value)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('auth_key', response.data['error'])
+
+        data = {
+            "username": self.username,
+            "password": self.password
+        }
+        response = self.client.post(url, data, format='json', HTTP_X_CSRFTOKEN=self.client.cookies['csrftoken'].value)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.post(prelogin_url, {"username": self.username}, format='json')
+        self.assertTrue(response.data['client_key_derivation'])
+        response = self.client.post(url, client_data, format='json',
+                                    HTTP_X_CSRFTOKEN=self.client.cookies['csrftoken'].value)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_prelogin_returns_kdf_parameters(self):
+        """
+        Ensure the prelogin endpoint reports the user's key derivation parameters
+        and rejects unknown users
+        """
+        url = reverse('auth_service:prelogin-api')
+        response = self.client.post(url, {"username": self.username}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            "kdf_version": KDF_VERSION,
+            "kdf_algorithm": 'pbkdf2_sha256',
+            "kdf_params": {'iterations': 600000},
+            "salt": self.email,
+            "client_key_derivation": True,
+        })
+
+        response = self.client.post(url, {"username": 'nobody'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_prelogin_client_key_derivation_pbkdf2_only(self):
+        """
+        Ensure accounts with a KDF browsers cannot derive are told to log in with the master password
+        """
+        User.objects.filter(username=self.username).update(
+            kdf_algorithm='scrypt', kdf_params={'n': 1024, 'r': 8, 'p': 1}
+        )
+        response = self.client.post(reverse('auth_service:prelogin-api'), {"username": self.username}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['client_key_derivation'])
+
     def test_login_missing_username(self):
         """
         Ensure we get an error when attempting to
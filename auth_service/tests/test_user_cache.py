@@ -0,0 +1,127 @@
+"""
+Auth Service User Cache Tests
+
+This module provides tests for auth_service.utils.user_cache and the cached user
+lookup of CookieJWTAuthentication.
+"""
+
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from auth_service.utils.authentication import CookieJWTAuthentication
+from auth_service.utils.user_cache import UserCache, get_user_cache
+
+User = get_user_model()
+
+
+class UserCacheTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username='bcurley', email='curleyr@oregonstate.edu')
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.factory = APIRequestFactory()
+        get_user_cache().clear()
+        self.addCleanup(get_user_cache().clear)
+
+    def authenticate(self):
+        request = self.factory.get('/')
+        request.COOKIES['accesstoken'] = self.token
+        return CookieJWTAuthentication().authenticate(request)[0]
+
+    def test_warm_cache_runs_no_queries(self):
+        """Ensure only the first request loads the user from the database"""
+        with self.assertNumQueries(1):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertEqual((user.pk, user.username, user.is_authenticated), (self.user.pk, 'bcurley', True))
+
+    def test_cached_user_loads_other_fields(self):
+        """Ensure fields that are not cached are loaded from the database on access"""
+        self.authenticate()
+        user = self.authenticate()
+        with self.assertNumQueries(1):
+            self.assertEqual(user.kdf_algorithm, self.user.kdf_algorithm)
+
+    def test_hits_return_fresh_instances(self):
+        """Ensure changes a request makes to its user do not leak into later requests"""
+        self.authenticate()
+        user = self.authenticate()
+        user.username = 'changed'
+        self.assertEqual(self.authenticate().username, 'bcurley')
+
+    def test_save_invalidates(self):
+        """Ensure a saved user is reloaded and a deactivated user is rejected"""
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_delete_invalidates(self):
+        """Ensure a deleted user is rejected"""
+        self.authenticate()
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    @override_settings(AUTH_USER_CACHE_SIZE=0)
+    def test_disabled_cache_queries_every_request(self):
+        """Ensure a cache size of 0 loads the user on every request"""
+        self.authenticate()
+        with self.assertNumQueries(1):
+            self.authenticate()
+
+    @override_settings(AUTH_USER_CACHE_BACKEND='default')
+    def test_shared_backend(self):
+        """Ensure a shared cache backend serves warm requests and is invalidated on save"""
+        get_user_cache().invalidate(self.user.pk)
+        self.authenticate()
+        self.assertEqual(get_user_cache()._entries, {})
+        with self.assertNumQueries(0):
+            self.authenticate()
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.authenticate()
+
+    @override_settings(AUTH_USER_CACHE_TTL=3600)
+    def test_ttl_capped_at_access_token_lifetime(self):
+        """Ensure entries never outlive the access token lifetime"""
+        self.assertEqual(get_user_cache().ttl, 15 * 60)
+
+    def test_expiry_and_lru_eviction(self):
+        """Ensure entries expire after the ttl and the least recently used entry is evicted"""
+        cache = UserCache(maxsize=2, ttl=10)
+        other = User.objects.create(username='other', email='other@oregonstate.edu')
+        third = User.objects.create(username='third', email='third@oregonstate.edu')
+        with patch('auth_service.utils.user_cache.time.monotonic', return_value=100):
+            cache.set(self.user.pk, self.user)
+            cache.set(other.pk, other)
+            cache.get(self.user.pk)
+            cache.set(third.pk, third)
+            self.assertIsNone(cache.get(other.pk))
+            self.assertEqual(cache.get(self.user.pk).username, 'bcurley')
+        with patch('auth_service.utils.user_cache.time.monotonic', return_value=110):
+            self.assertIsNone(cache.get(self.user.pk))
+
+
+class VaultUserCacheTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username='bcurley', email='curleyr@oregonstate.edu')
+        self.client.cookies['accesstoken'] = str(RefreshToken.for_user(self.user).access_token)
+        get_user_cache().clear()
+        self.addCleanup(get_user_cache().clear)
+
+    def test_vault_list_skips_user_query_when_warm(self):
+        """Ensure a warm vault list request only queries the records"""
+        url = reverse('record-list')
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
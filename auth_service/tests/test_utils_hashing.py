@@ -4,8 +4,13 @@ Auth Service Hashing Utils Tests
 This module provides tests for auth_service.utils.hashing.
 """
 
-from django.test import TestCase
-from auth_service.utils.hashing import _to_bytes, derive_vault_key, derive_auth_key, is_auth_key_match
+import io
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from auth_service.utils.hashing import (
+    KDF_VERSION, KDF_VERSION_LEGACY, _to_bytes, derive_auth_key, derive_keys, derive_vault_key, expand_auth_key,
+    hkdf_expand, is_auth_key_match, is_auth_verifier_match, make_auth_verifier,
+)
 
 
 class UtilsTests(TestCase):
@@ -154,3 +159,67 @@ class UtilsTests(TestCase):
         auth_key_2 = derive_auth_key(vault_key, self.password)
 
         self.assertTrue(is_auth_key_match(auth_key_1, auth_key_2))
+
+
+class KDFVersionTests(TestCase):
+
+    def setUp(self):
+        self.email = 'curleyr@oregonstate.edu'
+        self.password = 'ThisIsMyStrongPassword123'
+
+    def test_hkdf_expand_matches_rfc_5869(self):
+        """Ensure HKDF-Expand matches RFC 5869 test case 1"""
+        prk = bytes.fromhex('077709362c2e32df0ddc3f0dc47bba6390b6c73bb50f9c3122ec844ad7c2b3e5')
+        okm = hkdf_expand(prk, bytes.fromhex('f0f1f2f3f4f5f6f7f8f9'), 42)
+        self.assertEqual(okm.hex(), '3cb25f25faacd57a90434f64d0362f2a2d2d0a90cf1a5a4c5db02d56ecc4c5bf34007208d5b887185865')
+
+    def test_legacy_version_matches_two_pbkdf2_derivations(self):
+        """Ensure version 1 keys are unchanged so existing users can still log in"""
+        vault_key = derive_vault_key(self.email, self.password)
+        self.assertEqual(
+            derive_keys(self.email, self.password, KDF_VERSION_LEGACY),
+            (vault_key, derive_auth_key(vault_key, self.password)),
+        )
+
+    def test_current_version_keeps_vault_key(self):
+        """Ensure the current version keeps the vault key and expands the auth key from it"""
+        vault_key, auth_key = derive_keys(self.email, self.password)
+        self.assertEqual(vault_key, derive_vault_key(self.email, self.password))
+        self.assertEqual(auth_key, expand_auth_key(vault_key, self.password))
+        self.assertEqual(len(auth_key), 32)
+        self.assertNotEqual(auth_key, vault_key)
+        self.assertNotEqual(auth_key, derive_keys(self.email, self.password, KDF_VERSION_LEGACY)[1])
+
+    def test_current_version_binds_master_password(self):
+        """Ensure the vault key alone does not determine the auth key, and match the frontend vector"""
+        params = {'iterations': 1000}
+        vault_key, auth_key = derive_keys(self.email, self.password, KDF_VERSION, 'pbkdf2_sha256', params)
+        self.assertEqual(vault_key.hex(), '7b574bd69591ce651fab0beb414a648b8f93571d1acada1cad05f72c01db9d9f')
+        self.assertEqual(auth_key.hex(), '918f1ff298f27bf21d8da9b6046d9138d5943b5256072262c439822547628d9c')
+        self.assertNotEqual(auth_key, expand_auth_key(vault_key, 'ThisIsMyStrongPassword12'))
+
+    def test_unknown_version_rejected(self):
+        """Ensure unknown KDF versions raise an error"""
+        with self.assertRaises(ValueError):
+            derive_keys(self.email, self.password, KDF_VERSION + 1)
+
+    def test_auth_verifier(self):
+        """Ensure the verifier matches only its auth key, raw or hex, and depends on AUTH_VERIFIER_KEY"""
+        auth_key = derive_keys(self.email, self.password)[1]
+        verifier = make_auth_verifier(auth_key)
+        self.assertEqual(len(verifier), 64)
+        self.assertNotEqual(verifier, auth_key.hex())
+        self.assertTrue(is_auth_verifier_match(verifier, auth_key))
+        self.assertTrue(is_auth_verifier_match(verifier, auth_key.hex()))
+        self.assertFalse(is_auth_verifier_match(verifier, bytes(32)))
+        self.assertFalse(is_auth_verifier_match(verifier, verifier))
+        with override_settings(AUTH_VERIFIER_KEY='pepper'):
+            self.assertFalse(is_auth_verifier_match(verifier, auth_key))
+
+    def test_benchmark_command(self):
+        """Ensure the KDF benchmark reports every version and client key derivation"""
+        out = io.StringIO()
+        call_command('benchmark_kdf', rounds=1, stdout=out)
+        self.assertIn(f'KDF version {KDF_VERSION_LEGACY}', out.getvalue())
+        self.assertIn(f'KDF version {KDF_VERSION}', out.getvalue())
+        self.assertIn('Client key derivation', out.getvalue())
@@ -0,0 +1,168 @@
+"""
+Auth Service KDF Registry Tests
+
+This module provides tests for auth_service.utils.kdf, per-user KDF parameters
+on registration and login, and the calibrate_kdf command.
+"""
+
+import hashlib
+import io
+import json
+import unittest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_service.management.commands.calibrate_kdf import _raise_until
+from auth_service.utils.hashing import KDF_VERSION, derive_keys, derive_vault_key, make_auth_verifier
+from auth_service.utils.kdf import (
+    KDFS, LEGACY_ALGORITHM, Argon2id, default_kdf, get_kdf, legacy_kdf_params,
+)
+
+User = get_user_model()
+
+SCRYPT_PARAMS = {'n': 1024, 'r': 8, 'p': 1}
+# Smallest scrypt parameters new accounts may use
+SCRYPT_MINIMUM = {'n': 1 << 17, 'r': 8, 'p': 1}
+
+
+class KDFRegistryTests(SimpleTestCase):
+
+    def setUp(self):
+        self.email = 'curleyr@oregonstate.edu'
+        self.password = 'ThisIsMyStrongPassword123'
+
+    def test_legacy_params_match_previous_vault_key(self):
+        """Ensure accounts without stored parameters derive the same vault key as before"""
+        expected = hashlib.pbkdf2_hmac('sha256', self.password.encode(), self.email.encode(), 100000, 32)
+        self.assertEqual(derive_vault_key(self.email, self.password), expected)
+        self.assertEqual(derive_vault_key(self.email, self.password, LEGACY_ALGORITHM, legacy_kdf_params()), expected)
+
+    def test_scrypt_derivation(self):
+        """Ensure scrypt derives a deterministic 32-byte key that depends on the parameters"""
+        key = derive_vault_key(self.email, self.password, 'scrypt', SCRYPT_PARAMS)
+        self.assertEqual(len(key), 32)
+        self.assertEqual(key, derive_vault_key(self.email, self.password, 'scrypt', dict(SCRYPT_PARAMS)))
+        self.assertNotEqual(key, derive_vault_key(self.email, self.password, 'scrypt', dict(SCRYPT_PARAMS, n=2048)))
+        self.assertEqual(get_kdf('scrypt').memory(SCRYPT_PARAMS), 128 * 8 * 1025)
+
+    def test_invalid_params(self):
+        """Ensure missing, unknown, too small or malformed parameters raise an error"""
+        for algorithm, params in (
+            ('pbkdf2_sha256', {}),
+            ('pbkdf2_sha256', {'iterations': 10}),
+            ('pbkdf2_sha256', {'iterations': '100000'}),
+            ('scrypt', {'n': 1000, 'r': 8, 'p': 1}),
+            ('scrypt', dict(SCRYPT_PARAMS, salt=1)),
+        ):
+            with self.subTest(algorithm=algorithm, params=params), self.assertRaises(ValueError):
+                derive_vault_key(self.email, self.password, algorithm, params)
+
+    def test_unknown_algorithm(self):
+        """Ensure unknown algorithms raise an error"""
+        with self.assertRaises(ValueError):
+            get_kdf('md5')
+
+    @unittest.skipUnless('argon2id' in KDFS, "argon2-cffi is not installed")
+    def test_argon2id_derivation(self):
+        """Ensure Argon2id derives a deterministic 32-byte key"""
+        params = {'time_cost': 1, 'memory_cost': 1024, 'parallelism': 1}
+        key = derive_vault_key(self.email, self.password, 'argon2id', params)
+        self.assertEqual(len(key), 32)
+        self.assertEqual(key, derive_vault_key(self.email, self.password, 'argon2id', params))
+
+    @override_settings(AUTH_KDF_ALGORITHM='scrypt', AUTH_KDF_PARAMS={'n': 1000, 'r': 8, 'p': 1})
+    def test_default_kdf_validates_settings(self):
+        """Ensure invalid settings are rejected before any account uses them"""
+        with self.assertRaises(ValueError):
+            default_kdf()
+
+    def test_weak_settings_rejected(self):
+        """Ensure settings below the OWASP minimums are rejected for new accounts"""
+        for kdf, params in (
+            (get_kdf('pbkdf2_sha256'), legacy_kdf_params()),
+            (get_kdf('pbkdf2_sha256'), {'iterations': 599999}),
+            (get_kdf('scrypt'), dict(SCRYPT_MINIMUM, n=1 << 16)),
+            (get_kdf('scrypt'), dict(SCRYPT_MINIMUM, r=4)),
+            (Argon2id(), {'time_cost': 1, 'memory_cost': 19456, 'parallelism': 1}),
+            (Argon2id(), {'time_cost': 2, 'memory_cost': 19455, 'parallelism': 1}),
+        ):
+            with self.subTest(algorithm=kdf.name, params=params), self.assertRaises(ValueError):
+                kdf.check(params)
+        with override_settings(AUTH_KDF_ALGORITHM=LEGACY_ALGORITHM, AUTH_KDF_PARAMS=legacy_kdf_params()):
+            self.assertRaises(ValueError, default_kdf)
+
+        get_kdf('pbkdf2_sha256').check({'iterations': 600000})
+        get_kdf('scrypt').check(SCRYPT_MINIMUM)
+        Argon2id().check({'time_cost': 2, 'memory_cost': 19456, 'parallelism': 1})
+
+    def test_calibrate_command(self):
+        """Ensure calibration never goes below the minimums and skips algorithms over the memory budget"""
+        out = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command('calibrate_kdf', algorithm='scrypt', target_ms=5, max_memory_mib=1, stdout=out)
+        self.assertIn('over the memory budget', out.getvalue())
+
+        out = io.StringIO()
+        call_command('calibrate_kdf', algorithm='pbkdf2_sha256', target_ms=5, stdout=out)
+        output = out.getvalue()
+        self.assertIn('AUTH_KDF_ALGORITHM=pbkdf2_sha256', output)
+        params = json.loads(output.split('AUTH_KDF_PARAMS=')[1].strip().strip("'"))
+        self.assertEqual(params, {'iterations': 600000})
+
+    @override_settings(AUTH_KDF_MAX_WORKERS=2)
+    def test_calibrate_default_budget_from_instance_memory(self):
+        """Ensure the default budget splits the KDF share of the instance memory between the workers"""
+        out = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command('calibrate_kdf', algorithm='scrypt', target_ms=5, instance_memory_mib=16, stdout=out)
+        output = out.getvalue()
+        self.assertIn('Memory budget per derivation: 1.00 MiB', output)
+        self.assertIn('needs 128.00 MiB, over the memory budget', output)
+
+    def test_calibrate_raise_rechecks_memory(self):
+        """Ensure raising a parameter towards the target stops at the memory budget"""
+        kdf = get_kdf('scrypt')
+        max_memory = kdf.memory(dict(SCRYPT_PARAMS, p=3))
+        params, _ = _raise_until(kdf, SCRYPT_PARAMS, 'p', 10000, max_memory)
+        self.assertLessEqual(kdf.memory(params), max_memory)
+
+
+@override_settings(AUTH_KDF_ALGORITHM='scrypt', AUTH_KDF_PARAMS=SCRYPT_MINIMUM)
+class PerUserKDFTests(APITestCase):
+
+    def setUp(self):
+        csrf_response = self.client.get(reverse('auth_service:csrf-token-api'))
+        self.csrf = csrf_response.cookies.get('csrftoken').value
+        self.client.cookies['csrftoken'] = self.csrf
+
+        self.username = 'bcurley'
+        self.email = 'curleyr@oregonstate.edu'
+        self.password = 'ThisIsMyStrongPassword123'
+
+    def register(self):
+        data = {"username": self.username, "email": self.email, "password": self.password, "password2": self.password}
+        return self.client.post(reverse('auth_service:register-api'), data, format='json', HTTP_X_CSRFTOKEN=self.csrf)
+
+    def login(self, password):
+        data = {"username": self.username, "password": password}
+        return self.client.post(reverse('auth_service:login-api'), data, format='json', HTTP_X_CSRFTOKEN=self.csrf)
+
+    def test_register_stores_configured_kdf(self):
+        """Ensure registration derives the keys with, and stores, the configured KDF"""
+        response = self.register()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(username=self.username)
+        self.assertEqual((user.kdf_algorithm, user.kdf_params), ('scrypt', SCRYPT_MINIMUM))
+        auth_key = derive_keys(self.email, self.password, KDF_VERSION, 'scrypt', SCRYPT_MINIMUM)[1]
+        self.assertEqual(user.auth_verifier, make_auth_verifier(auth_key))
+
+    def test_login_uses_stored_kdf(self):
+        """Ensure login keeps using the stored KDF after the configured one changes"""
+        self.register()
+        with override_settings(AUTH_KDF_ALGORITHM='pbkdf2_sha256', AUTH_KDF_PARAMS={'iterations': 600000}):
+            self.assertEqual(self.login(self.password).status_code, status.HTTP_403_FORBIDDEN)
+            self.assertEqual(self.login('ThisIsMyStrongPassword12').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(User.objects.get(username=self.username).kdf_algorithm, 'scrypt')
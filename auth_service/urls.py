@@ -9,6 +9,8 @@ from django.urls import path
 from auth_service.views import (
     get_csrf_token,
     get_auth_status,
+    get_kdf_status,
+    get_prelogin,
     RegisterView,
     LoginView,
     MFASetupView,
@@ -22,7 +24,9 @@ app_name = 'auth_service'
 urlpatterns = [
     path('csrf/', get_csrf_token, name='csrf-token-api'),
     path('session/', get_auth_status, name='session-api'),
+    path('kdf-status/', get_kdf_status, name='kdf-status-api'),
     path('register/', RegisterView.as_view(), name='register-api'),
+    path('prelogin/', get_prelogin, name='prelogin-api'),
     path('login/', LoginView.as_view(), name='login-api'),
     path('mfa-setup/', MFASetupView.as_view(), name='mfa-setup-api'),
     path('mfa-verify/', MFAVerifyView.as_view(), name='mfa-verify-api'),
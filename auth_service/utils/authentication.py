@@ -1,11 +1,15 @@
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework.exceptions import AuthenticationFailed
+from auth_service.utils.user_cache import get_user_cache
 
 
 class CookieJWTAuthentication(JWTAuthentication):
     """
     Authenticate via HttpOnly cookie named 'accesstoken'.
+    Users are looked up in the user cache (see auth_service.utils.user_cache)
+    before the database.
     """
     def authenticate(self, request):
         access_token = request.COOKIES.get('accesstoken')
@@ -18,3 +22,22 @@ class CookieJWTAuthentication(JWTAuthentication):
             return (user, validated_token)
         except TokenError:
             raise AuthenticationFailed('Invalid or expired token')
+
+    def get_user(self, validated_token):
+        # Revocation compares the password hash, which is not cached
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        cache = get_user_cache()
+        user = cache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(user_id, user)
+        elif api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return user
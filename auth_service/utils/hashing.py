@@ -8,8 +8,35 @@ and authentication verification.
 
 Handles:
     - Converting string inputs to bytes for cryptographic functions
-    - Deriving 256-bit AES keys using PBKDF2-HMAC-SHA256
+    - Deriving 256-bit AES keys using PBKDF2-HMAC-SHA256, or the algorithm and
+      parameters stored on the user (see auth_service.utils.kdf)
+    - Deriving the auth key for each versioned KDF scheme (User.kdf_version)
+    - Running login and registration derivations on the bounded KDF executor
+      (see auth_service.utils.kdf_executor)
     - Securely comparing derived authentication keys
+    - Storing auth keys as keyed verifiers, so the stored value cannot be replayed
+      as a client-derived auth key (see LoginSerializer)
+
+KDF versions:
+    - 1 (legacy): vault key by PBKDF2, auth key by a second PBKDF2 over the vault key
+      (200,000 iterations per login)
+    - 2 (current): vault key by PBKDF2, auth key expanded from the vault key with
+      HKDF-SHA256 over AUTH_KEY_INFO and the master password (100,000 iterations
+      per login). Binding the password means the vault key alone cannot produce an
+      auth key, so it never works as a login credential. The vault key is unchanged,
+      so records encrypted under version 1 still decrypt and users are upgraded on
+      their next successful login without re-encrypting anything.
+
+Auth verifiers:
+    Clients may derive the keys themselves and send only the auth key, so the
+    server no longer runs the KDF on login. The auth key then works like a password:
+    it is stored as HMAC-SHA256(AUTH_VERIFIER_KEY, auth key) in User.auth_verifier,
+    one HMAC per login instead of a KDF derivation. Accounts that still hold a raw
+    User.auth_key are migrated on their next master password login.
+
+The vault key algorithm and parameters (User.kdf_algorithm, User.kdf_params) are
+independent of the version. They are fixed when an account is registered: changing
+them would change the vault key the account's records are encrypted with.
 
 References:
     - Python hashlib.pbkdf2_hmac documentation:
@@ -17,11 +44,27 @@ References:
 
     - Python hmac.compare_digest documentaiton:
     https://docs.python.org/3/library/hmac.html#hmac.compare_digest
+
+    - HKDF (RFC 5869):
+    https://datatracker.ietf.org/doc/html/rfc5869
 """
 
 import hashlib
 import hmac
 
+from django.conf import settings
+
+from auth_service.utils.kdf import LEGACY_ALGORITHM, LEGACY_ITERATIONS, get_kdf, legacy_kdf_params
+from auth_service.utils.kdf_executor import get_kdf_executor
+
+PBKDF2_ITERATIONS = LEGACY_ITERATIONS
+
+KDF_VERSION_LEGACY = 1
+KDF_VERSION = 2
+
+# HKDF context binding the auth key to its purpose and scheme version, the master password follows it
+AUTH_KEY_INFO = b'secure-password-manager auth key v2'
+
 
 def _to_bytes(value: str | bytes) -> bytes:
     """
@@ -40,28 +83,36 @@ def _to_bytes(value: str | bytes) -> bytes:
     return value if isinstance(value, bytes) else value.encode('utf-8')
 
 
-def derive_vault_key(email: str | bytes, master_password: str | bytes) -> bytes:
+def derive_vault_key(
+    email: str | bytes, master_password: str | bytes, algorithm: str = LEGACY_ALGORITHM, params: dict | None = None
+) -> bytes:
     """
     Derive a deterministic 256-bit (32-byte) AES vault key.
 
     Handles:
-        - Uses PBKDF2-HMAC-SHA256 to derive a cryptographic key
-          from the master password, salted with the user's email.
-        - Performs 100,000 iterations to resist brute-force attacks.
+        - Uses the registered KDF (PBKDF2-HMAC-SHA256 by default) to derive a
+          cryptographic key from the master password, salted with the user's email.
+        - Defaults to 100,000 PBKDF2 iterations to resist brute-force attacks.
 
     Receives:
         - email (str | bytes): Email address to serve as a unique salt
         - master_password (str | bytes): User's master password
+        - algorithm (str): Registered KDF name (User.kdf_algorithm)
+        - params (dict | None): KDF parameters (User.kdf_params), legacy PBKDF2 parameters if None
+
+    Raises:
+        - ValueError: If the algorithm is unknown or the parameters are invalid
 
     Returns:
         - bytes: 32-byte derived vault key suitable for AES encryption
     """
-    return hashlib.pbkdf2_hmac('sha256', _to_bytes(master_password), _to_bytes(email), 100000, 32)
+    params = legacy_kdf_params() if params is None else params
+    return get_kdf(algorithm).derive(_to_bytes(master_password), _to_bytes(email), params)
 
 
 def derive_auth_key(vault_key: str | bytes, master_password: str | bytes) -> bytes:
     """
-    Derive a deterministic 256-bit (32-byte) AES authentication key.
+    Derive a deterministic 256-bit (32-byte) AES authentication key (KDF version 1).
 
     Handles:
         - Uses PBKDF2-HMAC-SHA256 to derive a secondary key
@@ -75,7 +126,94 @@ def derive_auth_key(vault_key: str | bytes, master_password: str | bytes) -> byt
     Returns:
         - bytes: 32-byte derived authentication key
     """
-    return hashlib.pbkdf2_hmac('sha256', _to_bytes(vault_key), _to_bytes(master_password), 100000, 32)
+    return hashlib.pbkdf2_hmac('sha256', _to_bytes(vault_key), _to_bytes(master_password), PBKDF2_ITERATIONS, 32)
+
+
+def hkdf_expand(key: bytes, info: bytes, length: int = 32) -> bytes:
+    """
+    Expand a pseudorandom key into output keying material with HKDF-SHA256.
+
+    Handles:
+        - RFC 5869 HKDF-Expand: T(i) = HMAC(key, T(i-1) | info | i)
+        - The extract step is skipped, the key must already be uniformly
+          random (a PBKDF2 output is)
+
+    Receives:
+        - key (bytes): Pseudorandom key of at least 32 bytes
+        - info (bytes): Context binding the output to its purpose
+        - length (int): Output length in bytes, at most 8160
+
+    Returns:
+        - bytes: length bytes of output keying material
+    """
+    if length > 255 * 32:
+        raise ValueError("HKDF-SHA256 output is limited to 8160 bytes")
+    output, block = b'', b''
+    for counter in range(1, -(-length // 32) + 1):
+        block = hmac.new(key, block + info + bytes([counter]), hashlib.sha256).digest()
+        output += block
+    return output[:length]
+
+
+def expand_auth_key(vault_key: str | bytes, master_password: str | bytes) -> bytes:
+    """
+    Derive the 256-bit (32-byte) authentication key of the current KDF version.
+
+    Handles:
+        - Expands the vault key with HKDF-SHA256, with AUTH_KEY_INFO followed by
+          the master password as the context, so the vault key alone is not enough
+        - Costs one HMAC call, so upgrading an older user after their
+          login has produced the vault key is practically free
+
+    Receives:
+        - vault_key (str | bytes): Previously derived vault key
+        - master_password (str | bytes): User's master password
+
+    Returns:
+        - bytes: 32-byte derived authentication key
+    """
+    return hkdf_expand(_to_bytes(vault_key), AUTH_KEY_INFO + _to_bytes(master_password))
+
+
+def derive_keys(
+    email: str | bytes, master_password: str | bytes, kdf_version: int = KDF_VERSION,
+    algorithm: str = LEGACY_ALGORITHM, params: dict | None = None
+) -> tuple:
+    """
+    Derive the vault key and the auth key with a versioned KDF scheme.
+
+    Handles:
+        - Version 1: vault key, then a second PBKDF2 auth key
+        - Version 2: vault key, auth key expanded from it and the master password with HKDF
+        - Runs on the bounded KDF executor rather than the request thread
+
+    Receives:
+        - email (str | bytes): Email address to serve as a unique salt
+        - master_password (str | bytes): User's master password
+        - kdf_version (int): Scheme stored on the user (User.kdf_version)
+        - algorithm (str): Vault key KDF stored on the user (User.kdf_algorithm)
+        - params (dict | None): Vault key KDF parameters (User.kdf_params)
+
+    Raises:
+        - ValueError: If the KDF version, algorithm or parameters are invalid
+        - KDFUnavailable: If the KDF executor is saturated
+
+    Returns:
+        - tuple[bytes, bytes]: 32-byte vault key and 32-byte auth key
+    """
+    if kdf_version not in (KDF_VERSION_LEGACY, KDF_VERSION):
+        raise ValueError(f"Unknown KDF version: {kdf_version}")
+    return get_kdf_executor().run(_derive_keys, email, master_password, kdf_version, algorithm, params)
+
+
+def _derive_keys(
+    email: str | bytes, master_password: str | bytes, kdf_version: int, algorithm: str, params: dict | None
+) -> tuple:
+    """Derive the vault and auth keys of a KDF version on the calling thread"""
+    vault_key = derive_vault_key(email, master_password, algorithm, params)
+    if kdf_version == KDF_VERSION_LEGACY:
+        return vault_key, derive_auth_key(vault_key, master_password)
+    return vault_key, expand_auth_key(vault_key, master_password)
 
 
 def is_auth_key_match(stored_auth_key: str | bytes, derived_auth_key: str | bytes) -> bool:
@@ -97,3 +235,36 @@ def is_auth_key_match(stored_auth_key: str | bytes, derived_auth_key: str | byte
     derived_auth_key = bytes.fromhex(derived_auth_key) if isinstance(derived_auth_key, str) else derived_auth_key
 
     return hmac.compare_digest(stored_auth_key, derived_auth_key)
+
+
+def make_auth_verifier(auth_key: str | bytes) -> str:
+    """
+    Derive the stored verifier of an auth key of the current KDF version.
+
+    Handles:
+        - Keys HMAC-SHA256 with AUTH_VERIFIER_KEY, so a database copy alone
+          neither logs in nor tests guesses any faster than the KDF allows
+        - Converts a hex encoded auth key to bytes
+
+    Receives:
+        - auth_key (str | bytes): Auth key, raw or hex encoded
+
+    Returns:
+        - str: Hex encoded 32-byte verifier (User.auth_verifier)
+    """
+    auth_key = bytes.fromhex(auth_key) if isinstance(auth_key, str) else auth_key
+    return hmac.new(_to_bytes(settings.AUTH_VERIFIER_KEY), auth_key, hashlib.sha256).hexdigest()
+
+
+def is_auth_verifier_match(stored_verifier: str, auth_key: str | bytes) -> bool:
+    """
+    Securely compare a stored verifier with the verifier of an auth key.
+
+    Receives:
+        - stored_verifier (str): Verifier retrieved from the database
+        - auth_key (str | bytes): Auth key derived by the server or sent by the client
+
+    Returns:
+        - bool: True if the auth key matches the verifier, False otherwise
+    """
+    return hmac.compare_digest(stored_verifier, make_auth_verifier(auth_key))
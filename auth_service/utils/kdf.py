@@ -0,0 +1,198 @@
+"""
+Auth Service KDF Registry
+
+This module provides the password key derivation functions a user's vault key
+can be derived with. Each User stores the algorithm name and its parameters
+(User.kdf_algorithm, User.kdf_params), so the cost can be tuned per deployment
+for new accounts while existing accounts keep deriving the same vault key.
+
+Handles:
+    - PBKDF2-HMAC-SHA256 (iterations)
+    - scrypt through hashlib.scrypt (n, r, p)
+    - Argon2id through argon2-cffi, registered only if it is installed
+      (time_cost, memory_cost in KiB, parallelism)
+    - Validating stored parameters and reporting the memory a derivation needs
+    - Reading the algorithm and parameters for new accounts from settings, which
+      must meet the OWASP minimums (PBKDF2 600,000 iterations, scrypt n=2^17 with
+      r=8, Argon2id 19 MiB with time_cost 2). Stored parameters of existing
+      accounts only need to be well formed, so accounts created with weaker
+      settings (such as the legacy 100,000 iterations) keep deriving their keys.
+
+Configuration (settings):
+    - AUTH_KDF_ALGORITHM: Algorithm for new accounts (see KDFS)
+    - AUTH_KDF_PARAMS: Parameters for new accounts, pick them with
+      `python manage.py calibrate_kdf`
+
+References:
+    - Python hashlib.scrypt documentation:
+    https://docs.python.org/3/library/hashlib.html#hashlib.scrypt
+
+    - argon2-cffi low level API:
+    https://argon2-cffi.readthedocs.io/en/stable/api.html#argon2.low_level.hash_secret_raw
+
+    - OWASP Password Storage Cheat Sheet:
+    https://cheatsheetseries.owasp.org/cheatsheets/Password_Storage_Cheat_Sheet.html
+"""
+
+import hashlib
+from typing import Any, Dict, Tuple
+
+from django.conf import settings
+
+try:
+    from argon2.low_level import Type, hash_secret_raw
+except ImportError:  # Optional dependency, Argon2id is not registered without it
+    hash_secret_raw = None
+
+KEY_LENGTH = 32
+LEGACY_ALGORITHM = 'pbkdf2_sha256'
+LEGACY_ITERATIONS = 100000
+
+
+def legacy_kdf_params() -> Dict[str, int]:
+    """
+    Parameters of accounts created before per-user KDF parameters were stored.
+
+    Returns:
+        - dict: PBKDF2 parameters with 100,000 iterations
+    """
+    return {'iterations': LEGACY_ITERATIONS}
+
+
+class KDF:
+    """
+    Base class of a registered key derivation function.
+
+    Subclasses set name, params (parameter name to the smallest value a
+    derivation accepts) and minimums (parameter name to the smallest value new
+    accounts may use) and implement _derive and memory.
+    """
+    name = ''
+    params: Dict[str, int] = {}
+    minimums: Dict[str, int] = {}
+
+    def validate(self, params: Dict[str, Any]) -> None:
+        """
+        Validate stored parameters.
+
+        Raises:
+            - ValueError: If a parameter is missing, unknown, not an integer or below its smallest value
+        """
+        if set(params) != set(self.params):
+            raise ValueError(f"{self.name} expects parameters {', '.join(sorted(self.params))}")
+        for key, minimum in self.params.items():
+            value = params[key]
+            if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+                raise ValueError(f"{self.name} parameter {key} must be an integer of at least {minimum}")
+
+    def check(self, params: Dict[str, Any]) -> None:
+        """
+        Validate parameters for new accounts.
+
+        Raises:
+            - ValueError: If the parameters are invalid or below the minimums
+        """
+        self.validate(params)
+        for key, minimum in self.minimums.items():
+            if params[key] < minimum:
+                raise ValueError(f"{self.name} parameter {key} must be at least {minimum} for new accounts")
+
+    def derive(self, password: bytes, salt: bytes, params: Dict[str, Any]) -> bytes:
+        """
+        Derive a 32-byte key after validating the parameters.
+
+        Returns:
+            - bytes: 32-byte derived key
+        """
+        self.validate(params)
+        return self._derive(password, salt, **params)
+
+    def _derive(self, password: bytes, salt: bytes, **params: int) -> bytes:
+        raise NotImplementedError
+
+    def memory(self, params: Dict[str, Any]) -> int:
+        """Return the bytes of memory one derivation needs"""
+        raise NotImplementedError
+
+
+class PBKDF2SHA256(KDF):
+    name = 'pbkdf2_sha256'
+    params = {'iterations': 1000}
+    minimums = {'iterations': 600000}
+
+    def _derive(self, password: bytes, salt: bytes, iterations: int) -> bytes:
+        return hashlib.pbkdf2_hmac('sha256', password, salt, iterations, KEY_LENGTH)
+
+    def memory(self, params: Dict[str, Any]) -> int:
+        return 0
+
+
+class Scrypt(KDF):
+    name = 'scrypt'
+    params = {'n': 2, 'r': 1, 'p': 1}
+    minimums = {'n': 1 << 17, 'r': 8}
+
+    def validate(self, params: Dict[str, Any]) -> None:
+        super().validate(params)
+        if params['n'] & (params['n'] - 1):
+            raise ValueError("scrypt parameter n must be a power of two")
+
+    def _derive(self, password: bytes, salt: bytes, n: int, r: int, p: int) -> bytes:
+        # OpenSSL refuses derivations above maxmem (32 MiB by default)
+        maxmem = self.memory({'n': n, 'r': r, 'p': p}) + (1 << 20)
+        return hashlib.scrypt(password, salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=KEY_LENGTH)
+
+    def memory(self, params: Dict[str, Any]) -> int:
+        return 128 * params['r'] * (params['n'] + params['p'])
+
+
+class Argon2id(KDF):
+    name = 'argon2id'
+    params = {'time_cost': 1, 'memory_cost': 8, 'parallelism': 1}
+    minimums = {'time_cost': 2, 'memory_cost': 19456}
+
+    def _derive(self, password: bytes, salt: bytes, time_cost: int, memory_cost: int, parallelism: int) -> bytes:
+        # Argon2 needs a salt of at least 8 bytes, the email is hashed to a fixed length salt
+        return hash_secret_raw(
+            password, hashlib.sha256(salt).digest(), time_cost=time_cost, memory_cost=memory_cost,
+            parallelism=parallelism, hash_len=KEY_LENGTH, type=Type.ID,
+        )
+
+    def memory(self, params: Dict[str, Any]) -> int:
+        return params['memory_cost'] * 1024
+
+
+KDFS = {kdf.name: kdf for kdf in (PBKDF2SHA256(), Scrypt())}
+if hash_secret_raw is not None:
+    KDFS[Argon2id.name] = Argon2id()
+
+
+def get_kdf(algorithm: str) -> KDF:
+    """
+    Look up a registered key derivation function.
+
+    Raises:
+        - ValueError: If the algorithm is unknown or its optional dependency is not installed
+
+    Returns:
+        - KDF: Registered key derivation function
+    """
+    try:
+        return KDFS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown or unavailable KDF algorithm: {algorithm}") from None
+
+
+def default_kdf() -> Tuple[str, Dict[str, Any]]:
+    """
+    Return the algorithm and parameters configured for new accounts.
+
+    Raises:
+        - ValueError: If the configured algorithm or parameters are invalid
+
+    Returns:
+        - tuple[str, dict]: Algorithm name and a copy of its parameters
+    """
+    algorithm, params = settings.AUTH_KDF_ALGORITHM, dict(settings.AUTH_KDF_PARAMS)
+    get_kdf(algorithm).check(params)
+    return algorithm, params
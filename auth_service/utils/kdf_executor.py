@@ -0,0 +1,199 @@
+"""
+Auth Service KDF Executor
+
+This module provides a dedicated, size-limited executor for password key
+derivations. PBKDF2 is pure CPU, so a burst of logins run directly on the
+request threads keeps every worker busy hashing while cheap requests (vault
+reads, token refreshes) queue behind them. Derivations instead run on a small
+thread pool with a bounded wait queue: a login either gets a slot, waits a
+bounded time for one to start, or is rejected at once with a 503 and a
+Retry-After header, so login bursts degrade gracefully instead of raising the
+latency of every endpoint.
+
+Handles:
+    - Capping concurrent derivations (AUTH_KDF_MAX_WORKERS)
+    - Bounding the derivations waiting for a worker (AUTH_KDF_MAX_QUEUE)
+    - Rejecting derivations that wait longer than AUTH_KDF_QUEUE_TIMEOUT seconds
+    - Reporting queue depth, active derivations, counters and wait times
+
+Server model:
+    The executor is per process. It assumes each process serves many requests at
+    once, as a threaded (gunicorn gthread) or ASGI server does; App Engine sends an
+    instance up to max_concurrent_requests (20 in app.yaml) at a time. Under sync
+    gunicorn workers a process handles one request at a time, so at most one
+    derivation is ever submitted, the queue bound never applies and concurrency is
+    capped by the worker process count instead. Either way the instance runs up to
+    AUTH_KDF_MAX_WORKERS derivations per process, so size it with the process count
+    in mind: the defaults (1 worker, 4 queued) suit one process on a 1-vCPU F2.
+
+Configuration (settings):
+    - AUTH_KDF_MAX_WORKERS: Concurrent derivations
+    - AUTH_KDF_MAX_QUEUE: Derivations allowed to wait for a worker
+    - AUTH_KDF_QUEUE_TIMEOUT: Seconds a derivation may wait for a worker
+    - AUTH_KDF_RETRY_AFTER: Seconds clients are told to wait after a rejection
+
+References:
+    - concurrent.futures.ThreadPoolExecutor documentation:
+    https://docs.python.org/3/library/concurrent.futures.html#threadpoolexecutor
+
+    - Retry-After header:
+    https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Retry-After
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Recent queue wait times kept for the wait time percentiles
+WAIT_SAMPLES = 1000
+
+
+class KDFUnavailable(Exception):
+    """
+    Raised when a derivation is rejected because the executor is saturated.
+
+    Attributes:
+        - retry_after (int): Seconds the client should wait before retrying
+    """
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class KDFExecutor:
+    """
+    Bounded thread pool running key derivations.
+
+    Handles:
+        - One slot per worker plus one per queue position; a derivation that
+          finds no free slot is rejected without waiting
+        - Queued derivations that do not start within the timeout are cancelled
+          and rejected, started derivations always run to completion
+        - Counters and wait times for metrics
+    """
+
+    def __init__(self, max_workers: int = 1, max_queue: int = 4, timeout: float = 5.0, retry_after: int = 5):
+        if max_workers < 1 or max_queue < 0:
+            raise ValueError("KDF executor needs at least one worker and a non-negative queue size")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='kdf')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self._queued = self._active = 0
+        self._completed = self._rejected = self._timed_out = 0
+        self._max_wait = 0.0
+
+    def _reject(self, message: str) -> KDFUnavailable:
+        logger.warning(f"KDF derivation rejected: {message}")
+        return KDFUnavailable(message, self.retry_after)
+
+    def run(self, func: Callable, *args: Any) -> Any:
+        """
+        Run func(*args) on a KDF worker and wait for its result.
+
+        Raises:
+            - KDFUnavailable: If the queue is full or no worker became free in time
+
+        Returns:
+            - The return value of func
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise self._reject("queue full")
+
+        submitted = time.perf_counter()
+        started = threading.Event()
+
+        def task():
+            wait = time.perf_counter() - submitted
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._waits.append(wait)
+                self._max_wait = max(self._max_wait, wait)
+            started.set()
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        with self._lock:
+            self._queued += 1
+        try:
+            future = self._pool.submit(task)
+        except RuntimeError:
+            with self._lock:
+                self._queued -= 1
+            self._slots.release()
+            raise
+        # The slot is freed when the derivation finishes or is cancelled, not when the caller gives up
+        future.add_done_callback(lambda _: self._slots.release())
+
+        if not started.wait(self.timeout) and future.cancel():
+            with self._lock:
+                self._queued -= 1
+                self._timed_out += 1
+            raise self._reject(f"no worker free within {self.timeout:g}s")
+        return future.result()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Report the executor configuration, queue depth, counters and wait times.
+
+        Returns:
+            - dict: Metrics with wait times in milliseconds
+        """
+        with self._lock:
+            waits = sorted(self._waits)
+            metrics = {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'active': self._active,
+                'queue_depth': self._queued,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'timed_out': self._timed_out,
+                'max_wait_ms': round(self._max_wait * 1e3, 2),
+            }
+        for percent in (50, 95, 99):
+            wait = waits[min(len(waits) - 1, len(waits) * percent // 100)] if waits else 0.0
+            metrics[f'wait_p{percent}_ms'] = round(wait * 1e3, 2)
+        return metrics
+
+    def shutdown(self):
+        """Stop accepting derivations and wait for the running ones (mainly for tests)"""
+        self._pool.shutdown(wait=True)
+
+
+@lru_cache(maxsize=4)
+def _executor(max_workers: int, max_queue: int, timeout: float, retry_after: int) -> KDFExecutor:
+    return KDFExecutor(max_workers, max_queue, timeout, retry_after)
+
+
+def get_kdf_executor() -> KDFExecutor:
+    """
+    Return the process-wide KDF executor for the current settings.
+
+    Returns:
+        - KDFExecutor: Executor shared by every request of the process
+    """
+    return _executor(
+        settings.AUTH_KDF_MAX_WORKERS, settings.AUTH_KDF_MAX_QUEUE,
+        settings.AUTH_KDF_QUEUE_TIMEOUT, settings.AUTH_KDF_RETRY_AFTER,
+    )
@@ -0,0 +1,156 @@
+"""
+Auth Service User Cache
+
+This module provides the cache CookieJWTAuthentication looks users up in. Every
+authenticated request otherwise runs a User SELECT by primary key before the view
+does any work, so vault list, detail and write calls each pay one query just to
+authenticate. The cache keeps a few fields of recently authenticated users keyed
+by user id and rebuilds a fresh, partially loaded User instance from them on every
+hit; any other field is loaded from the database on first access.
+
+Handles:
+    - A process-local TTL/LRU store (AUTH_USER_CACHE_SIZE users for at most
+      AUTH_USER_CACHE_TTL seconds, capped at the access token lifetime)
+    - An optional shared Django cache backend (AUTH_USER_CACHE_BACKEND), so that
+      every instance of a multi-instance deployment sees the same invalidations
+    - Invalidation on User post_save and post_delete signals (bulk QuerySet.update
+      and delete bypass signals, such changes show up once the entry expires)
+
+Configuration (settings):
+    - AUTH_USER_CACHE_SIZE: Users kept by the process-local store, 0 disables the cache
+    - AUTH_USER_CACHE_TTL: Seconds an entry is trusted
+    - AUTH_USER_CACHE_BACKEND: Alias in CACHES of a shared backend replacing the
+      process-local store, empty for the process-local store
+
+References:
+    - Django signals documentation:
+    https://docs.djangoproject.com/en/5.2/ref/signals/#post-save
+
+    - Django cache framework documentation:
+    https://docs.djangoproject.com/en/5.2/topics/cache/
+
+    - Model.from_db documentation:
+    https://docs.djangoproject.com/en/5.2/ref/models/instances/#django.db.models.Model.from_db
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Fields kept per user, what permission checks and the vault views read
+CACHED_FIELDS = ('id', 'username', 'email', 'is_active', 'is_staff', 'is_superuser')
+CACHE_KEY_PREFIX = 'auth-user:'
+
+
+class UserCache:
+    """
+    Cache of minimal User field values keyed by user id (as a string, the
+    token claim and the primary key agree whatever their type).
+
+    Handles:
+        - Process-local storage in an OrderedDict, evicting the least recently
+          used user past maxsize and dropping entries older than ttl seconds
+        - Or storage in a shared Django cache backend with ttl as its timeout
+        - Building a fresh User instance with the other fields deferred on every hit
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300, backend: str = ''):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = caches[backend] if backend else None
+        self.user_model = get_user_model()
+        # Concrete field order, as Model.from_db expects the values
+        self.field_names = [
+            f.attname for f in self.user_model._meta.concrete_fields if f.attname in CACHED_FIELDS
+        ]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and (self.backend is not None or self.maxsize > 0)
+
+    def get(self, user_id: Any) -> Optional[Any]:
+        """
+        Look up a user.
+
+        Returns:
+            - User | None: Partially loaded User instance, None on a miss or expired entry
+        """
+        if not self.enabled:
+            return None
+        user_id = str(user_id)
+        if self.backend is not None:
+            values = self.backend.get(f'{CACHE_KEY_PREFIX}{user_id}')
+        else:
+            with self._lock:
+                entry = self._entries.get(user_id)
+                if entry is None:
+                    return None
+                expires, values = entry
+                if expires <= time.monotonic():
+                    del self._entries[user_id]
+                    return None
+                self._entries.move_to_end(user_id)
+        if values is None:
+            return None
+        return self.user_model.from_db(None, self.field_names, values)
+
+    def set(self, user_id: Any, user: Any) -> None:
+        """Store the cached fields of an authenticated user"""
+        if not self.enabled:
+            return
+        user_id = str(user_id)
+        values = tuple(getattr(user, name) for name in self.field_names)
+        if self.backend is not None:
+            self.backend.set(f'{CACHE_KEY_PREFIX}{user_id}', values, self.ttl)
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Any) -> None:
+        """Forget a user, so the next request loads it from the database"""
+        user_id = str(user_id)
+        if self.backend is not None:
+            self.backend.delete(f'{CACHE_KEY_PREFIX}{user_id}')
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Forget every process-local entry (mainly for tests)"""
+        with self._lock:
+            self._entries.clear()
+
+
+@lru_cache(maxsize=4)
+def _user_cache(maxsize: int, ttl: float, backend: str) -> UserCache:
+    return UserCache(maxsize, ttl, backend)
+
+
+def get_user_cache() -> UserCache:
+    """
+    Return the process-wide user cache for the current settings.
+
+    Returns:
+        - UserCache: Cache shared by every request of the process
+    """
+    ttl = min(settings.AUTH_USER_CACHE_TTL, settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds())
+    return _user_cache(settings.AUTH_USER_CACHE_SIZE, ttl, settings.AUTH_USER_CACHE_BACKEND)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def _invalidate_user(sender, instance, **kwargs):
+    """Drops a saved or deleted user from the cache (connected in AuthServiceConfig.ready)"""
+    get_user_cache().invalidate(instance.pk)
@@ -23,8 +23,8 @@ from rest_framework import status, generics
 from rest_framework.views import APIView
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
-from rest_framework.decorators import api_view
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework_simplejwt.tokens import (
     AccessToken,
     RefreshToken,
@@ -33,6 +33,7 @@ from rest_framework_simplejwt.tokens import (
 from auth_service.serializers import (
     RegisterSerializer,
     LoginSerializer,
+    PreLoginSerializer,
     MFASetupSerializer,
     MFAVerifySerializer,
 )
@@ -44,6 +45,7 @@ from django.utils.decorators import method_decorator
 from django.contrib.auth import get_user_model
 from two_factor.utils import default_device
 from auth_service.utils.mfa import create_signed_token
+from auth_service.utils.kdf_executor import KDFUnavailable, get_kdf_executor
 
 User = get_user_model()
 
@@ -62,6 +64,64 @@ def get_csrf_token(request):
     return JsonResponse({"csrftoken": csrf_token})
 
 
+def kdf_unavailable_response(error: KDFUnavailable) -> Response:
+    """
+    Build the response for a login or registration rejected by the KDF executor.
+
+    Returns:
+        - Response: 503 Service Unavailable with a Retry-After header
+    """
+    return Response(
+        {"error": "Too many sign-in attempts are being processed. Please try again shortly."},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def get_kdf_status(request):
+    """
+    API endpoint for KDF executor metrics
+
+    Reports the queue depth, active derivations, completed/rejected/timed out
+    counters and queue wait times of the login key derivation executor.
+    Restricted to staff users: the metrics reveal sign-in load to an attacker.
+
+    Returns:
+        {
+            "max_workers": int, "max_queue": int, "active": int, "queue_depth": int,
+            "completed": int, "rejected": int, "timed_out": int,
+            "max_wait_ms": float, "wait_p50_ms": float, "wait_p95_ms": float, "wait_p99_ms": float
+        }
+    """
+    return Response(get_kdf_executor().metrics())
+
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def get_prelogin(request):
+    """
+    API endpoint for the key derivation parameters of a user
+
+    Clients that derive the keys themselves call this before logging in with
+    an auth key instead of the master password (see LoginSerializer). The
+    salt of the vault key is the account email. Accounts report
+    client_key_derivation false until their first master password login has
+    stored an auth verifier, and always for algorithms browsers cannot derive.
+
+    Returns:
+        {
+            "kdf_version": int, "kdf_algorithm": str, "kdf_params": dict,
+            "salt": str, "client_key_derivation": bool
+        }
+    """
+    serializer = PreLoginSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(serializer.data)
+
+
 @api_view(["GET"])
 def get_auth_status(request):
     """
@@ -151,7 +211,8 @@ class RegisterView(generics.CreateAPIView):
 
         Returns:
             Response: HTTP 201 with user registration details and
-            short-lived MFA setup token cookie.
+            short-lived MFA setup token cookie, or HTTP 503 with Retry-After
+            when the KDF executor is saturated.
         """
         serializer = self.get_serializer(data=request.data)
         try:
@@ -161,7 +222,10 @@ class RegisterView(generics.CreateAPIView):
                 {"error": e.detail}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        user = serializer.save()
+        try:
+            user = serializer.save()
+        except KDFUnavailable as e:
+            return kdf_unavailable_response(e)
         vault_key = serializer.validated_data["vault_key"]
 
         # Set short lived HTTP-only cookie for MFA flow
@@ -190,7 +254,8 @@ class LoginView(generics.CreateAPIView):
     authenticate an existing user using LoginSerializer.
 
     Handles:
-        - Credential validation using deterministic key comparison
+        - Credential validation using deterministic key comparison, from the
+          master password or a client-derived auth key
         - MFA status detection and flow initiation
         - Generation of short-lived signed cookies for MFA setup/verification
 
@@ -213,6 +278,7 @@ class LoginView(generics.CreateAPIView):
                 - 200 OK: User requires MFA verification.
                 - 403 Forbidden: MFA setup required.
                 Includes a signed short-lived cookie for the next step.
+                - 503 Service Unavailable: KDF executor saturated (Retry-After set).
         """
         serializer = self.get_serializer(data=request.data)
         try:
@@ -221,9 +287,13 @@ class LoginView(generics.CreateAPIView):
             return Response(
                 {"error": e.detail}, status=status.HTTP_400_BAD_REQUEST
             )
+        except KDFUnavailable as e:
+            return kdf_unavailable_response(e)
 
         user = serializer.validated_data["user"]
+        # Clients that derived the keys themselves keep the vault key, the MFA flow then carries none
         vault_key = serializer.validated_data["vault_key"]
+        vault_key = vault_key.hex() if vault_key is not None else None
 
         # Check if user has a confirmed TOTP device
         device = default_device(user)
@@ -254,7 +324,7 @@ class LoginView(generics.CreateAPIView):
 
         # Set short lived HTTP-only cookie for MFA flow
         mfa_token = create_signed_token(
-            data={"user_id": user.id, "vault_key": vault_key.hex()},
+            data={"user_id": user.id, "vault_key": vault_key},
             salt=mfa_token_salt,
         )
         response.set_cookie(
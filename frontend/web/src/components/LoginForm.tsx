@@ -3,7 +3,7 @@ This is the Login Form component for the Secure Password Manager web app.
 
 Features:
 - Username/Email and password fields
-- Login button
+- Login button, deriving the keys in the browser when the account supports it
 - Error message display
 - Switch to registration form
 
@@ -27,7 +27,8 @@ import {Button} from './Button';
 import {Input} from './Input';
 import {Spacer} from './Spacer';
 import styles from "../pages/Page.module.css";
-import { apiRequest } from "../utils/http/apiRequest";
+import { login } from "../utils/auth/login";
+import { useVaultKey } from '../contexts/useVaultKey';
 
 type LoginResponse = {
   // True if user requires MFA verification (MFA device already setup)
@@ -58,6 +59,7 @@ export default function LoginForm({onSwitchToRegister,}: LoginFormProps) {
   const [error, setError] = useState("");
   const [isLoading, setIsLoading] = useState(false);
   const navigate = useNavigate();
+  const { setVaultKey } = useVaultKey();
 
   // Runs when user submits login form
   async function submitLoginForm(e: React.FormEvent) {
@@ -74,15 +76,13 @@ export default function LoginForm({onSwitchToRegister,}: LoginFormProps) {
     }
 
     try {
-      const response = await apiRequest<LoginResponse>("/api/auth/login/", {
-        method: "POST",
-        body: {username, password},
-        suppressErrors: true,  // allows 403 for when mfa setup is required
-      });
+      // Client key derivation keeps the vault key in the browser, the MFA flow then returns none
+      const { response, vaultKey } = await login<LoginResponse>(username, password);
 
       // Return descriptive error message if necessary
       const status = response?.status ?? 200;
-      if (status !== 200 && !(status === 403 && response?.data?.mfa_required)) {
+      const mfaSetupRequired = response?.data?.mfa_required || response?.data?.is_mfa_setup === false;
+      if (status !== 200 && !(status === 403 && mfaSetupRequired)) {
         let errorResponse = response.data?.detail || response.data?.error || response.message;
 
         if (typeof errorResponse === "object") {
@@ -99,6 +99,11 @@ export default function LoginForm({onSwitchToRegister,}: LoginFormProps) {
         return;
       }
 
+      // Keep the vault key derived in the browser through the MFA flow
+      if (vaultKey) {
+        setVaultKey(vaultKey);
+      }
+
       // Force SessionManager to run and redirect
       navigate("/login?refresh", { replace: true });
       return;
@@ -20,7 +20,7 @@ import { Spacer } from './Spacer';
 type MFAVerifySuccessResponse = {
   access: string;
   refresh: string;
-  vault_key: string;  // hex-encoded vault key from backend
+  vault_key: string | null;  // hex-encoded vault key from backend, null after client key derivation
 };
 
 type MFAVerifyErrorResponse = {
@@ -79,7 +79,8 @@ export default function MFAVerifyForm() {
         return;
       }
 
-      // Store vault key in context for encryption/decryption
+      // Store vault key in context for encryption/decryption. After client key derivation
+      // the backend returns none and LoginForm has already stored the derived key
       const successData = response.data as MFAVerifySuccessResponse;
       if (successData.vault_key) {
         setVaultKey(successData.vault_key);
@@ -5,6 +5,8 @@ Features:
 - Allows user to manually check the strength of any password
 - Displays strength score, visual indicator, and recommendations
 - Auto-checks password strength when a password is generated
+- Scores the password live while typing over a WebSocket when the server supports it
+  (see generator/live.py), the Check Strength button always uses the REST endpoint
 
 ** GenAI Citation for Becky: **
 Portions of this code related to refactoring Generator.tsx into seperate components were generated with
@@ -21,7 +23,7 @@ The conversation in the file below documents the GenAI Interaction that led to m
 */
 
 // Imports React and styles
-import { useState, useEffect, type FC } from 'react';
+import { useState, useEffect, useRef, type FC } from 'react';
 import { FontAwesomeIcon } from '@fortawesome/react-fontawesome';
 import { faCheck, faCopy } from '@fortawesome/free-solid-svg-icons';
 import {Button} from './Button';
@@ -34,8 +36,17 @@ interface PasswordStrengthResult {
   score: number;
   strength: "Strong" | "Moderate" | "Weak";
   notes: string[];
+  // Estimated time to crack per attacker model (e.g. offline_fast_hash)
+  crack_times?: Record<string, { seconds_log10: number; display: string }>;
 }
 
+// Labels for the default attacker models, other models show their configured name
+const ATTACKER_MODEL_LABELS: Record<string, string> = {
+  online_throttled: "Online attack (rate limited)",
+  offline_slow_hash: "Offline attack (slow hash)",
+  offline_fast_hash: "Offline attack (fast hash)",
+};
+
 // If password is provided, auto-check password strength
 // passwordToAutoCheck: password to check strength (string password) else undefined
 interface StrengthCalculatorProps {
@@ -68,6 +79,41 @@ export default function PasswordStrengthCalculator({
   const [strengthError, setStrengthError] = useState("");
   const [isCheckingStrength, setIsCheckingStrength] = useState(false);
   const [isCopied, setIsCopied] = useState(false);
+  // Live scoring socket and the id of the latest password sent on it
+  const liveSocket = useRef<WebSocket | null>(null);
+  const liveRequestId = useRef(0);
+
+  // Opens the live scoring socket once, the calculator works without it (e.g. WSGI deployments)
+  useEffect(() => {
+    const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
+    let socket: WebSocket;
+    try {
+      socket = new WebSocket(`${protocol}//${window.location.host}/generator/ws/strength/`);
+    } catch (_err) {
+      return;
+    }
+    socket.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      // Ignore replies for passwords the user has already changed
+      if (data.id !== liveRequestId.current) return;
+      if (data.error) {
+        setStrengthData(null);
+      } else {
+        setStrengthData(data);
+      }
+    };
+    socket.onclose = () => { liveSocket.current = null; };
+    liveSocket.current = socket;
+    return () => socket.close();
+  }, []);
+
+  // Sends the current password for live scoring if the socket is open
+  function scoreLive(password: string) {
+    const socket = liveSocket.current;
+    if (!socket || socket.readyState !== WebSocket.OPEN) return;
+    liveRequestId.current += 1;
+    socket.send(JSON.stringify({ id: liveRequestId.current, password }));
+  }
 
   // automatically checks password strength when new password is passed in as prop
   useEffect(() => {
@@ -148,6 +194,7 @@ export default function PasswordStrengthCalculator({
             value={checkPassword}
             onChange={(e) => {
               setCheckPassword(e.target.value);
+              scoreLive(e.target.value);
               if (strengthError) setStrengthError("");
               if (isCopied) setIsCopied(false);
             }}
@@ -214,6 +261,20 @@ export default function PasswordStrengthCalculator({
               }}
             />
           </div>
+          {/* Display estimated crack times per attacker model */}
+          {strengthData.crack_times && (
+            <div style={{ marginBottom: 10, fontSize: "0.9em" }}>
+              <strong>Estimated time to crack:</strong>
+              <ul style={{ marginTop: 8, paddingLeft: 20 }}>
+                {Object.entries(strengthData.crack_times).map(([model, time]) => (
+                  <li key={model} style={{ marginBottom: 4, color: "dimgray" }}>
+                    {ATTACKER_MODEL_LABELS[model] ?? model}: {time.display}
+                  </li>
+                ))}
+              </ul>
+            </div>
+          )}
+
           {/* If backend sends suggestions, display notes */}
           {strengthData.notes && strengthData.notes.length > 0 && (
             <div>
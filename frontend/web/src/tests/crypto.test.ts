@@ -13,7 +13,7 @@
 
 import { describe, it, expect } from 'vitest'
 import { toBytes, toHex, isValidHex } from "../utils/crypto/helpers"
-import { encryptVaultEntry, decryptVaultEntry} from '../utils/crypto'
+import { encryptVaultEntry, decryptVaultEntry, deriveLoginKeys } from '../utils/crypto'
 
 describe('Vault Crypto Helpers', () => {
     describe(toBytes, () => {
@@ -235,3 +235,23 @@ describe('Vault Crypto Utilities', () => {
         });
     });
 });
+
+describe('Login Key Derivation', () => {
+    const email = 'curleyr@oregonstate.edu';
+    const password = 'ThisIsMyStrongPassword123';
+    const params = { kdf_algorithm: 'pbkdf2_sha256', kdf_params: { iterations: 1000 } };
+
+    describe(deriveLoginKeys, () => {
+        it('matches the server derivation', async () => {
+            // Expected keys from auth_service.utils.hashing.derive_keys with 1000 PBKDF2 iterations
+            const { vaultKey, authKey } = await deriveLoginKeys(email, password, params);
+            expect(toHex(vaultKey)).toBe('7b574bd69591ce651fab0beb414a648b8f93571d1acada1cad05f72c01db9d9f');
+            expect(authKey).toBe('918f1ff298f27bf21d8da9b6046d9138d5943b5256072262c439822547628d9c');
+        });
+
+        it('throws for algorithms WebCrypto cannot derive', async () => {
+            const scrypt = { kdf_algorithm: 'scrypt', kdf_params: { n: 1024, r: 8, p: 1 } };
+            await expect(deriveLoginKeys(email, password, scrypt)).rejects.toThrow();
+        });
+    });
+});
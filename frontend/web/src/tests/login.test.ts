@@ -0,0 +1,109 @@
+// @vitest-environment jsdom
+/**
+* Login Flow Tests
+*
+* This module provides tests for the login utility: prelogin, client key derivation
+* and the login request, and the master password fallback.
+*
+* References:
+*   - https://vitest.dev/guide/
+*
+* Notes:
+*   - To run tests locally: pnpm test
+*   - To run tests locally with coverage: pnpm coverage
+*/
+
+import { describe, it, expect, beforeEach, afterEach, vi } from "vitest";
+import { login } from "../utils/auth";
+import { toHex } from "../utils/crypto/helpers";
+
+const username = "bcurley";
+const email = "curleyr@oregonstate.edu";
+const password = "ThisIsMyStrongPassword123";
+
+// Mocks fetch with the prelogin response followed by a 403 MFA setup login response
+const mockResponses = (prelogin: Record<string, unknown>) => {
+  const fetchMock = vi.fn()
+    .mockResolvedValueOnce({ ok: true, status: 200, statusText: "OK", json: async () => prelogin })
+    .mockResolvedValueOnce({
+      ok: false, status: 403, statusText: "Forbidden", json: async () => ({ username, is_mfa_setup: false }),
+    });
+  vi.stubGlobal("fetch", fetchMock);
+  return fetchMock;
+};
+
+const loginBody = (fetchMock: ReturnType<typeof vi.fn>) => {
+  const [url, options] = fetchMock.mock.calls[1];
+  expect(url).toBe("/api/auth/login/");
+  return JSON.parse((options as RequestInit).body as string);
+};
+
+describe("Login Utilities", () => {
+  beforeEach(() => {
+    globalThis.document.cookie = "csrftoken=56789";
+    vi.restoreAllMocks();
+  });
+
+  afterEach(() => {
+    vi.unstubAllGlobals();
+    vi.restoreAllMocks();
+  });
+
+  describe(login, () => {
+    it("derives the keys in the browser and sends only the auth key", async () => {
+      const fetchMock = mockResponses({
+        kdf_version: 2, kdf_algorithm: "pbkdf2_sha256", kdf_params: { iterations: 1000 },
+        salt: email, client_key_derivation: true,
+      });
+
+      const { response, vaultKey } = await login(username, password);
+
+      expect(fetchMock.mock.calls[0][0]).toBe("/api/auth/prelogin/");
+      expect(JSON.parse(fetchMock.mock.calls[0][1].body)).toEqual({ username });
+      // Expected keys from auth_service.utils.hashing.derive_keys with 1000 PBKDF2 iterations
+      expect(loginBody(fetchMock)).toEqual({
+        username, auth_key: "918f1ff298f27bf21d8da9b6046d9138d5943b5256072262c439822547628d9c",
+      });
+      expect(toHex(vaultKey as Uint8Array)).toBe("7b574bd69591ce651fab0beb414a648b8f93571d1acada1cad05f72c01db9d9f");
+      // The vault key is kept for the MFA flow, which returns none after client key derivation
+      expect(response).toEqual({ status: 403, message: "Forbidden", data: { username, is_mfa_setup: false } });
+    });
+
+    it("logs in with the master password when the account has no client key derivation", async () => {
+      const fetchMock = mockResponses({
+        kdf_version: 2, kdf_algorithm: "pbkdf2_sha256", kdf_params: { iterations: 1000 },
+        salt: email, client_key_derivation: false,
+      });
+
+      const { vaultKey } = await login(username, password);
+
+      expect(loginBody(fetchMock)).toEqual({ username, password });
+      expect(vaultKey).toBeNull();
+    });
+
+    it("falls back to the master password when the browser cannot derive the keys", async () => {
+      const fetchMock = mockResponses({
+        kdf_version: 2, kdf_algorithm: "scrypt", kdf_params: { n: 131072, r: 8, p: 1 },
+        salt: email, client_key_derivation: true,
+      });
+
+      const { vaultKey } = await login(username, password);
+
+      expect(loginBody(fetchMock)).toEqual({ username, password });
+      expect(vaultKey).toBeNull();
+    });
+
+    it("logs in with the master password when prelogin fails", async () => {
+      const fetchMock = vi.fn()
+        .mockResolvedValueOnce({ ok: false, status: 400, statusText: "Bad Request", json: async () => ({}) })
+        .mockResolvedValueOnce({ ok: false, status: 400, statusText: "Bad Request", json: async () => ({}) });
+      vi.stubGlobal("fetch", fetchMock);
+
+      const { response, vaultKey } = await login(username, password);
+
+      expect(loginBody(fetchMock)).toEqual({ username, password });
+      expect(response.status).toBe(400);
+      expect(vaultKey).toBeNull();
+    });
+  });
+});
@@ -1 +1,2 @@
-export * from "./hasAccessToken";
\ No newline at end of file
+export * from "./hasAccessToken";
+export * from "./login";
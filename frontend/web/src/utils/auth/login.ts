@@ -0,0 +1,57 @@
+/*
+Logs in with client key derivation when the account supports it.
+
+The browser asks /api/auth/prelogin/ for the key derivation parameters, derives the vault key
+and auth key itself (deriveLoginKeys) and sends only the auth key, so the master password and
+vault key never leave the browser. The caller keeps the returned vault key; the MFA flow then
+returns none. Accounts without client key derivation (no auth verifier yet, or an algorithm
+WebCrypto cannot derive) and browsers without WebCrypto log in with the master password, and
+the vault key comes from the MFA verification response instead.
+*/
+
+import { apiRequest, type ApiResponse } from "../http/apiRequest";
+import { deriveLoginKeys, type LoginKdfParams, type LoginKeys } from "../crypto/deriveLoginKeys";
+
+type PreloginResponse = LoginKdfParams & {
+  kdf_version: number;
+  salt: string;
+  client_key_derivation: boolean;
+};
+
+export type LoginResult<T> = {
+  response: ApiResponse<T>;
+  // Vault key derived in the browser, null when the server derived it
+  vaultKey: Uint8Array | null;
+};
+
+export const login = async <T = unknown>(username: string, password: string): Promise<LoginResult<T>> => {
+  const prelogin = await apiRequest<PreloginResponse>("/api/auth/prelogin/", {
+    method: "POST",
+    body: { username },
+    suppressErrors: true,
+  });
+
+  if (prelogin.status === 200 && prelogin.data?.client_key_derivation) {
+    let keys: LoginKeys | null = null;
+    try {
+      keys = await deriveLoginKeys(prelogin.data.salt, password, prelogin.data);
+    } catch {
+      // WebCrypto unavailable (e.g. insecure context), fall back to the master password
+    }
+    if (keys) {
+      const response = await apiRequest<T>("/api/auth/login/", {
+        method: "POST",
+        body: { username, auth_key: keys.authKey },
+        suppressErrors: true,  // allows 403 for when mfa setup is required
+      });
+      return { response, vaultKey: keys.vaultKey };
+    }
+  }
+
+  const response = await apiRequest<T>("/api/auth/login/", {
+    method: "POST",
+    body: { username, password },
+    suppressErrors: true,  // allows 403 for when mfa setup is required
+  });
+  return { response, vaultKey: null };
+};
@@ -0,0 +1,75 @@
+import { toHex } from "./helpers";
+
+// HKDF context of the auth key (followed by the master password), must match AUTH_KEY_INFO
+// in auth_service/utils/hashing.py
+const AUTH_KEY_INFO = 'secure-password-manager auth key v2';
+
+export type LoginKdfParams = {
+    kdf_algorithm: string;
+    kdf_params: Record<string, number>;
+};
+
+export type LoginKeys = {
+    vaultKey: Uint8Array;
+    authKey: string;
+};
+
+/**
+* Derives the vault key and auth key in the browser for client key derivation login
+*
+* The vault key is PBKDF2-HMAC-SHA256(master password, email) and the auth key is expanded
+* from it and the master password with HKDF-SHA256 (KDF version 2), so the server only
+* receives the auth key and the vault key never leaves the browser. Only PBKDF2 accounts
+* can be derived with WebCrypto; other algorithms must log in with the master password.
+*
+* References:
+*   - https://developer.mozilla.org/en-US/docs/Web/API/SubtleCrypto/deriveBits
+*   - https://developer.mozilla.org/en-US/docs/Web/API/SubtleCrypto/sign
+*   - https://datatracker.ietf.org/doc/html/rfc5869
+*
+* @param {string} email - account email, the vault key salt
+* @param {string} password - master password
+* @param {LoginKdfParams} params - algorithm and parameters from /api/auth/prelogin/
+* @returns {Promise<LoginKeys>} raw vault key and hex-encoded auth key
+*/
+export const deriveLoginKeys = async (email: string, password: string, params: LoginKdfParams): Promise<LoginKeys> => {
+    if (params.kdf_algorithm !== 'pbkdf2_sha256') {
+        throw new Error(`Unsupported KDF algorithm for client key derivation: ${params.kdf_algorithm}`);
+    }
+
+    // Encode directly, toBytes would treat a hex-looking password as hex
+    const encoder = new TextEncoder();
+    const passwordKey = await crypto.subtle.importKey(
+        'raw',
+        encoder.encode(password) as BufferSource,
+        'PBKDF2',
+        false,
+        ['deriveBits']
+    );
+    const vaultKey = new Uint8Array(await crypto.subtle.deriveBits(
+        {
+            name: 'PBKDF2',
+            hash: 'SHA-256',
+            salt: encoder.encode(email) as BufferSource,
+            iterations: params.kdf_params.iterations
+        },
+        passwordKey,
+        256
+    ));
+
+    // HKDF-Expand of a single block: HMAC(vault key, info | master password | 0x01)
+    const hmacKey = await crypto.subtle.importKey(
+        'raw',
+        vaultKey as BufferSource,
+        { name: 'HMAC', hash: 'SHA-256' },
+        false,
+        ['sign']
+    );
+    const info = encoder.encode(AUTH_KEY_INFO + password);
+    const block = new Uint8Array(info.length + 1);
+    block.set(info, 0);
+    block[info.length] = 1;
+    const authKey = new Uint8Array(await crypto.subtle.sign('HMAC', hmacKey, block as BufferSource));
+
+    return { vaultKey, authKey: toHex(authKey) };
+}
@@ -1,2 +1,3 @@
 export * from "./encryptVaultEntry";
-export * from "./decryptVaultEntry";
\ No newline at end of file
+export * from "./decryptVaultEntry";
+export * from "./deriveLoginKeys";
\ No newline at end of file
@@ -23,6 +23,11 @@ export default defineConfig({
         target: 'http://127.0.0.1:8000',
         changeOrigin: true,
       },
+      // Live password strength WebSocket (only served when Django runs under ASGI)
+      '/generator/ws': {
+        target: 'ws://127.0.0.1:8000',
+        ws: true,
+      },
       '/api/auth': {
         target: 'http://127.0.0.1:8000',
         changeOrigin: true,
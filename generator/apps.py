@@ -1,6 +1,35 @@
+import logging
+
 from django.apps import AppConfig
 
+logger = logging.getLogger(__name__)
+
 
 class GeneratorConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "generator"
+
+    def ready(self):
+        """Load and validate the common password dictionaries and breach corpus once per process.
+        Memory-mapped structures are attached here so the status endpoint can confirm them."""
+        from generator.breach import get_breach_bloom, get_breach_corpus, try_load
+        from generator.dictionaries import password_dictionaries
+        from generator.estimator import get_automaton
+        from generator.fuzzy import FUZZY_PASSWORDS
+        password_dictionaries.load()
+
+        try:
+            FUZZY_PASSWORDS.load()
+        except (OSError, ValueError) as e:
+            logger.error(f"Fuzzy password index failed to load: {e}")
+        automaton = get_automaton()
+        logger.info(f"Estimator automaton loaded ({automaton.size} states, mapped: {automaton.mapped})")
+
+        # A missing or corrupt breach file is logged once by try_load and skipped afterwards
+        corpus = get_breach_corpus()
+        if corpus is not None and try_load(corpus, 'Breach corpus'):
+            logger.info(f"Breach corpus loaded ({corpus.count} hashes)")
+
+        bloom = get_breach_bloom()
+        if bloom is not None and try_load(bloom, 'Breach Bloom filter'):
+            logger.info(f"Breach Bloom filter loaded ({bloom.bits} bits, {bloom.hashes} hashes)")
@@ -0,0 +1,649 @@
+"""
+Generator Benchmarks: Micro-benchmarks for the password generator and strength calculator.
+
+Each benchmark is a function that returns a list of metrics (name, value, unit).
+Benchmarks are registered in BENCHMARKS and run with:
+    python manage.py benchmark_generator
+
+Features of Generator Benchmarks:
+- generation: passwords per second for the bulk entropy engine, one password per call
+  and the previous secrets.choice per character approach, passphrases per second, and
+  pronounceable passwords per second with their mean and minimum entropy
+- strength_endpoints: per-password latency of the single and batch strength endpoints,
+  including DRF request parsing and response rendering
+- breach_lookup: range and exact lookup latency over a synthetic breach corpus
+- estimator: p50/p99 latency of the guess estimator for 128-character inputs
+  (the serializer's maximum length), random and pattern heavy
+- crack_time: per-call latency of crack_times and of password_strength with and without
+  the crack-time estimates
+- fuzzy_lookup: size of the fuzzy common password index and close variant lookup latency
+- asgi: requests per second of the generator and strength DRF views through the full
+  Django handler under WSGI and under ASGI. Requests are driven in-process (no network
+  server), so the numbers isolate the handler, middleware and view overhead. ASGI runs also
+  report the p99 event loop stall (lateness of a LOOP_TICK timer), the delay every other
+  connection sees.
+- live_strength: per-keystroke cost of typing a password: a full POST through the ASGI
+  handler and DRF view, full password_strength, incremental LiveStrengthScorer updates and
+  a WebSocket message round trip through the live scoring ASGI application
+- streaming: time to first byte, total time and peak Python memory of streamed NDJSON
+  generation responses for growing counts (peak memory should stay flat)
+- utils: best of 5 per-call latency of generate_password at several lengths and option
+  sets, of character_counts and of password_strength on dictionary hits and misses, cold
+  import time of generator.utils and the resident memory added by loading and querying
+  COMMON_PASSWORDS (both measured in a fresh interpreter)
+
+Baselines:
+- run_benchmark runs a benchmark several times and keeps the median of every metric, so a
+  single disturbed run does not become the baseline or a regression
+- Every repeat is bracketed by timings of a fixed pure-Python reference workload
+  (reference_time), whose median is saved per benchmark with the baseline. Comparisons scale
+  the baseline's time and rate metrics by the ratio of the two reference times, so a slower,
+  faster or momentarily busy machine is not reported as a change (memory and entropy metrics
+  are compared unscaled)
+- Results are saved as JSON (BASELINE_PATH by default) with
+  python manage.py benchmark_generator --only utils --repeats 5 --save-baseline
+- compare_to_baseline reports metrics that regressed by more than a threshold (relative
+  change); metrics in HIGHER_IS_BETTER units regress when they shrink, all others when they
+  grow. The management command fails on any regression. CI records the baseline from the
+  base commit on the same runner first and, when there is no usable base commit, falls back
+  to BASELINE_PATH with a looser threshold (see .github/workflows/python-app.yml).
+"""
+
+import asyncio
+import io
+import json
+import os
+import platform
+import secrets
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from unittest.mock import patch
+from wsgiref.util import setup_testing_defaults
+
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+from django.test import override_settings
+from django.urls import include, path
+from rest_framework.test import APIRequestFactory
+
+from generator.breach import BreachCorpus, write_breach_index
+from generator.charclasses import character_counts
+from generator.crack_time import crack_times
+from generator.estimator import estimate_guesses, get_automaton
+from generator.passphrase import generate_passphrases, get_wordlist
+from generator.pronounceable import generate_pronounceable, get_model
+from generator.fuzzy import FUZZY_PASSWORDS, MAX_FUZZY_LENGTH
+from generator.live import LIVE_STRENGTH_PATH, LiveStrengthScorer, websocket_router
+from generator.password_index import COMMON_PASSWORDS
+from generator.utils import generate_password, generate_passwords, password_strength
+from generator.views import PasswordGeneratorAPIView, PasswordStrengthAPIView, PasswordStrengthBatchAPIView
+
+# Interval in seconds of the timer measuring event loop stalls in the asgi benchmark
+LOOP_TICK = 0.001
+
+
+def _timed(func, *args, **kwargs):
+    """Runs func once and returns the elapsed wall clock time in seconds"""
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def _best_of(repeat, func, *args, **kwargs):
+    """Runs func repeat times and returns the fastest wall clock time in seconds
+    (the least disturbed run, stable enough to compare against a baseline)"""
+    return min(_timed(func, *args, **kwargs) for _ in range(repeat))
+
+
+def _secrets_choice_passwords(count, length, alphabets):
+    """Previous generator: one secrets.choice call per character, then a shuffle"""
+    pool = ''.join(alphabets)
+    passwords = []
+    for _ in range(count):
+        password = [secrets.choice(alphabet) for alphabet in alphabets]
+        password += [secrets.choice(pool) for _ in range(length - len(alphabets))]
+        secrets.SystemRandom().shuffle(password)
+        passwords.append(''.join(password))
+    return passwords
+
+
+def bench_generation(count=10000, length=15):
+    """Measures password generation throughput in passwords per second"""
+    options = dict(length=length, uppercase=True, lowercase=True, numbers=True, special=True)
+    alphabets = [string.ascii_uppercase, string.ascii_lowercase, string.digits, string.punctuation]
+
+    batch = _timed(generate_passwords, count, **options)
+    single = _timed(lambda: [generate_password(**options) for _ in range(count)])
+    previous = _timed(_secrets_choice_passwords, count, length, alphabets)
+    get_wordlist()  # Load the packed wordlist before timing
+    passphrases = _timed(generate_passphrases, count, capitalize=True, include_number=True)
+    get_model()  # Load the Markov model before timing
+    pronounceable = _timed(generate_pronounceable, count, length, capitalize=True, include_number=True)
+    bits = [entropy for _, entropy in generate_pronounceable(count, length, capitalize=True, include_number=True)]
+
+    return [
+        (f'generate_passwords batch (length {length})', count / batch, 'passwords/s'),
+        (f'generate_password per call (length {length})', count / single, 'passwords/s'),
+        (f'secrets.choice per character (length {length})', count / previous, 'passwords/s'),
+        (f'generate_passphrases batch of {count} (6 words)', passphrases * 1e3, 'ms'),
+        (f'generate_pronounceable batch (length {length})', count / pronounceable, 'passwords/s'),
+        (f'pronounceable entropy mean (length {length})', sum(bits) / len(bits), 'bits'),
+        (f'pronounceable entropy minimum (length {length})', min(bits), 'bits'),
+    ]
+
+
+def bench_strength_endpoints(size=200):
+    """Compares per-password latency of the single and batch strength endpoints"""
+    factory = APIRequestFactory()
+    single_view = PasswordStrengthAPIView.as_view()
+    batch_view = PasswordStrengthBatchAPIView.as_view()
+    passwords = generate_passwords(size // 2, length=15, uppercase=True, lowercase=True, numbers=True)
+    passwords += ['password1', 'qwerty123'] * (size // 4)
+
+    def run_single():
+        for password in passwords:
+            request = factory.post('/generator/api/check-strength/', {'password': password}, format='json')
+            single_view(request).render()
+
+    def run_batch():
+        request = factory.post('/generator/api/check-strength/batch/', {'passwords': passwords}, format='json')
+        batch_view(request).render()
+
+    run_batch()  # Map the common passwords index before timing
+    single = _timed(run_single)
+    batch = _timed(run_batch)
+
+    return [
+        ('check-strength per password', single / len(passwords) * 1e6, 'us'),
+        (f'check-strength/batch per password (batch of {len(passwords)})', batch / len(passwords) * 1e6, 'us'),
+    ]
+
+
+def bench_breach_lookup(size=200000, lookups=2000):
+    """Measures lookup latency over a synthetic breach corpus of random hashes"""
+    digests = sorted(os.urandom(20) for _ in range(size))
+    handle, path = tempfile.mkstemp(suffix='.idx')
+    os.close(handle)
+    try:
+        write_breach_index(path, (f'{digest.hex()}:{i + 1}' for i, digest in enumerate(digests)))
+        corpus = BreachCorpus(path)
+        corpus.load()
+        prefixes = [digest.hex()[:5] for digest in digests[::size // lookups]]
+        range_time = _timed(lambda: [corpus.range(prefix) for prefix in prefixes])
+        exact_time = _timed(lambda: [corpus.count_for_digest(digest) for digest in digests[::size // lookups]])
+        corpus.close()
+    finally:
+        os.remove(path)
+
+    return [
+        (f'range lookup ({size:,} hashes)', range_time / len(prefixes) * 1e6, 'us'),
+        (f'exact digest lookup ({size:,} hashes)', exact_time / len(prefixes) * 1e6, 'us'),
+    ]
+
+
+def _percentile(samples, percent):
+    """Returns the percentile of a list of samples (nearest rank)"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def bench_estimator(size=1000, length=128):
+    """Measures per-password latency of estimate_guesses at the maximum password length"""
+    get_automaton()  # Build the automaton before timing
+    random_passwords = generate_passwords(size, length=length, uppercase=True, lowercase=True,
+                                          numbers=True, special=True)
+    blocks = ['Password2024!!!!', 'qwertyasdf123456', 'iloveyou1990abcd', 'dragon01/02/1985']
+    patterned_passwords = [(blocks[i % len(blocks)] * length)[:length] for i in range(size)]
+
+    metrics = []
+    for name, passwords in (('random', random_passwords), ('patterned', patterned_passwords)):
+        samples = [_timed(estimate_guesses, password) for password in passwords]
+        metrics.append((f'estimate_guesses p50 ({name}, length {length})', _percentile(samples, 50) * 1e6, 'us'))
+        metrics.append((f'estimate_guesses p99 ({name}, length {length})', _percentile(samples, 99) * 1e6, 'us'))
+    return metrics
+
+
+def bench_crack_time(size=2000):
+    """Measures the latency crack-time estimates add to password_strength"""
+    passwords = generate_passwords(size // 2, length=15, uppercase=True, lowercase=True, numbers=True, special=True)
+    passwords += ['password', 'Password2024!!!!', 'sunshine99', 'qwerty123'] * (size // 8)
+    guesses = [password_strength(password)['guesses_log10'] for password in passwords]
+
+    elapsed = _timed(lambda: [crack_times(value) for value in guesses])
+    with_times = _timed(lambda: [password_strength(password) for password in passwords])
+    with patch('generator.utils.crack_times', lambda guesses: {}):
+        without_times = _timed(lambda: [password_strength(password) for password in passwords])
+    return [
+        ('crack_times per call', elapsed / len(guesses) * 1e6, 'us'),
+        ('password_strength per call (with crack times)', with_times / len(passwords) * 1e6, 'us'),
+        ('password_strength per call (without crack times)', without_times / len(passwords) * 1e6, 'us'),
+    ]
+
+
+def bench_fuzzy_lookup(size=2000):
+    """Reports the fuzzy index size and close variant lookup latency for variants and misses"""
+    variants = ['p@ssw0rd', 'password1!', 'Dr@gon12', 'iloveyou2', 'monkey!!', 'qwertz12'] * (size // 6)
+    misses = generate_passwords(size, length=15, uppercase=True, lowercase=True, numbers=True)
+    longest = generate_passwords(size, length=MAX_FUZZY_LENGTH, lowercase=True)
+
+    FUZZY_PASSWORDS.close_variant_rank('password')  # Map the index before timing
+    metrics = [
+        ('fuzzy index keys', len(FUZZY_PASSWORDS), 'keys'),
+        ('fuzzy index size', os.path.getsize(FUZZY_PASSWORDS.index.path) / 1024, 'KiB'),
+    ]
+    for name, passwords in (('variant', variants), ('miss, length 15', misses), (f'miss, length {MAX_FUZZY_LENGTH}', longest)):
+        elapsed = _timed(lambda: [FUZZY_PASSWORDS.close_variant_rank(password) for password in passwords])
+        metrics.append((f'close_variant_rank per password ({name})', elapsed / len(passwords) * 1e6, 'us'))
+    return metrics
+
+
+class _URLConf:
+    """Root URLconf mounting one set of generator routes under /generator/"""
+
+    def __init__(self, patterns):
+        self.urlpatterns = [path('generator/', include(patterns))]
+
+
+def _wsgi_post(application, url, body):
+    """Sends one JSON POST request through a WSGI application and returns the status line"""
+    environ = {
+        'REQUEST_METHOD': 'POST', 'PATH_INFO': url, 'HTTP_HOST': 'localhost',
+        'CONTENT_TYPE': 'application/json', 'CONTENT_LENGTH': str(len(body)), 'wsgi.input': io.BytesIO(body),
+    }
+    setup_testing_defaults(environ)
+    statuses = []
+    response = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    b''.join(response)
+    response.close()
+    return statuses[0]
+
+
+async def _asgi_post(application, url, body):
+    """Sends one JSON POST request through an ASGI application and returns the status code"""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'POST',
+        'scheme': 'http', 'path': url, 'raw_path': url.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'localhost'), (b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode())],
+        'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+    }
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    statuses = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Future()  # Never disconnects, cancelled once the response is sent
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+
+    await application(scope, receive, send)
+    return statuses[0]
+
+
+def bench_asgi(requests=1000, concurrency=16):
+    """Compares requests per second of the DRF views under WSGI and ASGI"""
+    patterns = [
+        path('api/generate-password/', PasswordGeneratorAPIView.as_view()),
+        path('api/check-strength/', PasswordStrengthAPIView.as_view()),
+    ]
+    endpoints = [
+        ('generate-password', '/generator/api/generate-password/',
+         json.dumps({'length': 15, 'uppercase': True, 'lowercase': True, 'numbers': True}).encode()),
+        ('check-strength', '/generator/api/check-strength/', json.dumps({'password': 'Xk9#mQ2$vL7@pR4!'}).encode()),
+    ]
+
+    def run_wsgi(url, body):
+        application = get_wsgi_application()
+        for _ in range(requests):
+            _wsgi_post(application, url, body)
+
+    def run_asgi(url, body):
+        """Returns: Event loop stalls in seconds, how late a 1 ms timer fired during the run"""
+        application = get_asgi_application()
+        stalls = []
+
+        async def worker(count):
+            for _ in range(count):
+                await _asgi_post(application, url, body)
+
+        async def ticker(done):
+            loop = asyncio.get_running_loop()
+            while not done.is_set():
+                start = loop.time()
+                await asyncio.sleep(LOOP_TICK)
+                stalls.append(loop.time() - start - LOOP_TICK)
+
+        async def run():
+            done = asyncio.Event()
+            tick = asyncio.create_task(ticker(done))
+            await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+            done.set()
+            await tick
+
+        asyncio.run(run())
+        return stalls
+
+    metrics = []
+    for name, url, body in endpoints:
+        for label, runner in (('WSGI', run_wsgi), ('ASGI', run_asgi)):
+            with override_settings(ROOT_URLCONF=_URLConf(patterns)):
+                runner(url, body)  # Warm up
+                start = time.perf_counter()
+                stalls = runner(url, body)
+                elapsed = time.perf_counter() - start
+            metrics.append((f'{name} ({label})', requests / elapsed, 'requests/s'))
+            if stalls:
+                metrics.append((f'{name} ({label}) event loop stall p99', _percentile(stalls, 99) * 1e3, 'ms'))
+    return metrics
+
+
+def bench_live_strength(size=200, length=32):
+    """Measures the per-keystroke cost of scoring passwords while they are typed"""
+    passwords = generate_passwords(size, length=length, uppercase=True, lowercase=True, numbers=True, special=True)
+    keystrokes = [password[:i] for password in passwords for i in range(1, length + 1)]
+
+    def full():
+        for password in keystrokes:
+            password_strength(password)
+
+    def incremental():
+        for password in passwords:
+            scorer = LiveStrengthScorer()
+            for i in range(1, length + 1):
+                scorer.update(password[:i])
+
+    def post():
+        application = get_asgi_application()
+
+        async def run():
+            for password in keystrokes:
+                await _asgi_post(application, '/generator/api/check-strength/',
+                                 json.dumps({'password': password}).encode())
+
+        with override_settings(ROOT_URLCONF=_URLConf([path('api/check-strength/', PasswordStrengthAPIView.as_view())])):
+            asyncio.run(run())
+
+    def websocket():
+        application = websocket_router(None)
+
+        async def run():
+            for password in passwords:
+                inbox = asyncio.Queue()
+                outbox = asyncio.Queue()
+                await inbox.put({'type': 'websocket.connect'})
+                task = asyncio.ensure_future(
+                    application({'type': 'websocket', 'path': LIVE_STRENGTH_PATH, 'headers': []}, inbox.get, outbox.put)
+                )
+                await outbox.get()  # Accepted
+                for i in range(1, length + 1):
+                    await inbox.put({'type': 'websocket.receive', 'text': json.dumps({'password': password[:i]})})
+                    await outbox.get()
+                await inbox.put({'type': 'websocket.disconnect', 'code': 1000})
+                await task
+
+        asyncio.run(run())
+
+    metrics = []
+    for name, func in (('POST, ASGI DRF view', post), ('password_strength', full),
+                       ('LiveStrengthScorer.update', incremental), ('WebSocket message', websocket)):
+        func()  # Warm up
+        metrics.append((f'per keystroke, length {length} ({name})', _timed(func) / len(keystrokes) * 1e6, 'us'))
+    return metrics
+
+
+def bench_streaming(counts=(10000, 100000, 1000000), traced_counts=(10000, 100000)):
+    """Measures streamed generation responses: time to first byte, total time and peak memory.
+    Memory is traced in a separate pass (tracemalloc slows allocation down several times).
+    Counts above GENERATOR_STREAM_MAX_COUNT are allowed here to show memory stays flat."""
+    factory = APIRequestFactory()
+    view = PasswordGeneratorAPIView.as_view()
+
+    @override_settings(GENERATOR_STREAM_MAX_COUNT=max(counts))
+    def stream(count):
+        request = factory.post('/generator/api/generate-password/', {
+            'count': count, 'stream': True, 'length': 15, 'uppercase': True, 'lowercase': True, 'numbers': True,
+        }, format='json')
+        start = time.perf_counter()
+        chunks = iter(view(request))
+        next(chunks)
+        first_byte = time.perf_counter() - start
+        size = sum(len(chunk) for chunk in chunks)
+        return first_byte, time.perf_counter() - start, size
+
+    metrics = []
+    for count in counts:
+        first_byte, total, size = stream(count)
+        metrics += [
+            (f'stream {count:,} passwords: time to first byte', first_byte * 1e3, 'ms'),
+            (f'stream {count:,} passwords: total ({size / 2 ** 20:.1f} MiB body)', total * 1e3, 'ms'),
+        ]
+    for count in traced_counts:
+        tracemalloc.start()
+        stream(count)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        metrics.append((f'stream {count:,} passwords: peak traced memory', peak / 2 ** 20, 'MiB'))
+    return metrics
+
+
+# Fresh interpreter scripts (run from the project root), each prints its result
+_COLD_IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import generator.utils
+print(time.perf_counter() - start)
+"""
+_RSS_SCRIPT = """
+import json
+import resource
+import sys
+from generator.password_index import COMMON_PASSWORDS
+
+
+def rss():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # Peak resident size: kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+before = rss()
+COMMON_PASSWORDS.rank('password')
+loaded = rss()
+for i in range(%d):
+    COMMON_PASSWORDS.rank(str(i))
+print(json.dumps([loaded - before, rss() - before]))
+"""
+
+
+def _run_python(script):
+    """Runs a script in a fresh interpreter from the project root
+    Returns: Its standard output"""
+    root = Path(__file__).resolve().parent.parent
+    result = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def bench_utils(size=1000, lengths=(8, 15, 64, 128), repeat=5, lookups=20000):
+    """Measures the generator and strength calculator entry points in generator.utils"""
+    option_sets = {
+        'lowercase': dict(lowercase=True),
+        'all types': dict(uppercase=True, lowercase=True, numbers=True, special=True),
+    }
+    metrics = []
+    for name, options in option_sets.items():
+        for length in lengths:
+            elapsed = _best_of(repeat, lambda: [generate_password(length, **options) for _ in range(size)])
+            metrics.append((f'generate_password per call (length {length}, {name})', elapsed / size * 1e6, 'us'))
+
+    hits = ['password', '123456', 'qwerty123', 'iloveyou', 'sunshine', 'dragon', 'letmein', 'monkey']
+    hits = hits * (size // len(hits))
+    misses = generate_passwords(size, length=16, uppercase=True, lowercase=True, numbers=True, special=True)
+    for length in (16, 128):
+        passwords = generate_passwords(size, length=length, uppercase=True, lowercase=True, numbers=True, special=True)
+        elapsed = _best_of(repeat, lambda: [character_counts(password) for password in passwords])
+        metrics.append((f'character_counts per call (length {length})', elapsed / size * 1e6, 'us'))
+
+    password_strength('password')  # Map the dictionaries before timing
+    for name, passwords in (('dictionary hit', hits), ('dictionary miss, length 16', misses)):
+        elapsed = _best_of(repeat, lambda: [password_strength(password) for password in passwords])
+        metrics.append((f'password_strength per call ({name})', elapsed / len(passwords) * 1e6, 'us'))
+
+    cold = min(float(_run_python(_COLD_IMPORT_SCRIPT)) for _ in range(repeat))
+    loaded, queried = json.loads(_run_python(_RSS_SCRIPT % lookups))
+    metrics += [
+        (f'cold import generator.utils (best of {repeat})', cold * 1e3, 'ms'),
+        (f'COMMON_PASSWORDS RSS delta (loaded, {len(COMMON_PASSWORDS):,} passwords)', loaded / 1024, 'KiB'),
+        (f'COMMON_PASSWORDS RSS delta (after {lookups:,} lookups)', queried / 1024, 'KiB'),
+    ]
+    return metrics
+
+
+BENCHMARKS = {
+    'generation': bench_generation,
+    'strength_endpoints': bench_strength_endpoints,
+    'breach_lookup': bench_breach_lookup,
+    'estimator': bench_estimator,
+    'crack_time': bench_crack_time,
+    'fuzzy_lookup': bench_fuzzy_lookup,
+    'asgi': bench_asgi,
+    'live_strength': bench_live_strength,
+    'streaming': bench_streaming,
+    'utils': bench_utils,
+}
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'misc' / 'benchmark_baseline.json'
+# Relative change past which a metric counts as a regression
+DEFAULT_THRESHOLD = 0.25
+# Metrics in these units improve as they grow, all others improve as they shrink
+HIGHER_IS_BETTER = frozenset({'passwords/s', 'requests/s', 'bits'})
+# Units that scale with machine speed: times grow and rates shrink on a slower machine
+TIME_UNITS = frozenset({'us', 'ms', 's'})
+RATE_UNITS = frozenset({'passwords/s', 'requests/s'})
+
+
+def _reference_workload():
+    """Fixed pure-Python work (string formatting, hashing, sorting) timed by reference_time"""
+    return sorted(str(i * 7919 % 10007) for i in range(20000))
+
+
+def reference_time(repeat=3):
+    """Returns: Best-of time in microseconds of the reference workload on this machine"""
+    return _best_of(repeat, _reference_workload) * 1e6
+
+
+def run_benchmark(name, repeats=1):
+    """Runs a benchmark repeats times, timing the reference workload before and after each run
+    Returns: [(metric, median value, unit)] in the order of the first run (metrics missing from
+    a run, like stalls that were never measured, use the runs that reported them) and the
+    median reference time in microseconds"""
+    samples = {}
+    references = []
+    for _ in range(max(1, repeats)):
+        before = reference_time()
+        metrics = BENCHMARKS[name]()
+        references.append((before + reference_time()) / 2)
+        for metric, value, unit in metrics:
+            samples.setdefault((metric, unit), []).append(value)
+    metrics = [(metric, statistics.median(values), unit) for (metric, unit), values in samples.items()]
+    return metrics, statistics.median(references)
+
+
+def load_baseline(path=BASELINE_PATH):
+    """Loads saved benchmark results
+    Returns: {benchmark: {metric: {'value', 'unit'}}} (empty if no baseline was saved)"""
+    try:
+        with open(path) as f:
+            return json.load(f)['benchmarks']
+    except FileNotFoundError:
+        return {}
+
+
+def load_references(path=BASELINE_PATH):
+    """Returns: {benchmark: reference workload time in microseconds} saved with a baseline"""
+    try:
+        with open(path) as f:
+            return json.load(f).get('references_us', {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(results, path=BASELINE_PATH, references=None, repeats=1):
+    """Saves benchmark results ({benchmark: [(metric, value, unit)]}) as the baseline,
+    replacing the saved metrics of the benchmarks that were run and keeping the others.
+    references are the run_benchmark reference times ({benchmark: microseconds}), repeats the
+    runs behind every median"""
+    benchmarks = load_baseline(path)
+    saved_references = load_references(path)
+    for name, metrics in results.items():
+        benchmarks[name] = {metric: {'value': round(value, 3), 'unit': unit} for metric, value, unit in metrics}
+        saved_references.pop(name, None)
+    for name, reference in (references or {}).items():
+        saved_references[name] = round(reference, 3)
+    data = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeats': repeats,
+        'references_us': dict(sorted(saved_references.items())),
+        'benchmarks': dict(sorted(benchmarks.items())),
+    }
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+    os.replace(temporary, path)
+
+
+def metric_change(value, baseline_value, unit, scale=1.0):
+    """Returns the relative change of a metric against its baseline, positive when it got worse
+    (None if the baseline value cannot be compared against).
+    scale is this machine's reference time over the baseline's, applied to time and rate units"""
+    if baseline_value <= 0:
+        return None
+    if unit in TIME_UNITS:
+        baseline_value *= scale
+    elif unit in RATE_UNITS:
+        baseline_value /= scale
+    change = (value - baseline_value) / baseline_value
+    return -change if unit in HIGHER_IS_BETTER else change
+
+
+def reference_scale(reference, baseline_reference):
+    """Returns: Ratio of this run's reference time to the baseline's (1.0 if either is unknown)"""
+    if not reference or not baseline_reference:
+        return 1.0
+    return reference / baseline_reference
+
+
+def compare_to_baseline(results, baseline, threshold=DEFAULT_THRESHOLD, scales=None):
+    """Compares benchmark results against a baseline; metrics missing from the baseline or
+    measured in a different unit are skipped. scales ({benchmark: reference_scale}) are passed
+    on to metric_change.
+    Returns: List of (benchmark, metric, baseline value, value, change) for every metric that got
+    worse by more than threshold"""
+    regressions = []
+    for name, metrics in results.items():
+        saved = baseline.get(name, {})
+        scale = (scales or {}).get(name, 1.0)
+        for metric, value, unit in metrics:
+            if metric not in saved or saved[metric]['unit'] != unit:
+                continue
+            change = metric_change(value, saved[metric]['value'], unit, scale)
+            if change is not None and change > threshold:
+                regressions.append((name, metric, saved[metric]['value'], value, change))
+    return regressions
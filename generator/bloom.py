@@ -0,0 +1,149 @@
+"""
+Bloom Filter: Memory-mapped pre-check in front of the breach corpus.
+
+Most passwords scored by password_strength are not in the breach corpus, so the exact
+lookup can be skipped whenever the Bloom filter says "definitely not present". Only
+positives (real hits and the configured rate of false positives) fall through to the
+exact index. The filter is built offline with `python manage.py build_bloom_filter`,
+sized for a target false-positive rate, and memory-mapped at startup.
+
+Keys are SHA-1 digests (the same keys as the breach corpus). Bit positions use double
+hashing over two 64-bit words of the digest: position_i = (h1 + i * h2) mod m.
+
+File layout (little-endian):
+- Header (32 bytes): magic, format version, hash count k, bit count m, item count n
+- Bits: ceil(m / 8) bytes
+
+Features of the Bloom Filter:
+- optimal_parameters sizes m and k for n items and a false-positive rate
+- Hit (maybe present) and miss (definitely absent) counters for tuning the sizing
+- False-positive counter, incremented by the caller when the exact lookup disagrees
+
+References:
+- Bloom filter sizing: https://en.wikipedia.org/wiki/Bloom_filter#Optimal_number_of_hash_functions
+- Double hashing: https://www.eecs.harvard.edu/~michaelm/postscripts/rsa2008.pdf
+"""
+
+import math
+import mmap
+import os
+import struct
+import threading
+
+BLOOM_MAGIC = b'SPMBLOOM'
+BLOOM_VERSION = 1
+# magic, version, hash count, bit count, item count, padding
+HEADER = struct.Struct('<8sHHQQ4x')
+
+
+def optimal_parameters(items, fp_rate):
+    """Returns (bit count, hash count) for a number of items and a target false-positive rate"""
+    if items < 1:
+        items = 1
+    if not 0 < fp_rate < 1:
+        raise ValueError("False-positive rate must be between 0 and 1")
+    bits = math.ceil(-items * math.log(fp_rate) / (math.log(2) ** 2))
+    hashes = max(1, round(bits / items * math.log(2)))
+    return bits, hashes
+
+
+def _positions(digest, bits, hashes):
+    """Yields the k bit positions of a digest"""
+    h1 = int.from_bytes(digest[0:8], 'little')
+    h2 = int.from_bytes(digest[8:16], 'little') | 1
+    for i in range(hashes):
+        yield (h1 + i * h2) % bits
+
+
+def write_bloom_filter(path, digests, items, fp_rate):
+    """Builds a Bloom filter file for an iterable of SHA-1 digests.
+    The bit array is written through a writable memory map, so memory use stays constant.
+    Returns: (bit count, hash count)"""
+    bits, hashes = optimal_parameters(items, fp_rate)
+    size = HEADER.size + (bits + 7) // 8
+
+    with open(path, 'wb') as f:
+        f.truncate(size)
+    with open(path, 'r+b') as f:
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_WRITE) as mm:
+            mm[0:HEADER.size] = HEADER.pack(BLOOM_MAGIC, BLOOM_VERSION, hashes, bits, items)
+            for digest in digests:
+                for position in _positions(digest, bits, hashes):
+                    offset = HEADER.size + (position >> 3)
+                    mm[offset] |= 1 << (position & 7)
+            mm.flush()
+
+    return bits, hashes
+
+
+class BloomFilter:
+    """Read-only, memory-mapped Bloom filter over SHA-1 digests"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mmap = None
+        self.bits = 0
+        self.hashes = 0
+        self.items = 0
+        self.hits = 0
+        self.misses = 0
+        self.false_positives = 0
+        # Load failure reported by breach.try_load, the file is not retried afterwards
+        self.error = None
+
+    def load(self):
+        """Maps the filter file and validates its header"""
+        with self._lock:
+            if self._mmap is not None:
+                return
+            if not os.path.exists(self.path):
+                raise FileNotFoundError(f"Bloom filter not found at: {self.path}")
+            with open(self.path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(mm) < HEADER.size:
+                mm.close()
+                raise ValueError(f"Bloom filter is truncated: {self.path}")
+            magic, version, hashes, bits, items = HEADER.unpack_from(mm, 0)
+            if magic != BLOOM_MAGIC or version != BLOOM_VERSION or bits == 0 \
+                    or len(mm) != HEADER.size + (bits + 7) // 8:
+                mm.close()
+                raise ValueError(f"Bloom filter is invalid: {self.path}")
+            self.bits, self.hashes, self.items = bits, hashes, items
+            self._mmap = mm
+
+    @property
+    def loaded(self):
+        return self._mmap is not None
+
+    def __contains__(self, digest):
+        """Returns False if the digest is definitely absent, True if it may be present"""
+        if self._mmap is None:
+            self.load()
+        mm = self._mmap
+        for position in _positions(digest, self.bits, self.hashes):
+            if not mm[HEADER.size + (position >> 3)] & (1 << (position & 7)):
+                self.misses += 1
+                return False
+        self.hits += 1
+        return True
+
+    def status(self):
+        """Returns sizing and hit/miss counters"""
+        return {
+            'loaded': self._mmap is not None,
+            'bits': self.bits,
+            'hashes': self.hashes,
+            'items': self.items,
+            'hits': self.hits,
+            'misses': self.misses,
+            'false_positives': self.false_positives,
+            'error': self.error,
+        }
+
+    def close(self):
+        """Releases the memory map (mainly for tests using temporary filter files)"""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
@@ -0,0 +1,278 @@
+"""
+Breach Corpus: Offline k-anonymity range lookups over a local breached password hash corpus.
+
+Clients send the first 5 hex characters of a password's SHA-1 hash and get back every
+matching hash suffix with its breach count, in the style of the Pwned Passwords range API.
+The plaintext password (and even the full hash) never leaves the client.
+
+The corpus is compiled from a pre-downloaded "HASH:COUNT" file (SHA-1, ordered by hash) with
+`python manage.py build_breach_index` into one prefix-bucketed file that is memory-mapped, so
+a lookup is a single seek and read regardless of corpus size and memory stays constant.
+
+File layout (little-endian):
+- Header (32 bytes): magic, format version, record count, padding
+- Offsets: (2^20 + 1) x 8-byte unsigned integers, bucket b holds records offsets[b]:offsets[b + 1]
+- Records: count x (18-byte hash tail + 4-byte breach count), sorted by hash
+  The hash tail is bytes 2-19 of the SHA-1 digest, its first nibble still belongs to the prefix.
+
+An optional Bloom filter (see bloom.py, GENERATOR_BREACH_BLOOM_PATH) sits in front of the
+exact lookups used by password_strength, so passwords that are not breached skip the index.
+A configured file that is missing or corrupt is logged once and skipped: password_strength
+then reports no breach (or does the exact lookup without the filter) instead of failing.
+
+References:
+- Pwned Passwords range API: https://haveibeenpwned.com/API/v3#SearchingPwnedPasswordsByRange
+- k-anonymity model: https://blog.cloudflare.com/validating-leaked-passwords-with-k-anonymity/
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+from array import array
+
+from django.conf import settings
+
+from generator.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+BREACH_MAGIC = b'SPMBRIDX'
+BREACH_VERSION = 1
+PREFIX_LENGTH = 5
+BUCKETS = 16 ** PREFIX_LENGTH
+# magic, version, record count, padding
+HEADER = struct.Struct('<8sHQ14x')
+RECORD = struct.Struct('<18sI')
+OFFSETS_SIZE = (BUCKETS + 1) * 8
+
+PREFIX_RE = re.compile(r'^[0-9A-Fa-f]{5}$')
+LINE_RE = re.compile(r'^([0-9A-Fa-f]{40}):(\d+)\s*$')
+
+
+def is_valid_prefix(prefix):
+    """Returns True if prefix is exactly 5 hex characters"""
+    return bool(PREFIX_RE.match(prefix))
+
+
+def write_breach_index(path, lines):
+    """Streams "HASH:COUNT" lines (SHA-1 hex, ascending) into a bucketed breach index.
+    Memory use is constant: only the bucket counts are kept in memory.
+    Returns: Number of records written"""
+    counts = array('Q', bytes(8 * BUCKETS))
+    previous = b''
+    total = 0
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(BREACH_MAGIC, BREACH_VERSION, 0))
+        f.write(bytes(OFFSETS_SIZE))
+
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            match = LINE_RE.match(line)
+            if not match:
+                raise ValueError(f"Line {line_number} is not in HASH:COUNT format")
+            digest = bytes.fromhex(match.group(1))
+            if digest <= previous:
+                raise ValueError(f"Line {line_number} is not in ascending hash order")
+            previous = digest
+
+            f.write(RECORD.pack(digest[2:], min(int(match.group(2)), 0xFFFFFFFF)))
+            counts[int.from_bytes(digest[:3], 'big') >> 4] += 1
+            total += 1
+
+        # Turn bucket sizes into start offsets and fill in the header
+        offsets = array('Q', [0])
+        for bucket in range(BUCKETS):
+            offsets.append(offsets[-1] + counts[bucket])
+        f.seek(0)
+        f.write(HEADER.pack(BREACH_MAGIC, BREACH_VERSION, total))
+        f.write(offsets.tobytes())
+
+    return total
+
+
+class BreachCorpus:
+    """Read-only, memory-mapped view over a breach index file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mmap = None
+        self.count = 0
+        # Load failure reported by try_load, the file is not retried afterwards
+        self.error = None
+
+    def load(self):
+        """Maps the corpus file and validates its header"""
+        with self._lock:
+            if self._mmap is not None:
+                return
+            if not os.path.exists(self.path):
+                raise FileNotFoundError(f"Breach corpus not found at: {self.path}")
+            with open(self.path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(mm) < HEADER.size + OFFSETS_SIZE:
+                mm.close()
+                raise ValueError(f"Breach corpus is truncated: {self.path}")
+            magic, version, count = HEADER.unpack_from(mm, 0)
+            if magic != BREACH_MAGIC or version != BREACH_VERSION \
+                    or len(mm) != HEADER.size + OFFSETS_SIZE + count * RECORD.size:
+                mm.close()
+                raise ValueError(f"Breach corpus is invalid: {self.path}")
+            self.count = count
+            self._mmap = mm
+
+    @property
+    def loaded(self):
+        return self._mmap is not None
+
+    def _bucket(self, bucket):
+        """Returns the raw records of one prefix bucket"""
+        if self._mmap is None:
+            self.load()
+        start, end = struct.unpack_from('<QQ', self._mmap, HEADER.size + bucket * 8)
+        base = HEADER.size + OFFSETS_SIZE
+        return self._mmap[base + start * RECORD.size:base + end * RECORD.size]
+
+    def range(self, prefix):
+        """Returns (suffix, count) pairs for every hash starting with a 5 hex character prefix.
+        Suffixes are the remaining 35 uppercase hex characters of the SHA-1 hash."""
+        records = self._bucket(int(prefix, 16))
+        return [
+            (tail.hex()[1:].upper(), count)
+            for tail, count in RECORD.iter_unpack(records)
+        ]
+
+    def count_for_digest(self, digest):
+        """Returns the breach count for a raw SHA-1 digest (0 if not breached)"""
+        records = self._bucket(int.from_bytes(digest[:3], 'big') >> 4)
+        tail = digest[2:]
+        low, high = 0, len(records) // RECORD.size
+        while low < high:
+            middle = (low + high) // 2
+            offset = middle * RECORD.size
+            candidate = records[offset:offset + 18]
+            if candidate < tail:
+                low = middle + 1
+            elif candidate > tail:
+                high = middle
+            else:
+                return RECORD.unpack_from(records, offset)[1]
+        return 0
+
+    def iter_digests(self):
+        """Yields every SHA-1 digest in the corpus in hash order (used to build the Bloom filter)"""
+        if self._mmap is None:
+            self.load()
+        offsets = array('Q', self._mmap[HEADER.size:HEADER.size + OFFSETS_SIZE])
+        base = HEADER.size + OFFSETS_SIZE
+        for bucket in range(BUCKETS):
+            start, end = offsets[bucket], offsets[bucket + 1]
+            if start == end:
+                continue
+            head = (bucket >> 4).to_bytes(2, 'big')
+            records = self._mmap[base + start * RECORD.size:base + end * RECORD.size]
+            for tail, _ in RECORD.iter_unpack(records):
+                yield head + tail
+
+    def count_for_password(self, password):
+        """Returns the breach count for a plaintext password (0 if not breached)"""
+        return self.count_for_digest(hashlib.sha1(password.encode('utf-8')).digest())
+
+    def close(self):
+        """Releases the memory map (mainly for tests using temporary corpus files)"""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+
+_corpus = None
+_bloom = None
+_corpus_lock = threading.Lock()
+
+
+def get_breach_corpus():
+    """Returns the corpus configured by GENERATOR_BREACH_CORPUS_PATH, or None if not configured"""
+    global _corpus
+    path = getattr(settings, 'GENERATOR_BREACH_CORPUS_PATH', None)
+    if not path:
+        return None
+    with _corpus_lock:
+        if _corpus is None or _corpus.path != str(path):
+            if _corpus is not None:
+                _corpus.close()
+            _corpus = BreachCorpus(str(path))
+        return _corpus
+
+
+def get_breach_bloom():
+    """Returns the Bloom filter configured by GENERATOR_BREACH_BLOOM_PATH, or None if not configured"""
+    global _bloom
+
+    path = getattr(settings, 'GENERATOR_BREACH_BLOOM_PATH', None)
+    if not path:
+        return None
+    with _corpus_lock:
+        if _bloom is None or _bloom.path != str(path):
+            if _bloom is not None:
+                _bloom.close()
+            _bloom = BloomFilter(str(path))
+        return _bloom
+
+
+def try_load(structure, name):
+    """Loads a breach corpus or Bloom filter on first use.
+    A missing or corrupt file is logged once and remembered, so later calls skip it cheaply.
+    Returns: True if the structure is loaded"""
+    if structure.loaded:
+        return True
+    if structure.error is not None:
+        return False
+    try:
+        structure.load()
+    except (OSError, ValueError) as e:
+        structure.error = str(e)
+        logger.error(f"{name} failed to load, breach checks skip it: {e}")
+        return False
+    return True
+
+
+def breached_count(password):
+    """Returns how often a password appears in the breach corpus (0 if absent or not configured).
+    The Bloom filter, when configured, answers the common "not breached" case without
+    touching the corpus. Only positives fall through to the exact lookup.
+    An unusable corpus counts as not breached, an unusable filter is bypassed."""
+    corpus = get_breach_corpus()
+    if corpus is None or not try_load(corpus, 'Breach corpus'):
+        return 0
+
+    digest = hashlib.sha1(password.encode('utf-8')).digest()
+    bloom = get_breach_bloom()
+    if bloom is not None and not try_load(bloom, 'Breach Bloom filter'):
+        bloom = None
+    if bloom is not None and digest not in bloom:
+        return 0
+
+    count = corpus.count_for_digest(digest)
+    if bloom is not None and count == 0:
+        bloom.false_positives += 1
+    return count
+
+
+def breach_status():
+    """Returns the load status of the breach corpus and Bloom filter counters"""
+    corpus = get_breach_corpus()
+    bloom = get_breach_bloom()
+    return {
+        'configured': corpus is not None,
+        'loaded': corpus is not None and corpus.loaded,
+        'count': corpus.count if corpus is not None else 0,
+        'error': corpus.error if corpus is not None else None,
+        'bloom': bloom.status() if bloom is not None else None,
+    }
@@ -0,0 +1,86 @@
+"""
+Character Classes: Per-class character counts from one precomputed byte lookup table.
+
+Classifying a password character by character with `c in string.ascii_uppercase` scans a
+string per class for every character in pure Python. A classifier instead compiles its
+character classes once into a 256-byte translate table mapping every byte to the index of
+its class. A password is encoded to UTF-8 and translated in a single C-level pass
+(bytes.translate), and each class is then counted with bytes.count. Class characters are
+ASCII, so they are always one UTF-8 byte; every byte of a multi-byte character maps to the
+"other" class, which is therefore counted as the characters left over.
+
+The same table serves the strength calculator (character types and brute force pool size),
+live scoring (counts adjusted for the edited characters) and password policies (checking a
+password against the per-class minimum counts).
+
+Features of Character Classes:
+- CharacterClassifier compiles named ASCII character classes, counts returns a named tuple
+  of per-class counts with an "other" count for the remaining characters
+- CHARACTER_CLASSES classifies uppercase, lowercase, numbers and special characters
+- character_counts and pool_cardinality for the default classes
+
+References:
+- bytes.translate: https://docs.python.org/3/library/stdtypes.html#bytes.translate
+- NIST Password Guidelines: https://sprinto.com/blog/nist-password-guidelines/
+"""
+
+import string
+from collections import namedtuple
+
+# Brute force pool size of each default class, and of any character outside them
+CLASS_SIZES = (26, 26, 10, 33)
+OTHER_SIZE = 100
+
+
+class CharacterClassifier:
+    """Byte lookup table classifying characters into named, disjoint ASCII classes"""
+
+    def __init__(self, classes):
+        self.names = tuple(classes)
+        if len(self.names) > 255:
+            raise ValueError("At most 255 character classes can be classified together")
+        other = len(self.names)
+        table = bytearray([other]) * 256
+        for index, alphabet in enumerate(classes.values()):
+            for c in alphabet:
+                if not c.isascii():
+                    raise ValueError(f"Character {c!r} is not ASCII")
+                if table[ord(c)] != other:
+                    raise ValueError(f"Character {c!r} is in more than one class")
+                table[ord(c)] = index
+        self.table = bytes(table)
+        self._indexes = range(other)
+        self.Counts = namedtuple('CharacterCounts', self.names + ('other',))
+
+    def counts(self, text):
+        """Counts the characters of text in every class
+        Returns: Named tuple of per-class counts, with the characters in no class as other"""
+        classified = text.encode('utf-8', 'surrogatepass').translate(self.table)
+        counts = list(map(classified.count, self._indexes))
+        counts.append(len(text) - sum(counts))
+        return self.Counts._make(counts)
+
+    def __repr__(self):
+        return f'CharacterClassifier({", ".join(self.names)})'
+
+
+CHARACTER_CLASSES = CharacterClassifier({
+    'uppercase': string.ascii_uppercase,
+    'lowercase': string.ascii_lowercase,
+    'numbers': string.digits,
+    'special': string.punctuation,
+})
+
+
+def character_counts(text):
+    """Returns the uppercase, lowercase, numbers, special and other character counts of text"""
+    return CHARACTER_CLASSES.counts(text)
+
+
+def pool_cardinality(counts):
+    """Size of the character pool covering the classes with a non-zero count
+    (counts as returned by character_counts)"""
+    cardinality = sum(size for size, count in zip(CLASS_SIZES, counts) if count)
+    if counts.other:
+        cardinality += OTHER_SIZE  # Spaces, unicode and other characters
+    return cardinality or 1
@@ -0,0 +1,108 @@
+"""
+Crack Time Estimation: Guesses-to-crack and crack times of a password for attacker models.
+
+The number of guesses an attacker needs is the smaller of:
+- the frequency rank of the whole password in the common password dictionaries (an attacker
+  tries the list in order), looked up in the memory-mapped index (see password_index.py)
+- for a close variant of a common password (see fuzzy.py), the rank of that password times
+  VARIANT_GUESSES, the leetspeak and single-character edits a rule-based attacker tries
+  per listed password
+- the guess estimate of the estimator (see estimator.py), which already charges dictionary
+  tokens their rank from the automaton's precomputed log2 guess table and brute-forces the
+  remainder
+
+Crack times divide the guesses by the guess rate of each attacker model. Everything is done
+in log10 space, so a call is a few additions and table lookups:
+- Attacker models are compiled once into (name, log10 guesses per second) tables, cached by
+  the configured models
+- Display strings come from a precomputed table of log10 unit boundaries (bisect)
+
+Attacker models are configured with the GENERATOR_ATTACKER_MODELS setting (guesses per
+second), example:
+    GENERATOR_ATTACKER_MODELS = {
+        "online_throttled": 100 / 3600,
+        "offline_slow_hash": 1e4,
+        "offline_fast_hash": 1e10,
+    }
+
+Features of Crack Time Estimation:
+- guesses_log10 combines the dictionary and close variant ranks with the estimator's guesses
+- crack_times returns seconds (log10) and a display string for every attacker model
+
+References:
+- zxcvbn crack time scenarios: https://github.com/dropbox/zxcvbn#usage
+- Hashcat benchmarks: https://hashcat.net/wiki/doku.php?id=example_hashes
+"""
+
+import math
+from bisect import bisect_right
+from functools import lru_cache
+
+from django.conf import settings
+
+MINUTE = 60
+HOUR = MINUTE * 60
+DAY = HOUR * 24
+MONTH = DAY * 31
+YEAR = MONTH * 12
+CENTURY = YEAR * 100
+
+# (log10 of the unit's lower bound in seconds, unit in seconds, unit name), ascending
+_DISPLAY_UNITS = (
+    (0.0, 1, 'second'),
+    (math.log10(MINUTE), MINUTE, 'minute'),
+    (math.log10(HOUR), HOUR, 'hour'),
+    (math.log10(DAY), DAY, 'day'),
+    (math.log10(MONTH), MONTH, 'month'),
+    (math.log10(YEAR), YEAR, 'year'),
+)
+_DISPLAY_BOUNDS = [bound for bound, _, _ in _DISPLAY_UNITS]
+_CENTURY_LOG10 = math.log10(CENTURY)
+
+# Variants tried per common password by rule-based cracking (hashcat best64 and
+# leetspeak tables run to hundreds of rules, one-character edits to about a thousand)
+VARIANT_GUESSES = 1000
+
+
+def guesses_log10(estimate, common_rank=None, variant_rank=None):
+    """Returns the log10 guesses to crack a password from its estimate_guesses result, its
+    rank in the common password dictionaries and the rank of the common password it is a
+    close variant of (None if not listed)"""
+    guesses = estimate['guesses_log10']
+    if common_rank is not None:
+        guesses = min(guesses, round(math.log10(common_rank), 2))
+    if variant_rank is not None:
+        guesses = min(guesses, round(math.log10(variant_rank * VARIANT_GUESSES), 2))
+    return guesses
+
+
+def display_time(seconds_log10):
+    """Returns a human readable duration for 10 ** seconds_log10 seconds"""
+    if seconds_log10 < 0:
+        return 'less than a second'
+    if seconds_log10 >= _CENTURY_LOG10:
+        return 'centuries'
+    _, unit, name = _DISPLAY_UNITS[bisect_right(_DISPLAY_BOUNDS, seconds_log10) - 1]
+    count = round(10 ** seconds_log10 / unit)
+    return f'{count} {name}' if count == 1 else f'{count} {name}s'
+
+
+@lru_cache(maxsize=16)
+def _compile(models):
+    return tuple((name, math.log10(rate)) for name, rate in models)
+
+
+def attacker_models():
+    """Returns (name, log10 guesses per second) for the configured attacker models, compiled
+    once per configuration"""
+    return _compile(tuple(settings.GENERATOR_ATTACKER_MODELS.items()))
+
+
+def crack_times(guesses):
+    """Estimates the time to crack a password needing 10 ** guesses guesses.
+    Returns: Seconds (log10) and display string per attacker model in dictionary format"""
+    times = {}
+    for name, rate in attacker_models():
+        seconds = guesses - rate
+        times[name] = {'seconds_log10': round(seconds, 2), 'display': display_time(seconds)}
+    return times
@@ -0,0 +1,230 @@
+"""
+Password Dictionary Providers: Pluggable common password corpora for the strength calculator.
+
+Each provider wraps one password corpus (the bundled NCSC 100k index, a custom organisation
+list, ...) behind the same small interface so password_strength never deals with files.
+Providers are configured with the GENERATOR_PASSWORD_DICTIONARIES setting, loaded and
+validated once in GeneratorConfig.ready, and report their load status and size.
+
+Example setting:
+    GENERATOR_PASSWORD_DICTIONARIES = [
+        {
+            "NAME": "ncsc-100k",
+            "BACKEND": "generator.dictionaries.BinaryIndexProvider",
+            "OPTIONS": {"path": BASE_DIR / "generator" / "misc" / "common_passwords.idx"},
+        },
+        {
+            "NAME": "org-banned",
+            "BACKEND": "generator.dictionaries.TextFileProvider",
+            "OPTIONS": {"path": "/etc/password-manager/banned.txt"},
+        },
+    ]
+
+Features of Password Dictionary Providers:
+- BinaryIndexProvider: memory-mapped binary index built by misc/build_password_index.py
+- TextFileProvider: newline separated list, most common first (for small custom lists)
+- Registry returns the best frequency rank across all providers
+- Providers report bytes memory-mapped (shared between workers) versus private
+- Reloads automatically when the setting changes (e.g. override_settings in tests)
+
+References:
+- Django AppConfig.ready: https://docs.djangoproject.com/en/5.2/ref/applications/#django.apps.AppConfig.ready
+- setting_changed signal: https://docs.djangoproject.com/en/5.2/ref/signals/#setting-changed
+"""
+
+import logging
+import sys
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from generator.password_index import PasswordIndex
+
+logger = logging.getLogger(__name__)
+
+
+class DictionaryProvider:
+    """Base class for password dictionary providers.
+    Subclasses implement _load() and _rank()."""
+    # True if the corpus is memory-mapped and shared by every worker process once loaded
+    shared = False
+
+    def __init__(self, name, **options):
+        self.name = name
+        self.options = options
+        self.loaded = False
+        self.error = None
+
+    def load(self):
+        """Loads and validates the corpus. Errors are recorded in status() and re-raised."""
+        try:
+            self._load()
+        except Exception as e:
+            self.loaded = False
+            self.error = e
+            raise
+        self.loaded = True
+        self.error = None
+
+    def rank(self, password):
+        """Returns the frequency rank of a password (1 = most common) or None if not listed"""
+        if not self.loaded:
+            self.load()
+        return self._rank(password)
+
+    def __len__(self):
+        if not self.loaded:
+            self.load()
+        return self._size()
+
+    def status(self):
+        """Returns the load status, size and memory use of the provider"""
+        return {
+            'name': self.name,
+            'backend': type(self).__name__,
+            'loaded': self.loaded,
+            'size': self._size() if self.loaded else 0,
+            'error': str(self.error) if self.error else None,
+            'memory': self.memory_status(),
+        }
+
+    def memory_status(self):
+        """Returns whether the corpus is memory-mapped and the mapped and private byte counts"""
+        raise NotImplementedError
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _rank(self, password):
+        raise NotImplementedError
+
+    def _size(self):
+        raise NotImplementedError
+
+
+class BinaryIndexProvider(DictionaryProvider):
+    """Provider backed by a memory-mapped binary index (see password_index.py)"""
+    shared = True
+
+    def __init__(self, name, path, **options):
+        super().__init__(name, path=path, **options)
+        self.index = PasswordIndex(path)
+
+    def _load(self):
+        # The first lookup maps and validates the file
+        self.index.rank('')
+
+    def _rank(self, password):
+        return self.index.rank(password)
+
+    def _size(self):
+        return len(self.index)
+
+    def memory_status(self):
+        return self.index.memory_status()
+
+
+class TextFileProvider(DictionaryProvider):
+    """Provider backed by a newline separated text file, most common password first"""
+
+    def __init__(self, name, path, encoding='utf-8', **options):
+        super().__init__(name, path=path, encoding=encoding, **options)
+        self.path = path
+        self.encoding = encoding
+        self._ranks = {}
+
+    def _load(self):
+        ranks = {}
+        with open(self.path, 'r', encoding=self.encoding) as f:
+            for position, line in enumerate(f, start=1):
+                password = line.rstrip('\r\n')
+                if password:
+                    ranks.setdefault(password, position)
+        if not ranks:
+            raise ValueError(f"Password dictionary is empty: {self.path}")
+        self._ranks = ranks
+
+    def _rank(self, password):
+        return self._ranks.get(password)
+
+    def _size(self):
+        return len(self._ranks)
+
+    def memory_status(self):
+        # Approximate: the dict plus its keys, every process holds its own copy
+        private = sys.getsizeof(self._ranks) + sum(sys.getsizeof(password) for password in self._ranks)
+        return {'mapped': False, 'mapped_bytes': 0, 'private_bytes': private if self.loaded else 0}
+
+
+class DictionaryRegistry:
+    """Holds the configured providers and answers lookups across all of them"""
+
+    def __init__(self, config=None):
+        self._config = config
+        self._providers = None
+        self._lock = threading.Lock()
+
+    @property
+    def providers(self):
+        if self._providers is None:
+            self.configure()
+        return self._providers
+
+    def configure(self, config=None):
+        """Builds providers from a GENERATOR_PASSWORD_DICTIONARIES style list"""
+        if config is None:
+            config = self._config if self._config is not None else settings.GENERATOR_PASSWORD_DICTIONARIES
+        providers = []
+        for entry in config:
+            backend = import_string(entry['BACKEND'])
+            providers.append(backend(entry['NAME'], **entry.get('OPTIONS', {})))
+        with self._lock:
+            self._providers = providers
+
+    def load(self):
+        """Loads every provider, logging failures instead of raising.
+        Returns: True if every provider loaded"""
+        ok = True
+        for provider in self.providers:
+            try:
+                provider.load()
+                logger.info(f"Password dictionary '{provider.name}' loaded ({len(provider)} entries)")
+            except Exception as e:
+                ok = False
+                logger.error(f"Password dictionary '{provider.name}' failed to load: {type(e).__name__}: {e}")
+        return ok
+
+    def rank(self, password):
+        """Returns the best (lowest) frequency rank across all providers or None if not listed"""
+        best = None
+        for provider in self.providers:
+            rank = provider.rank(password)
+            if rank is not None and (best is None or rank < best):
+                best = rank
+        return best
+
+    def __contains__(self, password):
+        return self.rank(password) is not None
+
+    def status(self):
+        """Returns the load status and size of every provider"""
+        return [provider.status() for provider in self.providers]
+
+    @property
+    def ready(self):
+        return all(provider.loaded for provider in self.providers)
+
+
+# Registry configured from settings and loaded in GeneratorConfig.ready
+password_dictionaries = DictionaryRegistry()
+
+
+@receiver(setting_changed)
+def _reload_dictionaries(setting, **kwargs):
+    """Rebuilds the registry when GENERATOR_PASSWORD_DICTIONARIES is overridden"""
+    if setting == 'GENERATOR_PASSWORD_DICTIONARIES':
+        password_dictionaries.configure()
+        password_dictionaries.load()
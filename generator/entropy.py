@@ -0,0 +1,123 @@
+"""
+Bulk Entropy Engine: Buffered randomness for batch password generation.
+
+Drawing one character at a time with secrets.choice costs a separate os.urandom read per
+character. The engine instead reads one large os.urandom buffer and maps it onto a character
+pool with unbiased rejection sampling, so generating thousands of passwords only needs a
+handful of system calls.
+
+Features of the Bulk Entropy Engine:
+- Buffers os.urandom output and refills it in large blocks
+- Unbiased integers in [0, n) using rejection sampling (randbelow), or many at once
+  from one buffer read (randbelow_many)
+- Maps random bytes straight onto a character pool with bytes.translate, rejecting the
+  bytes that would bias the modulo (choices)
+- Discards the buffer after fork so child processes never reuse the parent's bytes
+
+References:
+- os.urandom: https://docs.python.org/3/library/os.html#os.urandom
+- Rejection sampling for unbiased ranges: https://www.pcg-random.org/posts/bounded-rands.html
+"""
+
+import os
+import threading
+from array import array
+from functools import lru_cache
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+# array type codes for unsigned integers of 1, 2 and 4 bytes
+_TYPECODES = {1: 'B', 2: 'H', 4: 'I'}
+
+
+@lru_cache(maxsize=64)
+def _translate_tables(alphabet):
+    """Builds the translate table and delete set that map bytes onto an alphabet.
+    Bytes at or above the largest multiple of len(alphabet) are deleted so every
+    character is equally likely."""
+    size = len(alphabet)
+    limit = 256 - (256 % size)
+    table = bytes(ord(alphabet[b % size]) if b < limit else 0 for b in range(256))
+    delete = bytes(range(limit, 256))
+    return table, delete, limit
+
+
+class BulkEntropy:
+    """Buffered source of cryptographically secure random bytes"""
+
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self._buffer = b''
+        self._position = 0
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def randbytes(self, n):
+        """Returns n random bytes from the buffer, refilling it from os.urandom as needed"""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked: never hand out bytes the parent process may also use
+                self._buffer, self._position, self._pid = b'', 0, os.getpid()
+
+            available = len(self._buffer) - self._position
+            if n > available:
+                self._buffer = self._buffer[self._position:] + os.urandom(max(self.buffer_size, n - available))
+                self._position = 0
+
+            start = self._position
+            self._position += n
+            return self._buffer[start:self._position]
+
+    def randbelow(self, n):
+        """Returns an unbiased random integer in the range [0, n)"""
+        if n <= 0:
+            raise ValueError("Upper bound must be positive")
+        if n == 1:
+            return 0
+        nbytes = ((n - 1).bit_length() + 7) // 8
+        span = 1 << (8 * nbytes)
+        limit = span - (span % n)
+        while True:
+            value = int.from_bytes(self.randbytes(nbytes), 'little')
+            if value < limit:
+                return value % n
+
+    def randbelow_many(self, n, k):
+        """Returns a list of k unbiased random integers in the range [0, n), n <= 2^32.
+        Samples are read as an array of fixed-width integers from one buffer read and the
+        values at or above the largest multiple of n are rejected."""
+        if not 0 < n <= 1 << 32:
+            raise ValueError("Upper bound must be between 1 and 2^32")
+        if n == 1:
+            return [0] * k
+        nbytes = ((n - 1).bit_length() + 7) // 8
+        if nbytes == 3:
+            nbytes = 4
+        span = 1 << (8 * nbytes)
+        limit = span - (span % n)
+        values = []
+        needed = k
+        while needed > 0:
+            samples = array(_TYPECODES[nbytes])
+            samples.frombytes(self.randbytes((needed * span // limit + 16) * nbytes))
+            values.extend([value % n for value in samples if value < limit][:needed])
+            needed = k - len(values)
+        return values
+
+    def choices(self, alphabet, k):
+        """Returns a string of k characters drawn uniformly from an ASCII alphabet"""
+        if not alphabet or len(alphabet) > 256:
+            raise ValueError("Alphabet must contain between 1 and 256 characters")
+        table, delete, limit = _translate_tables(alphabet)
+        chunks = []
+        needed = k
+        while needed > 0:
+            # Request enough bytes to cover the expected rejections in one pass
+            raw = self.randbytes(needed * 256 // limit + 16)
+            mapped = raw.translate(table, delete)[:needed]
+            chunks.append(mapped)
+            needed -= len(mapped)
+        return b''.join(chunks).decode('ascii')
+
+
+# Process-wide engine used by generator.utils
+ENTROPY = BulkEntropy()
@@ -0,0 +1,479 @@
+"""
+Password Guess Estimator: zxcvbn-style pattern matching to estimate how many guesses an
+attacker needs for a password.
+
+Character classes and length alone rate passwords like "Password2024!!!!" highly. The
+estimator finds the predictable parts of a password with linear-time scanners, then picks
+the cheapest way for an attacker to cover the whole password with those patterns plus
+brute force for the characters in between.
+
+Matchers (each is a single left-to-right scan):
+- dictionary: Aho-Corasick automaton over the most common passwords of the NCSC list,
+  matched case-insensitively, guesses = frequency rank x uppercase variations
+- sequence: runs like "abcd", "4321" or "ACEG" with a constant step
+- repeat: runs of one character ("!!!!") and repeated short blocks ("abab", "123123")
+- spatial: keyboard walks on QWERTY, AZERTY and keypad layouts ("1qaz2wsx", "azerty",
+  "7896321"), see keyboard.py
+- date: years (1900-2049) and day/month/year dates with or without separators
+
+Passwords longer than MAX_SCORED_LENGTH are scored on their first MAX_SCORED_LENGTH
+characters only, the rest earns no credit (the strength endpoints reject longer passwords).
+
+The automaton is compiled offline into a flat table file (misc/build_automaton.py) that is
+memory-mapped on first use, so every worker process shares one copy of the tables. The
+dictionary scan can resume from the automaton state after an unchanged prefix (see
+scan_dictionary), which live scoring uses to rescore only the edited tail (see live.py).
+
+References:
+- zxcvbn: Low-Budget Password Strength Estimation (Wheeler, USENIX Security 2016):
+  https://www.usenix.org/conference/usenixsecurity16/technical-sessions/presentation/wheeler
+- Aho-Corasick algorithm: https://en.wikipedia.org/wiki/Aho%E2%80%93Corasick_algorithm
+"""
+
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+
+from generator.charclasses import character_counts, pool_cardinality
+from generator.keyboard import keyboard_walks
+
+logger = logging.getLogger(__name__)
+
+DICTIONARY_PATH = Path(__file__).resolve().parent / 'misc' / '100k-most-used-passwords-NCSC.txt'
+# Number of most common passwords compiled into the automaton
+DICTIONARY_SIZE = 30000
+MIN_WORD_LENGTH = 3
+
+# Lower bound on the guesses of any multi-character match (zxcvbn MIN_SUBMATCH_GUESSES)
+MIN_MATCH_GUESSES = 50
+REFERENCE_YEAR = 2025
+MIN_YEAR_SPACE = 20
+
+_MIN_MATCH_BITS = math.log2(MIN_MATCH_GUESSES)
+
+AUTOMATON_MAGIC = b'SPMAHOCO'
+AUTOMATON_VERSION = 1
+# magic, version, min word length, state count, edge count, dictionary size, padding
+AUTOMATON_HEADER = struct.Struct('<8sHHIII8x')
+AUTOMATON_PATH = Path(__file__).resolve().parent / 'misc' / 'common_passwords.aho'
+# Resolved (state, character) transitions memoised per process
+TRANSITION_CACHE_SIZE = 16384
+# Characters scored by pattern matching, the rest of a longer password adds nothing
+MAX_SCORED_LENGTH = 128
+
+
+def _log2_guesses(guesses):
+    """log2 of the guesses for a match, never below MIN_MATCH_GUESSES"""
+    return math.log2(guesses) if guesses > MIN_MATCH_GUESSES else _MIN_MATCH_BITS
+
+
+def build_automaton(words):
+    """Compiles words ({word: rank}) into the flat automaton layout read by Automaton.
+
+    Layout after the header (little-endian), every section indexed by state:
+    - bits: log2(max(rank, MIN_MATCH_GUESSES)) as float64
+    - first_edge: (states + 1) x u32, edges of state s are first_edge[s]:first_edge[s + 1]
+    - edge_codes, edge_targets: edges x u32, code points sorted within each state
+    - rank, fail, output: u32 (output links to the next state on the failure chain with a word)
+    - length: u8 word length
+    Returns: bytes of the automaton file"""
+    children = [{}]
+    rank = [0]
+    length = [0]
+    for word, word_rank in words.items():
+        state = 0
+        for ch in word:
+            next_state = children[state].get(ord(ch))
+            if next_state is None:
+                next_state = len(rank)
+                children[state][ord(ch)] = next_state
+                children.append({})
+                rank.append(0)
+                length.append(0)
+            state = next_state
+        rank[state] = word_rank
+        length[state] = len(word)
+
+    # Breadth-first pass to compute failure links and links to the next state with a word
+    size = len(rank)
+    fail = array('I', bytes(4 * size))
+    output = array('I', bytes(4 * size))
+    queue = deque(children[0].values())
+    while queue:
+        state = queue.popleft()
+        for code, child in children[state].items():
+            fallback = fail[state]
+            while fallback and code not in children[fallback]:
+                fallback = fail[fallback]
+            target = children[fallback].get(code, 0)
+            fail[child] = target if target != child else 0
+            target = fail[child]
+            output[child] = target if rank[target] else output[target]
+            queue.append(child)
+
+    first_edge, codes, targets = array('I', [0]), array('I'), array('I')
+    for edges in children:
+        for code in sorted(edges):
+            codes.append(code)
+            targets.append(edges[code])
+        first_edge.append(len(codes))
+
+    sections = [
+        array('d', (_log2_guesses(r) for r in rank)), first_edge, codes, targets,
+        array('I', rank), fail, output, array('B', length),
+    ]
+    if sys.byteorder != 'little':
+        for section in sections:
+            section.byteswap()
+    header = AUTOMATON_HEADER.pack(AUTOMATON_MAGIC, AUTOMATON_VERSION, MIN_WORD_LENGTH, size, len(codes), DICTIONARY_SIZE)
+    return header + b''.join(section.tobytes() for section in sections)
+
+
+def write_automaton(path, words):
+    """Writes the compiled automaton for words to path (atomically replaced)
+    Returns: Number of states"""
+    data = build_automaton(words)
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+    return AUTOMATON_HEADER.unpack_from(data, 0)[3]
+
+
+class Automaton:
+    """Aho-Corasick automaton over flat integer tables in one buffer.
+    The buffer is a read-only memory map of the automaton file, shared by every worker
+    process through the OS page cache, or private bytes when the file is missing.
+    Transitions resolved through the failure links are memoised (up to TRANSITION_CACHE_SIZE),
+    so common characters skip the edge search."""
+
+    def __init__(self, buffer, mapped=False):
+        magic, version, _, size, edges, _ = AUTOMATON_HEADER.unpack_from(buffer, 0)
+        if magic != AUTOMATON_MAGIC or version != AUTOMATON_VERSION:
+            raise ValueError("Automaton file is invalid")
+        expected = AUTOMATON_HEADER.size + size * 8 + (size + 1) * 4 + edges * 8 + size * 12 + size
+        if len(buffer) != expected:
+            raise ValueError("Automaton file is truncated")
+
+        self._buffer = buffer
+        self.mapped = mapped
+        self.size = size
+        view = memoryview(buffer)
+        offset = AUTOMATON_HEADER.size
+        tables = []
+        for typecode, count in (('d', size), ('I', size + 1), ('I', edges), ('I', edges),
+                                ('I', size), ('I', size), ('I', size), ('B', size)):
+            width = array(typecode).itemsize
+            section = view[offset:offset + count * width]
+            if sys.byteorder == 'little':
+                section = section.cast(typecode)
+            else:
+                # Big-endian hosts fall back to private, byte-swapped copies
+                section = array(typecode, section)
+                section.byteswap()
+                self.mapped = False
+            tables.append(section)
+            offset += count * width
+        self.bits, self.first_edge, self.codes, self.targets, self.rank, self.fail, self.output, self.length = tables
+        self._transitions = {}
+
+    def matches(self, text):
+        """Returns (end, start, state) for every dictionary word in text (end is inclusive)"""
+        return self.scan(text)[0]
+
+    def _step(self, state, code):
+        """Returns: State after reading code in state, following failure links"""
+        first_edge, codes = self.first_edge, self.codes
+        while True:
+            low, high = first_edge[state], first_edge[state + 1]
+            i = bisect_left(codes, code, low, high)
+            if i < high and codes[i] == code:
+                return self.targets[i]
+            if state == 0:
+                return 0
+            state = self.fail[state]
+
+    def scan(self, text, start=0, state=0):
+        """Scans text[start:] from an automaton state (the state after text[start - 1]).
+        Returns: (end, start, state) for every dictionary word ending at start or later,
+        and the automaton state after every scanned character"""
+        rank, length, output = self.rank, self.length, self.output
+        transitions = self._transitions
+        found_words = []
+        states = []
+        for end in range(start, len(text)):
+            key = (state, text[end])
+            step = transitions.get(key)
+            if step is None:
+                state = self._step(state, ord(text[end]))
+                # (next state, first state on its output chain that ends a word)
+                step = (state, state if rank[state] else output[state])
+                if len(transitions) < TRANSITION_CACHE_SIZE:
+                    transitions[key] = step
+            state, found = step
+            states.append(state)
+            while found:
+                found_words.append((end, end - length[found] + 1, found))
+                found = output[found]
+        return found_words, states
+
+    def memory_status(self):
+        """Returns whether the tables are memory-mapped and the mapped and private byte counts"""
+        size = len(self._buffer)
+        return {
+            'mapped': self.mapped,
+            'mapped_bytes': size if self.mapped else 0,
+            'private_bytes': 0 if self.mapped else size,
+        }
+
+
+_automaton = None
+_automaton_lock = threading.Lock()
+
+
+def _load_words():
+    """Reads the most common passwords (lowercased, best rank kept)"""
+    words = {}
+    with open(DICTIONARY_PATH, 'r', encoding='utf-8') as f:
+        for rank, line in enumerate(f, start=1):
+            if rank > DICTIONARY_SIZE:
+                break
+            word = line.rstrip('\r\n').lower()
+            if len(word) >= MIN_WORD_LENGTH:
+                words.setdefault(word, rank)
+    return words
+
+
+def get_automaton():
+    """Returns the process-wide dictionary automaton.
+    Maps the prebuilt automaton file (misc/build_automaton.py) so every worker shares one copy,
+    or compiles a private copy if the file is missing."""
+    global _automaton
+    if _automaton is None:
+        with _automaton_lock:
+            if _automaton is None:
+                try:
+                    with open(AUTOMATON_PATH, 'rb') as f:
+                        _automaton = Automaton(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), mapped=True)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Automaton file unavailable ({e}), compiling a private copy")
+                    _automaton = Automaton(build_automaton(_load_words()))
+    return _automaton
+
+
+@lru_cache(maxsize=1024)
+def _uppercase_variations(token):
+    """Number of capitalisation variants an attacker tries for a dictionary token"""
+    upper = sum(map(str.isupper, token))
+    lower = sum(map(str.islower, token))
+    # All caps, first letter capitalised and last letter capitalised are the common cases
+    if lower == 0 or upper == 1 and (token[0].isupper() or token[-1].isupper()):
+        return 2
+    return sum(math.comb(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+
+def scan_dictionary(password, start=0, state=0):
+    """Matches dictionary words in password[start:], resuming the automaton from state.
+    Matches ending before start only depend on password[:start], so callers scoring a password
+    edited after start keep those and resume from the state after password[start - 1].
+    Returns: Dictionary matches ending at start or later, automaton state after every character"""
+    automaton = get_automaton()
+    lowered = password.lower()
+    found, states = automaton.scan(lowered, start, state)
+    matches = []
+    for end, first, word in found:
+        bits = automaton.bits[word]
+        # Most tokens are already lowercase, which needs no variation count
+        if password[first:end + 1] != lowered[first:end + 1]:
+            bits = _log2_guesses(automaton.rank[word] * _uppercase_variations(password[first:end + 1]))
+        matches.append((end, first, bits, 'dictionary'))
+    return matches, states
+
+
+def _dictionary_matches(password):
+    return scan_dictionary(password)[0]
+
+
+def _sequence_matches(password):
+    """Runs of 3+ characters with a constant step of 1 or 2 code points"""
+    matches = []
+    n = len(password)
+    start = 0
+    while start < n - 2:
+        delta = ord(password[start + 1]) - ord(password[start])
+        end = start + 1
+        if abs(delta) in (1, 2):
+            while end + 1 < n and ord(password[end + 1]) - ord(password[end]) == delta:
+                end += 1
+        if end - start >= 2:
+            first = password[start]
+            if first in 'aAzZ019':
+                base = 4
+            elif first.isdigit():
+                base = 10
+            else:
+                base = 26
+            guesses = base * (end - start + 1) * (1 if delta > 0 else 2)
+            matches.append((end, start, _log2_guesses(guesses), 'sequence'))
+            start = end
+        else:
+            start += 1
+    return matches
+
+
+_REPEAT_CHAR_RE = re.compile(r'(.)\1{2,}', re.DOTALL)
+_REPEAT_BLOCK_RE = re.compile(r'(.{2,4}?)\1+', re.DOTALL)
+
+
+def _repeat_matches(password):
+    """Runs of 3+ of one character and repeated blocks of 2 to 4 characters"""
+    matches = []
+    for regex in (_REPEAT_CHAR_RE, _REPEAT_BLOCK_RE):
+        for match in regex.finditer(password):
+            block = match.group(1)
+            repeats = (match.end() - match.start()) // len(block)
+            guesses = bruteforce_cardinality(block) ** len(block) * repeats
+            matches.append((match.end() - 1, match.start(), _log2_guesses(guesses), 'repeat'))
+    return matches
+
+
+@lru_cache(maxsize=1024)
+def _spatial_guesses(length, turns, shifted, plain, layout):
+    """zxcvbn keyboard walk guesses for a walk length, number of turns and shifted keys"""
+    guesses = 0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += math.comb(i - 1, j - 1) * layout.starting_positions * layout.degree ** j
+    if shifted:
+        if plain == 0:
+            guesses *= 2
+        else:
+            guesses *= sum(math.comb(shifted + plain, i) for i in range(1, min(shifted, plain) + 1))
+    return guesses
+
+
+def _spatial_matches(password):
+    """Keyboard walks of 3+ adjacent keys on the QWERTY, AZERTY and keypad layouts"""
+    matches = []
+    for end, start, turns, layout in keyboard_walks(password):
+        token = password[start:end + 1]
+        shifted = sum(1 for c in token if c in layout.shifted)
+        guesses = _spatial_guesses(len(token), turns, shifted, len(token) - shifted, layout)
+        matches.append((end, start, _log2_guesses(guesses), 'spatial', layout.name))
+    return matches
+
+
+_YEAR_RE = re.compile(r'(?<!\d)(19\d\d|20[0-4]\d)(?!\d)')
+_DATE_RE = re.compile(
+    r'(?<!\d)(?:'
+    r'(?P<d1>\d{1,2})(?P<s1>[-/._ ]?)(?P<m1>\d{1,2})(?P=s1)(?P<y1>\d{2}|\d{4})'
+    r'|(?P<y2>\d{4})(?P<s2>[-/._ ]?)(?P<m2>\d{1,2})(?P=s2)(?P<d2>\d{1,2})'
+    r')(?!\d)'
+)
+
+
+def _date_matches(password):
+    """Years and day/month/year (or year/month/day) dates"""
+    matches = []
+    for match in _YEAR_RE.finditer(password):
+        year_space = max(abs(int(match.group(1)) - REFERENCE_YEAR), MIN_YEAR_SPACE)
+        matches.append((match.end() - 1, match.start(), _log2_guesses(year_space), 'date'))
+    for match in _DATE_RE.finditer(password):
+        if match.group('y1'):
+            day, month, year = match.group('d1'), match.group('m1'), match.group('y1')
+            separator = match.group('s1')
+        else:
+            day, month, year = match.group('d2'), match.group('m2'), match.group('y2')
+            separator = match.group('s2')
+        day, month, year = int(day), int(month), int(year)
+        if month > 12 and day <= 12:
+            day, month = month, day
+        if not (1 <= day <= 31 and 1 <= month <= 12):
+            continue
+        if year < 100:
+            year += 1900 if year > 50 else 2000
+        if not 1900 <= year <= 2049:
+            continue
+        guesses = max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE) * 365 * (4 if separator else 1)
+        matches.append((match.end() - 1, match.start(), _log2_guesses(guesses), 'date'))
+    return matches
+
+
+# Matchers that rescan the whole password, the dictionary matcher can resume (see scan_dictionary)
+PATTERN_MATCHERS = [_sequence_matches, _repeat_matches, _spatial_matches, _date_matches]
+MATCHERS = [_dictionary_matches] + PATTERN_MATCHERS
+
+
+def bruteforce_cardinality(text):
+    """Size of the character pool covering the character classes used in text (see charclasses.py)"""
+    return pool_cardinality(character_counts(text))
+
+
+def estimate_guesses(password, dictionary_matches=None):
+    """Estimates the number of guesses needed to crack a password.
+    Finds the cheapest cover of the password by pattern matches and brute-forced characters
+    with a single dynamic programming pass over match end positions.
+    Only the first MAX_SCORED_LENGTH characters are scored, later characters add nothing, which
+    bounds the work for arbitrarily long input without letting padding inflate the estimate.
+    dictionary_matches, if given, are the scan_dictionary matches of the whole password.
+    Returns: Dictionary with guesses, guesses_log10, entropy_bits and the chosen patterns"""
+    if not password:
+        return {'guesses': 1, 'guesses_log10': 0.0, 'entropy_bits': 0.0, 'patterns': []}
+    char_bits = math.log2(bruteforce_cardinality(password))
+    password = password[:MAX_SCORED_LENGTH]
+    n = len(password)
+
+    # Every matcher returns (end, start, log2 guesses, pattern), spatial matches add the layout;
+    # sorting groups them by end
+    if dictionary_matches is None:
+        matches = _dictionary_matches(password)
+    else:
+        matches = [match for match in dictionary_matches if match[0] < n]
+    for matcher in PATTERN_MATCHERS:
+        matches.extend(matcher(password))
+    matches.sort()
+
+    # best[i] = cheapest log2 guesses for the first i characters
+    best = [0.0] * (n + 1)
+    choice = [None] * (n + 1)
+    index, total = 0, len(matches)
+    for end in range(n):
+        cost, picked = best[end] + char_bits, (end, None)
+        while index < total and matches[index][0] == end:
+            match = matches[index]
+            index += 1
+            start, bits = match[1], match[2]
+            if best[start] + bits < cost:
+                cost, picked = best[start] + bits, (start, match)
+        best[end + 1] = cost
+        choice[end + 1] = picked
+
+    patterns = []
+    position = n
+    while position > 0:
+        start, match = choice[position]
+        if match is not None:
+            pattern = {'pattern': match[3], 'token': password[start:position], 'i': start, 'j': position - 1}
+            if match[3] == 'spatial':
+                pattern['layout'] = match[4]
+            patterns.append(pattern)
+        position = start
+    patterns.reverse()
+
+    entropy_bits = best[n]
+    return {
+        'guesses': int(2 ** min(entropy_bits, 1023)),
+        'guesses_log10': round(entropy_bits * math.log10(2), 2),
+        'entropy_bits': round(entropy_bits, 2),
+        'patterns': patterns,
+    }
@@ -0,0 +1,120 @@
+"""
+Fuzzy Common Password Matching: Leetspeak-normalized, edit distance 1 lookups against the
+common passwords list.
+
+Exact lookups miss trivial variants like "p@ssw0rd" or "password1!". Passwords are first
+normalized with a precomputed leet substitution table, then compared SymSpell-style: every
+common password and every single-character deletion of it is stored in a hashed index built
+offline (see misc/build_fuzzy_index.py), so a lookup is a handful of hash lookups instead
+of a scan over the list.
+
+For a normalized input x and a common password w, a match is any of:
+- x == w                    (leetspeak variant)
+- x minus one char == w     (one character inserted, e.g. "password1!")
+- x == w minus one char     (one character deleted)
+- x minus one char == w minus one char (one character substituted)
+
+Index keys (in the common password index format, see password_index.py):
+- "=" + normalized common password -> rank
+- "-" + deletion of a normalized common password -> best rank of the passwords it came from
+
+Features of Fuzzy Common Password Matching:
+- close_variant_rank returns the rank of the closest common password or None
+- Only the FUZZY_DICTIONARY_SIZE most common passwords of MIN_FUZZY_LENGTH+ characters are
+  indexed, short inputs are left to the exact lookup
+
+References:
+- SymSpell symmetric delete algorithm: https://github.com/wolfgarbe/SymSpell
+- Leet: https://en.wikipedia.org/wiki/Leet
+"""
+
+from pathlib import Path
+
+from generator.password_index import PasswordIndex
+
+FUZZY_INDEX_PATH = Path(__file__).resolve().parent / 'misc' / 'fuzzy_passwords.idx'
+# Number of most common passwords indexed with their deletions
+FUZZY_DICTIONARY_SIZE = 20000
+MIN_FUZZY_LENGTH = 6
+MAX_FUZZY_LENGTH = 32
+
+# Leet substitutions applied after lowercasing (ambiguous digits map to their most common letter)
+LEET_TABLE = str.maketrans({
+    '@': 'a', '4': 'a',
+    '8': 'b',
+    '(': 'c',
+    '3': 'e',
+    '6': 'g', '9': 'g',
+    '1': 'i', '!': 'i', '|': 'i',
+    '0': 'o',
+    '$': 's', '5': 's',
+    '7': 't', '+': 't',
+    '2': 'z',
+})
+
+
+def normalize(password):
+    """Lowercases a password and replaces leet characters with letters"""
+    return password.lower().translate(LEET_TABLE)
+
+
+def deletions(word):
+    """Returns every distinct string made by deleting one character of word"""
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def fuzzy_keys(passwords):
+    """Yields (key, rank) pairs of the fuzzy index for passwords ordered from most to least common"""
+    for rank, password in enumerate(passwords, start=1):
+        if rank > FUZZY_DICTIONARY_SIZE:
+            break
+        if not MIN_FUZZY_LENGTH <= len(password) <= MAX_FUZZY_LENGTH:
+            continue
+        word = normalize(password)
+        yield '=' + word, rank
+        for deleted in deletions(word):
+            yield '-' + deleted, rank
+
+
+class FuzzyIndex:
+    """Close variant lookups over a fuzzy index file"""
+
+    def __init__(self, path=FUZZY_INDEX_PATH):
+        self.index = PasswordIndex(path)
+
+    def close_variant_rank(self, password):
+        """Returns the best rank of a common password within edit distance 1 of the
+        leetspeak-normalized password, or None if there is none"""
+        if not MIN_FUZZY_LENGTH <= len(password) <= MAX_FUZZY_LENGTH + 1:
+            return None
+        rank = self.index.rank
+        word = normalize(password)
+        candidates = [rank('=' + word), rank('-' + word)]
+        for deleted in deletions(word):
+            candidates.append(rank('=' + deleted))
+            candidates.append(rank('-' + deleted))
+        found = [candidate for candidate in candidates if candidate is not None]
+        return min(found) if found else None
+
+    def __len__(self):
+        return len(self.index)
+
+    def load(self):
+        """Maps the index file (the first lookup would otherwise map it)"""
+        self.index.rank('')
+
+    def memory_status(self):
+        """Returns whether the index is memory-mapped and the mapped and private byte counts"""
+        return self.index.memory_status()
+
+    def close(self):
+        self.index.close()
+
+
+# Shared fuzzy index over the most common NCSC passwords
+FUZZY_PASSWORDS = FuzzyIndex()
+
+
+def close_variant_rank(password):
+    """Returns the rank of the closest common password variant or None"""
+    return FUZZY_PASSWORDS.close_variant_rank(password)
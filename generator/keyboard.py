@@ -0,0 +1,184 @@
+"""
+Keyboard Walks: Single-pass detection of keyboard walks on QWERTY, AZERTY and numeric keypad
+layouts.
+
+"qwertyuiop", "1qaz2wsx" and "asdfgh" are in the common passwords list, but longer walks and
+variations ("1qaz2wsx3edc", "wxcvbn,;:!", "/*-+96321") are not. Every layout's adjacency
+graph is compiled once, and all layouts are then merged into flat integer arrays over one
+shared character alphabet:
+- a translate table mapping Latin-1 characters to alphabet indexes (the last index is "not on
+  any layout", characters above Latin-1 are clamped to it)
+- a pair table holding, for every (character, next character), a bit mask of the layouts on
+  which the two keys are adjacent
+- per layout, a pair table of the direction from one key to the next
+
+A password is translated once (str.translate), then scanned once. Most character pairs in a
+password are not adjacent on any layout, so the scan is one table lookup per character; the
+per-layout walk state is only touched while a walk is in progress.
+
+Layouts:
+- qwerty: US QWERTY, slanted rows (6 neighbours per key)
+- azerty: French AZERTY, slanted rows (6 neighbours per key)
+- keypad: numeric keypad, aligned grid (8 neighbours per key)
+
+Features of Keyboard Walks:
+- keyboard_walks returns every walk of MIN_WALK_LENGTH+ keys with its number of turns
+- Each layout reports its starting positions and average degree for zxcvbn walk guesses
+  (see estimator.py)
+
+References:
+- zxcvbn adjacency graphs: https://github.com/dropbox/zxcvbn/blob/master/data-scripts/build_keyboard_adjacency_graphs.py
+- AZERTY layout: https://en.wikipedia.org/wiki/AZERTY
+"""
+
+from array import array
+
+MIN_WALK_LENGTH = 3
+
+# Neighbours in order: left, upper-left, upper-right, right, lower-right, lower-left
+SLANTED_DIRECTIONS = ((-1, 0), (0, -1), (1, -1), (1, 0), (0, 1), (-1, 1))
+# Neighbours in order: left, upper-left, up, upper-right, right, lower-right, down, lower-left
+ALIGNED_DIRECTIONS = ((-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1))
+
+
+class KeyboardLayout:
+    """Adjacency graph of a keyboard layout.
+    rows are (plain keys, shifted keys, offset) with spaces for missing keys; slanted rows
+    are shifted half a key from the row above, aligned rows (keypads) are not."""
+
+    def __init__(self, name, rows, directions=SLANTED_DIRECTIONS):
+        self.name = name
+        positions = {}
+        key_at = {}
+        for y, (plain, shifted, offset) in enumerate(rows):
+            for x, characters in enumerate(zip(plain, shifted.ljust(len(plain))), start=offset):
+                for c in characters:
+                    if c == ' ':
+                        continue
+                    if c in positions:
+                        raise ValueError(f"Key {c!r} appears twice on the {name} layout")
+                    positions[c] = (x, y)
+                    key_at.setdefault((x, y), len(key_at))
+
+        self.keys = len(key_at)
+        self.shifted = frozenset(shifted for _, shifted, _ in rows for shifted in shifted if shifted != ' ')
+        # zxcvbn counts every character as a starting position
+        self.starting_positions = len(positions)
+        # Key index of every character and direction from key to adjacent key
+        self.key_of = {c: key_at[position] for c, position in positions.items()}
+        self.neighbours = {}
+        for (x, y), key in key_at.items():
+            for direction, (dx, dy) in enumerate(directions):
+                neighbour = key_at.get((x + dx, y + dy))
+                if neighbour is not None:
+                    self.neighbours[key, neighbour] = direction
+        self.degree = len(self.neighbours) / self.keys
+
+    def direction(self, a, b):
+        """Returns the direction from the key of character a to the key of character b, or None"""
+        if a not in self.key_of or b not in self.key_of:
+            return None
+        return self.neighbours.get((self.key_of[a], self.key_of[b]))
+
+    def __repr__(self):
+        return f'KeyboardLayout({self.name!r}, {self.keys} keys)'
+
+
+class WalkScanner:
+    """Keyboard walk scanner over layouts merged into flat integer tables"""
+
+    def __init__(self, layouts):
+        if len(layouts) > 8:
+            raise ValueError("At most 8 layouts can be scanned together")
+        self.layouts = tuple(layouts)
+        alphabet = sorted({c for layout in layouts for c in layout.key_of})
+        if any(ord(c) > 255 for c in alphabet) or len(alphabet) >= 255:
+            raise ValueError("Layout characters must be Latin-1")
+        size = self.size = len(alphabet) + 1
+        not_a_key = size - 1
+        self.table = {code: not_a_key for code in range(256)}
+        self.table.update((ord(c), index) for index, c in enumerate(alphabet))
+
+        self.pairs = array('B', bytes(size * size))
+        # Per layout: bit in the pair table, direction table, layout
+        lanes = []
+        for bit, layout in enumerate(layouts):
+            directions = array('b', [-1]) * (size * size)
+            for i, a in enumerate(alphabet):
+                for j, b in enumerate(alphabet):
+                    direction = layout.direction(a, b)
+                    if direction is not None:
+                        directions[i * size + j] = direction
+                        self.pairs[i * size + j] |= 1 << bit
+            lanes.append((1 << bit, directions, layout))
+        self.lanes = tuple(lanes)
+
+    def walks(self, password):
+        """Finds keyboard walks of MIN_WALK_LENGTH+ adjacent keys on every layout in one scan.
+        Returns: List of (end, start, turns, layout) with end inclusive"""
+        walks = []
+        n = len(password)
+        if n < MIN_WALK_LENGTH:
+            return walks
+        size, pairs = self.size, self.pairs
+        not_a_key = size - 1
+        keys = password.translate(self.table)
+        # Walk in progress per layout: start, turns, last direction (valid while its bit is active)
+        lanes = [(mask, directions, [0, 0, -1], layout) for mask, directions, layout in self.lanes]
+        active = 0
+        previous = min(ord(keys[0]), not_a_key) * size
+        end = 0
+        for c in keys[1:]:
+            end += 1
+            key = ord(c)
+            if key > not_a_key:
+                key = not_a_key
+            pair = previous + key
+            previous = key * size
+            adjacent = pairs[pair]
+            if adjacent or active:
+                for mask, directions, run, layout in lanes:
+                    if adjacent & mask:
+                        direction = directions[pair]
+                        if not active & mask:
+                            run[0], run[1], run[2] = end - 1, 1, direction
+                        elif direction != run[2]:
+                            run[1] += 1
+                            run[2] = direction
+                    elif active & mask and end - run[0] >= MIN_WALK_LENGTH:
+                        walks.append((end - 1, run[0], run[1], layout))
+                active = adjacent
+        for mask, _, run, layout in lanes:
+            if active & mask and n - run[0] >= MIN_WALK_LENGTH:
+                walks.append((n - 1, run[0], run[1], layout))
+        return walks
+
+
+QWERTY = KeyboardLayout('qwerty', [
+    ('`1234567890-=', '~!@#$%^&*()_+', 0),
+    ('qwertyuiop[]\\', 'QWERTYUIOP{}|', 1),
+    ("asdfghjkl;'", 'ASDFGHJKL:"', 1),
+    ('zxcvbnm,./', 'ZXCVBNM<>?', 1),
+])
+AZERTY = KeyboardLayout('azerty', [
+    ('²&é"\'(-è_çà)=', ' 1234567890°+', 0),
+    ('azertyuiop^$', 'AZERTYUIOP¨£', 1),
+    ('qsdfghjklmù*', 'QSDFGHJKLM%µ', 1),
+    ('<wxcvbn,;:!', '>WXCVBN?./§', 0),
+])
+KEYPAD = KeyboardLayout('keypad', [
+    (' /*-', '', 0),
+    ('789+', '', 0),
+    ('456', '', 0),
+    ('123', '', 0),
+    (' 0.', '', 0),
+], directions=ALIGNED_DIRECTIONS)
+
+LAYOUTS = (QWERTY, AZERTY, KEYPAD)
+_SCANNER = WalkScanner(LAYOUTS)
+
+
+def keyboard_walks(password):
+    """Finds keyboard walks on the QWERTY, AZERTY and keypad layouts
+    Returns: List of (end, start, turns, layout) with end inclusive"""
+    return _SCANNER.walks(password)
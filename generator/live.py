@@ -0,0 +1,162 @@
+"""
+Live Password Strength: Incremental strength scoring over a WebSocket while the user types.
+
+The strength calculator used to POST the whole password to /generator/api/check-strength/ on
+every keystroke, paying for CSRF, DRF parsing and a full rescan each time. Live scoring keeps
+one scorer per WebSocket connection and only rescans what changed: an edit leaves the longest
+common prefix of the old and new password untouched, so
+
+- character class counts are adjusted for the removed and added characters only
+- dictionary matches ending inside the prefix are kept, and the Aho-Corasick automaton resumes
+  from its state after the prefix (see estimator.scan_dictionary)
+
+Typing at the end of the password (the common case) therefore scans one character per
+keystroke. The cheap linear matchers (sequence, repeat, spatial, date), the cover and the
+common password, close variant and breach lookups still run on the whole password, so every
+result is identical to password_strength.
+
+Protocol (JSON text frames on ws[s]://<host>/generator/ws/strength/):
+- Client sends {"password": "...", "id": <optional, echoed back>} with the current value
+- Server replies with the password_strength result, or {"error": "message"}
+- Browser connections are only accepted from allowed CORS origins
+- Scoring runs in a worker thread, so a long password on one connection never blocks the
+  event loop serving the others
+
+References:
+- ASGI WebSocket specification: https://asgi.readthedocs.io/en/latest/specs/www.html#websocket
+- WebSocket protocol (RFC 6455): https://datatracker.ietf.org/doc/html/rfc6455
+"""
+
+import json
+import os
+from bisect import bisect_left
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from generator.charclasses import CHARACTER_CLASSES
+from generator.estimator import MAX_SCORED_LENGTH, estimate_guesses, scan_dictionary
+from generator.utils import _strength_result
+
+LIVE_STRENGTH_PATH = '/generator/ws/strength/'
+MAX_LIVE_PASSWORD_LENGTH = MAX_SCORED_LENGTH
+
+
+class LiveStrengthScorer:
+    """Strength scorer for one connection, reuses the work done for the previous password"""
+
+    def __init__(self):
+        self.password = ''
+        # Character class counts (uppercase, lowercase, numbers, special, other)
+        self.counts = [0] * len(CHARACTER_CLASSES.Counts._fields)
+        # Automaton state after every character and dictionary matches ordered by end
+        self.states = []
+        self.dictionary = []
+        # Characters reused from the previous password by the last update
+        self.reused = 0
+
+    def update(self, password):
+        """Rescores after the password changed to password.
+        Returns: Same result as password_strength (a message if password is empty)"""
+        previous = self.password
+        keep = len(os.path.commonprefix((previous, password)))
+        removed = CHARACTER_CLASSES.counts(previous[keep:])
+        added = CHARACTER_CLASSES.counts(password[keep:])
+        self.counts = [count - a + b for count, a, b in zip(self.counts, removed, added)]
+
+        # Matches ending inside the kept prefix did not change, rescan from the edit onwards
+        del self.dictionary[bisect_left(self.dictionary, (keep,)):]
+        del self.states[keep:]
+        matches, states = scan_dictionary(password, keep, self.states[-1] if keep else 0)
+        self.dictionary.extend(matches)
+        self.states.extend(states)
+        self.password = password
+        self.reused = keep
+
+        if not password:
+            return "No password provided."
+        return _strength_result(
+            password, CHARACTER_CLASSES.Counts._make(self.counts), estimate_guesses(password, self.dictionary),
+        )
+
+
+def origin_allowed(scope):
+    """Returns True if the WebSocket handshake comes from an allowed CORS origin.
+    Non-browser clients send no Origin header and are allowed."""
+    origin = dict(scope.get('headers', [])).get(b'origin')
+    if origin is None or getattr(settings, 'CORS_ALLOW_ALL_ORIGINS', False):
+        return True
+    origin = origin.decode('latin-1').rstrip('/')
+    if origin in getattr(settings, 'CORS_ALLOWED_ORIGINS', []):
+        return True
+    # Same-origin pages served by this deployment
+    host = urlsplit(origin).hostname
+    return host is not None and any(
+        host == allowed or allowed == '*' or allowed.startswith('.') and host.endswith(allowed)
+        for allowed in settings.ALLOWED_HOSTS
+    )
+
+
+def _reply(scorer, text):
+    """Scores one client message
+    Returns: Strength result or error message in dictionary format"""
+    try:
+        data = json.loads(text) if text is not None else None
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        return {'error': 'Message must be a JSON object.'}
+
+    password = data.get('password', '')
+    if not isinstance(password, str):
+        reply = {'error': 'Password must be a string.'}
+    elif len(password) > MAX_LIVE_PASSWORD_LENGTH:
+        reply = {'error': f'Password must be at most {MAX_LIVE_PASSWORD_LENGTH} characters.'}
+    else:
+        result = scorer.update(password)
+        reply = result if isinstance(result, dict) else {
+            'error': 'Password is required. Please provide a password to analyze.'
+        }
+    if 'id' in data:
+        reply = {'id': data['id'], **reply}
+    return reply
+
+
+# Messages of one connection are scored one at a time, so its scorer is never shared between threads
+_reply_in_thread = sync_to_async(_reply, thread_sensitive=False)
+
+
+async def strength_websocket(scope, receive, send):
+    """ASGI WebSocket application scoring every received password with one LiveStrengthScorer"""
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    if not origin_allowed(scope):
+        # Closing before accepting rejects the handshake with HTTP 403
+        await send({'type': 'websocket.close', 'code': 4003})
+        return
+    await send({'type': 'websocket.accept'})
+
+    scorer = LiveStrengthScorer()
+    while True:
+        message = await receive()
+        if message['type'] == 'websocket.disconnect':
+            return
+        if message['type'] == 'websocket.receive':
+            reply = await _reply_in_thread(scorer, message.get('text'))
+            await send({'type': 'websocket.send', 'text': json.dumps(reply)})
+
+
+def websocket_router(application):
+    """Wraps the Django ASGI application, serving LIVE_STRENGTH_PATH WebSockets and rejecting
+    every other WebSocket path (Django itself only handles HTTP scopes)"""
+    async def router(scope, receive, send):
+        if scope['type'] != 'websocket':
+            return await application(scope, receive, send)
+        if scope['path'] == LIVE_STRENGTH_PATH:
+            return await strength_websocket(scope, receive, send)
+        await receive()
+        await send({'type': 'websocket.close', 'code': 4004})
+
+    return router
@@ -0,0 +1,99 @@
+"""
+Runs the generator micro-benchmarks defined in generator/benchmarks.py.
+
+Usage:
+    python manage.py benchmark_generator
+    python manage.py benchmark_generator --only generation
+    python manage.py benchmark_generator --only utils --repeats 5 --save-baseline
+    python manage.py benchmark_generator --only utils --repeats 5 --compare --threshold 0.5
+
+Every metric is the median of --repeats runs. Comparisons are scaled by the reference
+workload time saved with the baseline (see generator/benchmarks.py).
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from generator.benchmarks import (
+    BASELINE_PATH, BENCHMARKS, DEFAULT_THRESHOLD, compare_to_baseline, load_baseline, load_references, metric_change,
+    reference_scale, run_benchmark, save_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = "Run password generator and strength calculator benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            choices=sorted(BENCHMARKS),
+            help="Run only the named benchmarks",
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help="Save the results as the baseline of the benchmarks that were run",
+        )
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help="Compare the results against the baseline and fail on regressions",
+        )
+        parser.add_argument(
+            '--baseline',
+            default=str(BASELINE_PATH),
+            help=f"Baseline JSON file (default: {BASELINE_PATH.name} in generator/misc)",
+        )
+        parser.add_argument(
+            '--repeats',
+            type=int,
+            default=1,
+            help="Runs of every benchmark, each metric is the median (default: 1)",
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help=f"Relative change counted as a regression (default: {DEFAULT_THRESHOLD})",
+        )
+
+    def handle(self, *args, **options):
+        names = options['only'] or list(BENCHMARKS)
+        baseline = load_baseline(options['baseline']) if options['compare'] else {}
+        if options['compare'] and not baseline:
+            raise CommandError(f"No baseline saved at {options['baseline']}")
+        if options['repeats'] < 1:
+            raise CommandError("--repeats must be at least 1")
+
+        saved_references = load_references(options['baseline']) if options['compare'] else {}
+
+        results = {}
+        references = {}
+        scales = {}
+        for name in names:
+            if name not in BENCHMARKS:
+                raise CommandError(f"Unknown benchmark: {name}")
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            results[name], references[name] = run_benchmark(name, options['repeats'])
+            scale = scales[name] = reference_scale(references[name], saved_references.get(name))
+            self.stdout.write(f"  {'reference workload':<55} {references[name]:>14,.2f} us (scale vs baseline {scale:.2f})")
+            saved = baseline.get(name, {})
+            for metric, value, unit in results[name]:
+                line = f"  {metric:<55} {value:>14,.2f} {unit}"
+                if metric in saved and saved[metric]['unit'] == unit:
+                    change = metric_change(value, saved[metric]['value'], unit, scale)
+                    if change is not None:
+                        line = f"{line:<85} {change:+.1%} vs baseline"
+                self.stdout.write(line)
+
+        if options['save_baseline']:
+            save_baseline(results, options['baseline'], references, options['repeats'])
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {options['baseline']}"))
+        if options['compare']:
+            regressions = compare_to_baseline(results, baseline, options['threshold'], scales)
+            for name, metric, saved_value, value, change in regressions:
+                self.stderr.write(
+                    f"{name}: {metric} regressed {change:.0%} ({saved_value:,.2f} -> {value:,.2f})"
+                )
+            if regressions:
+                raise CommandError(f"{len(regressions)} metric(s) regressed more than {options['threshold']:.0%}")
+            self.stdout.write(self.style.SUCCESS(f"No metric regressed more than {options['threshold']:.0%}"))
@@ -0,0 +1,49 @@
+"""
+Builds the Bloom filter that sits in front of the breach corpus in password_strength.
+
+The filter is sized from the number of hashes in the breach index and the target
+false-positive rate (default 0.1%, about 14.4 bits per hash).
+
+Usage:
+    python manage.py build_bloom_filter breach.idx breach.bloom --fp-rate 0.001
+Then point GENERATOR_BREACH_BLOOM_PATH at the output file.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from generator.bloom import write_bloom_filter
+from generator.breach import BreachCorpus
+
+
+class Command(BaseCommand):
+    help = "Build a Bloom filter over a breach index for a target false-positive rate"
+
+    def add_arguments(self, parser):
+        parser.add_argument('corpus', help="Breach index built with build_breach_index")
+        parser.add_argument('output', help="Path of the Bloom filter file to write")
+        parser.add_argument(
+            '--fp-rate',
+            type=float,
+            default=0.001,
+            help="Target false-positive rate (default 0.001)",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        corpus = BreachCorpus(options['corpus'])
+        try:
+            corpus.load()
+            bits, hashes = write_bloom_filter(
+                options['output'], corpus.iter_digests(), corpus.count, options['fp_rate']
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        finally:
+            corpus.close()
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {bits:,} bit filter with {hashes} hashes for {corpus.count:,} hashes "
+            f"to {options['output']} in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,41 @@
+"""
+Builds the memory-mapped breach corpus used by the k-anonymity range endpoint.
+
+The input is a pre-downloaded Pwned Passwords style file of "SHA1HASH:COUNT" lines
+ordered by hash (use "-" to read from stdin). The file is streamed, so memory use does
+not depend on the corpus size.
+
+Usage:
+    python manage.py build_breach_index pwned-passwords-sha1-ordered-by-hash.txt breach.idx
+Then point GENERATOR_BREACH_CORPUS_PATH at the output file.
+"""
+
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from generator.breach import write_breach_index
+
+
+class Command(BaseCommand):
+    help = "Build the prefix-bucketed breach corpus from a HASH:COUNT file ordered by hash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help="SHA-1 HASH:COUNT file ordered by hash, or - for stdin")
+        parser.add_argument('output', help="Path of the breach index file to write")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            if options['input'] == '-':
+                count = write_breach_index(options['output'], sys.stdin)
+            else:
+                with open(options['input'], 'r', encoding='ascii') as f:
+                    count = write_breach_index(options['output'], f)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {count:,} hashes to {options['output']} in {elapsed:.1f}s"
+        ))
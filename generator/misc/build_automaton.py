@@ -0,0 +1,13 @@
+"""
+Compiles the most common passwords of 100k-most-used-passwords-NCSC.txt into the
+memory-mapped Aho-Corasick automaton file used by the guess estimator.
+
+Run from the repository root:
+    python -m generator.misc.build_automaton
+"""
+
+from generator.estimator import AUTOMATON_PATH, _load_words, write_automaton
+
+# Write the flat automaton tables
+states = write_automaton(AUTOMATON_PATH, _load_words())
+print(f"Wrote {states} states to {AUTOMATON_PATH}")
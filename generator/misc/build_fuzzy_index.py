@@ -0,0 +1,20 @@
+"""
+Builds the fuzzy (leetspeak-normalized, single deletion) index from 100k-most-used-passwords-NCSC.txt.
+
+The txt file is ordered from most to least used, so the line number is the frequency rank.
+Run from the repository root:
+    python -m generator.misc.build_fuzzy_index
+"""
+
+from generator.fuzzy import FUZZY_INDEX_PATH, fuzzy_keys
+from generator.password_index import write_ranked_index
+
+txt = 'generator/misc/100k-most-used-passwords-NCSC.txt'
+
+# Read txt file
+with open(txt, 'r', encoding='utf-8') as f:
+    passwords = f.read().splitlines()
+
+# Write normalized passwords and their deletions to the binary index
+count = write_ranked_index(FUZZY_INDEX_PATH, fuzzy_keys(passwords))
+print(f"Wrote {count} keys to {FUZZY_INDEX_PATH}")
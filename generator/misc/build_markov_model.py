@@ -0,0 +1,19 @@
+"""
+Trains the pronounceable password Markov model (pronounceable.markov) on the passphrase
+wordlist (passphrase_words.txt), curated English words already filtered for blocked words
+(see build_passphrase_wordlist.py).
+
+Run from the repository root:
+    python -m generator.misc.build_markov_model
+"""
+
+from generator.passphrase import WORDLIST_PATH
+from generator.pronounceable import MODEL_PATH, MODEL_ORDER, write_model
+
+# Read the wordlist
+with open(WORDLIST_PATH, 'r', encoding='utf-8') as f:
+    words = [line.strip() for line in f if line.strip()]
+
+# Write the quantized cumulative tables
+contexts = write_model(MODEL_PATH, words, MODEL_ORDER)
+print(f"Wrote order {MODEL_ORDER} model with {contexts} contexts from {len(words)} words to {MODEL_PATH}")
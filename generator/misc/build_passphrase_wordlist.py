@@ -0,0 +1,70 @@
+"""
+Builds the passphrase wordlist (passphrase_words.txt) from a curated list of English words.
+
+The source is a list of ordinary English words, one per line, optionally prefixed with
+diceware dice numbers as in the EFF large wordlist ("11111<TAB>abacus"). It is never derived
+from a password corpus: password lists are ordered by how often people pick an entry, and
+those are exactly the tokens attackers try first. The build keeps words that are 3-9
+lowercase letters, not offensive or otherwise unsuitable (BLOCKED, PROFANE), and not among the
+COMMON_RANK most used passwords, then keeps the WORD_COUNT shortest (6^5, one diceware
+roll of five dice per word) in alphabetical order. Without a source argument the bundled
+list is re-checked in place.
+
+The bundled list was curated for this project from general English vocabulary. To build
+from the EFF large wordlist instead, download it from https://www.eff.org/dice and keep
+its CC BY 3.0 US license notice with passphrase_words.txt.
+Run from the repository root:
+    python -m generator.misc.build_passphrase_wordlist [source.txt]
+"""
+
+import re
+import sys
+
+from generator.passphrase import WORDLIST_PATH
+
+txt = 'generator/misc/100k-most-used-passwords-NCSC.txt'
+source = sys.argv[1] if len(sys.argv) > 1 else WORDLIST_PATH
+WORD_COUNT = 7776
+COMMON_RANK = 1000
+WORD_RE = re.compile(r'^(?:[1-6]{5}\s+)?([a-z]{3,9})$')
+# Whole words: profanity, sex, violence, weapons, crime, drugs, illness, death and religion
+BLOCKED = frozenset('''
+    abduct abuse addict alcohol ambush anglican archangel arsenal asylum attack bayonet bazooka
+    bikini bishop blasphemy blood bosom bribery buddhism bullet burial bust butcher cadaver
+    cannabis cannon cannonball carbine casket chaplain christen church churchyard cigar
+    claymore corset dagger deacon deity detonate diabetes dialysis diocese disgrace dowry dwarf
+    embezzle embolism enslave extortion extremist firearm flesh fleshy flogging funeral gallows
+    gambling garter gospel grapeshot gunwale halberd hijack hippie holiness hymn illness
+    impeach infection insomnia jockstrap knickers larceny laxative liturgy massager mating
+    mistress mortality mortician mortuary mutilate mutiny nicotine nirvana nosebleed nutcase
+    ogle outlaw overkill pagan pandemic passover passwords pelvis perjury pesticide pious
+    pistol poison polio pregnant procreate profane puberty puritan pyromania racism rifle
+    rifling sabbath salvation savior sciatica scoundrel scurvy seducing sermon showgirl
+    sickness sinister swindler sword syndrome syringe tabasco tomahawk topless trinity tyrant
+    umbilical underwear undress unholy upchuck uranium vaseline vice villain warfare warhead
+    warmonger weaponry weed wiltshire wine wiretap worshiper wrongdoer yiddish
+'''.split())
+# Substrings that are never part of a suitable word
+PROFANE = ('fuck', 'shit', 'cunt', 'bitch', 'whore', 'slut', 'nigg', 'asshole', 'porn')
+
+# Read txt files
+with open(txt, 'r', encoding='utf-8') as f:
+    common = set(f.read().splitlines()[:COMMON_RANK])
+with open(source, 'r', encoding='utf-8') as f:
+    lines = [line.strip().lower() for line in f if line.strip()]
+
+words = set()
+for line in lines:
+    match = WORD_RE.match(line)
+    if not match or match.group(1) in BLOCKED or match.group(1) in common:
+        continue
+    if any(profane in match.group(1) for profane in PROFANE):
+        continue
+    words.add(match.group(1))
+if len(words) < WORD_COUNT:
+    sys.exit(f"{source} has only {len(words)} usable words, {WORD_COUNT} are needed")
+
+words = sorted(sorted(words, key=lambda word: (len(word), word))[:WORD_COUNT])
+with open(WORDLIST_PATH, 'w', encoding='utf-8') as f:
+    f.write('\n'.join(words) + '\n')
+print(f"Wrote {len(words)} words to {WORDLIST_PATH}")
@@ -0,0 +1,19 @@
+"""
+Converts the 100k-most-used-passwords-NCSC.txt file into the binary common password index.
+
+The txt file is ordered from most to least used, so the line number is the frequency rank.
+Run from the repository root:
+    python -m generator.misc.build_password_index
+"""
+
+from generator.password_index import DEFAULT_INDEX_PATH, write_index
+
+txt = 'generator/misc/100k-most-used-passwords-NCSC.txt'
+
+# Read txt file
+with open(txt, 'r', encoding='utf-8') as f:
+    passwords = f.read().splitlines()
+
+# Write sorted hashes and ranks to the binary index
+count = write_index(DEFAULT_INDEX_PATH, passwords)
+print(f"Wrote {count} passwords to {DEFAULT_INDEX_PATH}")
@@ -0,0 +1,108 @@
+"""
+Passphrase Generator: Diceware-style passphrases drawn from a packed wordlist.
+
+The wordlist (misc/passphrase_words.txt, curated English words checked by
+misc/build_passphrase_wordlist.py, never tokens from a password corpus) is loaded
+once per process into one packed string (and a capitalized copy) plus an array of word offsets
+instead of a list of str objects, so it costs about two bytes per letter and 4 bytes per word.
+Word indices for a whole batch come from one bulk entropy read (see entropy.py).
+
+Features of Passphrase Generator:
+- Word count, separator, capitalization and an optional digit appended to a random word
+- Entropy of a passphrase is words x log2(wordlist size), plus log2(10 x words) with a digit
+- Generates batches of passphrases from one entropy buffer with generate_passphrases
+
+References:
+- Diceware: https://theworld.com/~reinhold/diceware.html
+- EFF Dice-Generated Passphrases: https://www.eff.org/dice
+"""
+
+import math
+import threading
+from array import array
+from pathlib import Path
+
+from generator.entropy import ENTROPY
+
+WORDLIST_PATH = Path(__file__).resolve().parent / 'misc' / 'passphrase_words.txt'
+DEFAULT_WORDS = 6
+DEFAULT_SEPARATOR = '-'
+
+
+class PackedWordlist:
+    """Read-only wordlist stored as one string and an array of word start offsets"""
+
+    def __init__(self, words):
+        self.data = ''.join(words)
+        # Same words with the first letter capitalized, so capitalization is a slice too
+        self.capitalized = ''.join(word.capitalize() for word in words)
+        self.offsets = array('I', [0])
+        for word in words:
+            self.offsets.append(self.offsets[-1] + len(word))
+
+    @classmethod
+    def from_file(cls, path):
+        """Loads a newline separated wordlist, skipping blank lines"""
+        with open(path, 'r', encoding='utf-8') as f:
+            words = [line.strip() for line in f if line.strip()]
+        if not words:
+            raise ValueError(f"Passphrase wordlist is empty: {path}")
+        return cls(words)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.data[self.offsets[i]:self.offsets[i + 1]]
+
+
+_wordlist = None
+_wordlist_lock = threading.Lock()
+
+
+def get_wordlist():
+    """Returns the process-wide packed wordlist, loading it on first use"""
+    global _wordlist
+    if _wordlist is None:
+        with _wordlist_lock:
+            if _wordlist is None:
+                _wordlist = PackedWordlist.from_file(WORDLIST_PATH)
+    return _wordlist
+
+
+def passphrase_entropy(words=DEFAULT_WORDS, include_number=False):
+    """Returns the entropy in bits of a passphrase with the given options"""
+    bits = words * math.log2(len(get_wordlist()))
+    if include_number:
+        bits += math.log2(10 * words)
+    return bits
+
+
+def generate_passphrases(count=1, words=DEFAULT_WORDS, separator=DEFAULT_SEPARATOR, capitalize=False,
+                         include_number=False):
+    """Generate a batch of diceware-style passphrases.
+    All word indices for the batch are drawn from one bulk entropy read.
+    Returns: List of passphrases (empty if count or words is below 1)"""
+    if count < 1 or words < 1:
+        return []
+
+    wordlist = get_wordlist()
+    data = wordlist.capitalized if capitalize else wordlist.data
+    offsets = wordlist.offsets
+    indices = ENTROPY.randbelow_many(len(wordlist), count * words)
+    if include_number:
+        digits = ENTROPY.choices('0123456789', count)
+        positions = ENTROPY.randbelow_many(words, count)
+
+    chosen = [data[offsets[j]:offsets[j + 1]] for j in indices]
+    if include_number:
+        for i in range(count):
+            chosen[i * words + positions[i]] += digits[i]
+    passphrases = [separator.join(chosen[start:start + words]) for start in range(0, count * words, words)]
+
+    return passphrases
+
+
+def generate_passphrase(words=DEFAULT_WORDS, separator=DEFAULT_SEPARATOR, capitalize=False, include_number=False):
+    """Generate a single diceware-style passphrase"""
+    return generate_passphrases(1, words, separator, capitalize, include_number)[0]
@@ -0,0 +1,174 @@
+"""
+Common Password Index: Memory-mapped lookups against the common passwords list.
+
+The 100k most used passwords list is compiled offline (see misc/build_password_index.py)
+into a compact binary file of fixed-width password hashes sorted in ascending order,
+followed by the frequency rank of each password. The file is memory-mapped on first use
+so nothing is parsed at import time and the pages are shared by every worker process
+through the OS page cache.
+
+File layout (little-endian):
+- Header (32 bytes): magic, format version, hash width, record count, padding
+- Hashes: count x 8-byte unsigned integers, sorted ascending
+- Ranks: count x 4-byte unsigned integers, rank[i] belongs to hash[i] (1 = most common)
+
+Features of the Common Password Index:
+- Membership checks with `password in index`
+- Frequency rank lookups with `index.rank(password)`
+- Binary search runs over a memoryview of the mapped file (bisect in C, no copies)
+- memory_status reports the bytes mapped (shared between processes) versus private
+
+References:
+- mmap Module: https://docs.python.org/3/library/mmap.html
+- bisect Module: https://docs.python.org/3/library/bisect.html
+- BLAKE2 hashing: https://docs.python.org/3/library/hashlib.html#blake2
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+INDEX_MAGIC = b'SPMPWIDX'
+INDEX_VERSION = 1
+HASH_SIZE = 8
+RANK_SIZE = 4
+# magic, version, hash size, record count, padding (keeps the hash array 8-byte aligned)
+HEADER = struct.Struct('<8sHHI16x')
+
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parent / 'misc' / 'common_passwords.idx'
+
+
+def password_hash(password):
+    """Returns the fixed-width 64-bit hash used as the index key for a password"""
+    if isinstance(password, str):
+        password = password.encode('utf-8')
+    digest = hashlib.blake2b(password, digest_size=HASH_SIZE, person=b'spm-pwidx').digest()
+    return int.from_bytes(digest, 'little')
+
+
+def write_index(path, passwords):
+    """Writes a binary index for passwords ordered from most to least common.
+    Rank is the 1-based position of the first occurrence of each password.
+    Returns: Number of records written"""
+    return write_ranked_index(path, ((password, position) for position, password in enumerate(passwords, start=1)))
+
+
+def write_ranked_index(path, ranked):
+    """Writes a binary index for (key, rank) pairs, keeping the best (lowest) rank per key.
+    Returns: Number of records written"""
+    ranks = {}
+    for key, rank in ranked:
+        key = password_hash(key)
+        if rank < ranks.get(key, rank + 1):
+            ranks[key] = rank
+
+    hashes = array('Q', sorted(ranks))
+    rank_values = array('I', (ranks[h] for h in hashes))
+    if sys.byteorder != 'little':
+        hashes.byteswap()
+        rank_values.byteswap()
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, HASH_SIZE, len(hashes)))
+        hashes.tofile(f)
+        rank_values.tofile(f)
+
+    return len(hashes)
+
+
+class PasswordIndex:
+    """Read-only view over a binary common password index.
+    The file is opened and mapped lazily on the first lookup."""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._mmap = None
+        self._hashes = None
+        self._ranks = None
+        self._count = 0
+
+    def _load(self):
+        """Maps the index file and validates its header"""
+        with self._lock:
+            if self._mmap is not None:
+                return
+            if not os.path.exists(self.path):
+                raise FileNotFoundError(f"Common passwords file not found at: {self.path}")
+
+            with open(self.path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            if len(mm) < HEADER.size:
+                mm.close()
+                raise ValueError(f"Common passwords index is truncated: {self.path}")
+            magic, version, hash_size, count = HEADER.unpack_from(mm, 0)
+            expected_size = HEADER.size + count * (HASH_SIZE + RANK_SIZE)
+            if magic != INDEX_MAGIC or version != INDEX_VERSION or hash_size != HASH_SIZE \
+                    or len(mm) != expected_size:
+                mm.close()
+                raise ValueError(f"Common passwords index is invalid: {self.path}")
+
+            hashes_end = HEADER.size + count * HASH_SIZE
+            view = memoryview(mm)
+            hashes = view[HEADER.size:hashes_end]
+            ranks = view[hashes_end:expected_size]
+            if sys.byteorder == 'little':
+                hashes, ranks = hashes.cast('Q'), ranks.cast('I')
+            else:
+                # Big-endian hosts fall back to private, byte-swapped copies
+                hashes, ranks = array('Q', hashes), array('I', ranks)
+                hashes.byteswap()
+                ranks.byteswap()
+
+            self._hashes, self._ranks, self._count = hashes, ranks, count
+            self._mmap = mm
+
+    def rank(self, password):
+        """Returns the frequency rank of a password (1 = most common) or None if not listed"""
+        if self._mmap is None:
+            self._load()
+        key = password_hash(password)
+        i = bisect_left(self._hashes, key)
+        if i < self._count and self._hashes[i] == key:
+            return self._ranks[i]
+        return None
+
+    def __contains__(self, password):
+        return self.rank(password) is not None
+
+    def __len__(self):
+        if self._mmap is None:
+            self._load()
+        return self._count
+
+    def memory_status(self):
+        """Returns whether the index is memory-mapped and the mapped and private byte counts"""
+        if self._mmap is None:
+            return {'mapped': False, 'mapped_bytes': 0, 'private_bytes': 0}
+        # Big-endian hosts hold private copies of the tables
+        private = sum(table.itemsize * len(table) for table in (self._hashes, self._ranks) if isinstance(table, array))
+        return {'mapped': not private, 'mapped_bytes': len(self._mmap), 'private_bytes': private}
+
+    def close(self):
+        """Releases the memory map (mainly for tests using temporary index files)"""
+        with self._lock:
+            if self._mmap is None:
+                return
+            for view in (self._hashes, self._ranks):
+                if isinstance(view, memoryview):
+                    view.release()
+            self._hashes = self._ranks = None
+            self._mmap.close()
+            self._mmap = None
+            self._count = 0
+
+
+# Shared index over the NCSC 100k most used passwords list
+COMMON_PASSWORDS = PasswordIndex()
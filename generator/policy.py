@@ -0,0 +1,160 @@
+"""
+Password Policies: Compiled generation rules shared by every password generator endpoint.
+
+A policy fixes the length, the character classes with their minimum counts, whether
+ambiguous characters (0/O/1/l/I/|) are excluded and which symbols count as special
+characters. The character tables and combined pool are built once when a policy is
+compiled, and compiled policies are cached by their options, so repeated requests with
+the same options reuse one policy object.
+
+Generation is constructive: each password gets exactly the minimum number of characters of
+every class inserted at uniformly random positions into filler drawn from the combined pool,
+so no password is ever generated and thrown away for missing a class.
+
+Named policies are configured with the GENERATOR_PASSWORD_POLICIES setting, example:
+    GENERATOR_PASSWORD_POLICIES = {
+        "pin": {"length": 6, "numbers": True},
+        "wifi": {"length": 20, "uppercase": True, "lowercase": True, "numbers": True,
+                 "exclude_ambiguous": True},
+    }
+
+Features of Password Policies:
+- Per-class minimum counts (min_uppercase, min_lowercase, min_numbers, min_special)
+- Excluded ambiguous characters and custom symbol sets
+- compile_policy caches compiled policies by options, get_policy resolves named policies
+- satisfied_by checks a password against the policy with the policy's character classifier
+  (see charclasses.py)
+
+References:
+- NIST Password Guidelines: https://sprinto.com/blog/nist-password-guidelines/
+- functools.lru_cache: https://docs.python.org/3/library/functools.html#functools.lru_cache
+"""
+
+import string
+from functools import lru_cache
+
+from django.conf import settings
+
+from generator.charclasses import CharacterClassifier
+from generator.entropy import ENTROPY
+
+AMBIGUOUS_CHARACTERS = '0O1lI|'
+DEFAULT_LENGTH = 15
+MAX_LENGTH = 128
+
+# Option names accepted by compile_policy, in order
+POLICY_OPTIONS = (
+    'length', 'uppercase', 'lowercase', 'numbers', 'special',
+    'min_uppercase', 'min_lowercase', 'min_numbers', 'min_special',
+    'exclude_ambiguous', 'symbols',
+)
+
+
+class PasswordPolicy:
+    """Compiled password policy: character tables, combined pool and minimum counts"""
+
+    def __init__(self, length=DEFAULT_LENGTH, uppercase=False, lowercase=False, numbers=False, special=False,
+                 min_uppercase=0, min_lowercase=0, min_numbers=0, min_special=0,
+                 exclude_ambiguous=False, symbols=None):
+        self.options = {
+            'length': length, 'uppercase': uppercase, 'lowercase': lowercase, 'numbers': numbers,
+            'special': special, 'min_uppercase': min_uppercase, 'min_lowercase': min_lowercase,
+            'min_numbers': min_numbers, 'min_special': min_special,
+            'exclude_ambiguous': exclude_ambiguous, 'symbols': symbols,
+        }
+        self.length = length
+
+        if symbols is not None:
+            symbols = ''.join(dict.fromkeys(symbols))
+            if not symbols or any(c.isalnum() or c.isspace() or not c.isascii() for c in symbols):
+                raise ValueError("Custom symbols must be ASCII punctuation characters.")
+
+        # A class is enabled when selected or when it has a minimum count
+        classes = []
+        names = []
+        for name, alphabet, enabled, minimum in (
+            ('uppercase', string.ascii_uppercase, uppercase, min_uppercase),
+            ('lowercase', string.ascii_lowercase, lowercase, min_lowercase),
+            ('numbers', string.digits, numbers, min_numbers),
+            ('special', symbols if symbols is not None else string.punctuation, special, min_special),
+        ):
+            if minimum < 0:
+                raise ValueError("Minimum character counts must not be negative.")
+            if not (enabled or minimum):
+                continue
+            if exclude_ambiguous:
+                alphabet = ''.join(c for c in alphabet if c not in AMBIGUOUS_CHARACTERS)
+                if not alphabet:
+                    raise ValueError(f"No {name} characters are left after excluding ambiguous characters.")
+            # Selected classes need at least one character
+            classes.append((alphabet, max(minimum, 1)))
+            names.append(name)
+
+        if not classes:
+            raise ValueError("Check at least one option to generate password!")
+        self.required = sum(minimum for _, minimum in classes)
+        if self.required > length:
+            raise ValueError(f"Minimum character counts ({self.required}) exceed the password length ({length}).")
+
+        self.classes = tuple(classes)
+        self.pool = ''.join(alphabet for alphabet, _ in classes)
+        # Characters outside the pool (excluded ambiguous characters included) count as other
+        self.classifier = CharacterClassifier(dict(zip(names, (alphabet for alphabet, _ in classes))))
+
+    def satisfied_by(self, password):
+        """Returns True if password has the policy length, only pool characters and the
+        minimum count of every class"""
+        counts = self.classifier.counts(password)
+        return len(password) == self.length and not counts.other and all(
+            count >= minimum for count, (_, minimum) in zip(counts, self.classes)
+        )
+
+    def generate(self, count=1):
+        """Generates passwords that satisfy the policy.
+        Returns: List of count passwords"""
+        filler_length = self.length - self.required
+        required = [ENTROPY.choices(alphabet, count * minimum) for alphabet, minimum in self.classes]
+        required = ''.join(
+            chars[i * minimum:(i + 1) * minimum]
+            for i in range(count)
+            for (_, minimum), chars in zip(self.classes, required)
+        )
+        filler = ENTROPY.choices(self.pool, count * filler_length)
+        # The k-th inserted character goes into a list of filler_length + k characters, so the
+        # insert positions for every password are drawn in one bulk call per k
+        if count == 1:
+            positions = [[ENTROPY.randbelow(filler_length + k + 1)] for k in range(self.required)]
+        else:
+            positions = [ENTROPY.randbelow_many(filler_length + k + 1, count) for k in range(self.required)]
+
+        passwords = []
+        for i in range(count):
+            password = list(filler[i * filler_length:(i + 1) * filler_length])
+            # Insert each required character at a uniformly random position
+            for k, c in enumerate(required[i * self.required:(i + 1) * self.required]):
+                password.insert(positions[k][i], c)
+            passwords.append(''.join(password))
+        return passwords
+
+    def __repr__(self):
+        return f'PasswordPolicy({self.options!r})'
+
+
+@lru_cache(maxsize=256)
+def _compile(options):
+    return PasswordPolicy(**dict(options))
+
+
+def compile_policy(**options):
+    """Returns the compiled policy for the options, cached by the (hashable) options.
+    Raises: ValueError if the options cannot produce a password"""
+    unknown = set(options) - set(POLICY_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown password policy options: {', '.join(sorted(unknown))}")
+    return _compile(tuple(sorted(options.items())))
+
+
+def get_policy(name):
+    """Returns the compiled policy configured under name in GENERATOR_PASSWORD_POLICIES.
+    Raises: KeyError if no policy has that name"""
+    return compile_policy(**settings.GENERATOR_PASSWORD_POLICIES[name])
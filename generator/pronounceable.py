@@ -0,0 +1,239 @@
+"""
+Pronounceable Password Generator: Memorable passwords drawn from a letter n-gram Markov model.
+
+The model is trained offline on the passphrase wordlist (see misc/build_markov_model.py) and
+shipped as one compact binary table: for every context (the previous ORDER letters, with a
+start marker before the first letter) the cumulative counts of the next letter, quantized so
+every context sums to MODEL_TOTAL (2^16). Contexts never seen in training back off to the
+previous letter alone, then to letter frequencies, so every context can be continued.
+
+Because every context has the same total, each character of a batch is one uniform 16-bit
+draw from the bulk entropy buffer (see entropy.py) and one binary search over the context's
+cumulative counts, with no per-context rejection sampling.
+
+The entropy reported for a password is its exact surprisal under the model,
+-log2 P(password): the bits an attacker who knows the model and guesses the most likely
+passwords first still has to cover. It is summed from a precomputed per-transition bits
+table while the password is generated.
+
+File layout (little-endian):
+- Header (24 bytes): magic, format version, order, alphabet size, total, context count, padding
+- Alphabet: alphabet size ASCII letters
+- Cumulative counts: context count x alphabet size unsigned 32-bit integers
+
+Features of Pronounceable Password Generator:
+- Length, capitalized first letter and an optional digit appended
+- generate_pronounceable returns passwords with their entropy in bits
+- pronounceable_entropy recomputes the entropy of any password the model can produce
+
+References:
+- Markov chain text generation: https://en.wikipedia.org/wiki/Markov_chain#Markov_text_generators
+- Katz back-off model: https://en.wikipedia.org/wiki/Katz%27s_back-off_model
+"""
+
+import math
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from pathlib import Path
+
+from generator.entropy import ENTROPY
+
+MODEL_PATH = Path(__file__).resolve().parent / 'misc' / 'pronounceable.markov'
+MODEL_MAGIC = b'SPMMARKV'
+MODEL_VERSION = 1
+# magic, version, order, alphabet size, total, context count, padding
+MODEL_HEADER = struct.Struct('<8sHHHIH4x')
+MODEL_ORDER = 2
+MODEL_TOTAL = 1 << 16
+DIGITS = '0123456789'
+_DIGIT_BITS = math.log2(len(DIGITS))
+
+
+def _quantize(counts, total):
+    """Scales counts to integers summing to total, keeping every non-zero count at least 1
+    (largest remainder rounding)"""
+    observed = sum(counts)
+    scaled = [count * total / observed for count in counts]
+    quantized = [max(1, int(value)) if count else 0 for value, count in zip(scaled, counts)]
+    remainders = sorted(
+        (i for i, count in enumerate(counts) if count),
+        key=lambda i: scaled[i] - int(scaled[i]), reverse=True,
+    )
+    difference = total - sum(quantized)
+    i = 0
+    while difference:
+        j = remainders[i % len(remainders)]
+        step = 1 if difference > 0 else -1
+        if quantized[j] + step >= 1:
+            quantized[j] += step
+            difference -= step
+        i += 1
+    return quantized
+
+
+def build_model(words, order=MODEL_ORDER, total=MODEL_TOTAL):
+    """Trains the letter Markov model on lowercase words and packs it into the model format
+    Returns: Model file contents"""
+    alphabet = ''.join(sorted({c for word in words for c in word}))
+    if not alphabet or not alphabet.isascii() or not alphabet.isalpha():
+        raise ValueError("Training words must be ASCII letters")
+    size = len(alphabet)
+    index = {c: i for i, c in enumerate(alphabet)}
+    start = size  # Start marker, only ever part of a context
+    contexts = (size + 1) ** order
+
+    transitions = [Counter() for _ in range(contexts)]
+    backoff = [Counter() for _ in range(size + 1)]
+    unigrams = Counter()
+    for word in words:
+        context = [start] * order
+        for c in word:
+            letter = index[c]
+            code = 0
+            for previous in context:
+                code = code * (size + 1) + previous
+            transitions[code][letter] += 1
+            backoff[context[-1]][letter] += 1
+            unigrams[letter] += 1
+            context = context[1:] + [letter]
+
+    cumulative = array('I')
+    for code, counts in enumerate(transitions):
+        if not counts:
+            counts = backoff[code % (size + 1)] or unigrams
+        running = 0
+        for count in _quantize([counts[letter] for letter in range(size)], total):
+            running += count
+            cumulative.append(running)
+    if sys.byteorder == 'big':
+        cumulative.byteswap()
+    header = MODEL_HEADER.pack(MODEL_MAGIC, MODEL_VERSION, order, size, total, contexts)
+    return header + alphabet.encode('ascii') + cumulative.tobytes()
+
+
+def write_model(path, words, order=MODEL_ORDER):
+    """Writes the trained model for words to path (atomically replaced)
+    Returns: Number of contexts"""
+    data = build_model(words, order)
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+    return MODEL_HEADER.unpack_from(data, 0)[5]
+
+
+class MarkovModel:
+    """Letter Markov model: cumulative next-letter counts per context and transition bits"""
+
+    def __init__(self, data):
+        magic, version, order, size, total, contexts = MODEL_HEADER.unpack_from(data, 0)
+        if magic != MODEL_MAGIC or version != MODEL_VERSION:
+            raise ValueError("Markov model file is invalid")
+        offset = MODEL_HEADER.size
+        if len(data) != offset + size + contexts * size * 4 or contexts != (size + 1) ** order:
+            raise ValueError("Markov model file is truncated")
+
+        self.order = order
+        self.total = total
+        self.alphabet = data[offset:offset + size].decode('ascii')
+        self.cumulative = array('I')
+        self.cumulative.frombytes(data[offset + size:])
+        if sys.byteorder == 'big':
+            self.cumulative.byteswap()
+        # Context reached from the start of a password, and the modulus dropping its oldest letter
+        self.start = sum(size * (size + 1) ** i for i in range(order))
+        self._shift = (size + 1) ** (order - 1)
+        # Surprisal in bits of every transition (infinite where the model never emits the letter)
+        self.bits = array('d', [math.inf]) * len(self.cumulative)
+        for i, upper in enumerate(self.cumulative):
+            count = upper - (self.cumulative[i - 1] if i % size else 0)
+            if count:
+                self.bits[i] = math.log2(total / count)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def next_context(self, context, letter):
+        """Returns the context after letter was emitted in context"""
+        return (context % self._shift) * (len(self.alphabet) + 1) + letter
+
+    def generate(self, count, length):
+        """Generates count lowercase strings of length letters.
+        Returns: List of (string, bits) pairs"""
+        alphabet, cumulative, bits = self.alphabet, self.cumulative, self.bits
+        size = len(alphabet)
+        stride, shift = size + 1, self._shift
+        draws = ENTROPY.randbelow_many(self.total, count * length)
+        results = []
+        for i in range(count):
+            context = self.start
+            letters = []
+            surprisal = 0.0
+            for draw in draws[i * length:(i + 1) * length]:
+                low = context * size
+                position = bisect_right(cumulative, draw, low, low + size)
+                letter = position - low
+                letters.append(alphabet[letter])
+                surprisal += bits[position]
+                context = (context % shift) * stride + letter
+            results.append((''.join(letters), surprisal))
+        return results
+
+    def entropy(self, text):
+        """Returns the surprisal in bits of lowercase text (infinite if the model cannot produce it)"""
+        size = len(self.alphabet)
+        context = self.start
+        surprisal = 0.0
+        for c in text:
+            letter = self.alphabet.find(c)
+            if letter < 0:
+                return math.inf
+            surprisal += self.bits[context * size + letter]
+            context = self.next_context(context, letter)
+        return surprisal
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """Returns the process-wide Markov model, loading it on first use"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = MarkovModel.from_file(MODEL_PATH)
+    return _model
+
+
+def generate_pronounceable(count=1, length=15, capitalize=False, include_number=False):
+    """Generate a batch of pronounceable passwords of length characters.
+    Every letter of the batch comes from one bulk entropy read; a digit, when included, is the
+    last character.
+    Returns: List of (password, entropy bits) pairs (empty if count is below 1 or no letters fit)"""
+    letters = length - 1 if include_number else length
+    if count < 1 or letters < 1:
+        return []
+    generated = get_model().generate(count, letters)
+    if include_number:
+        digits = ENTROPY.choices(DIGITS, count)
+        generated = [(text + digit, bits + _DIGIT_BITS) for (text, bits), digit in zip(generated, digits)]
+    if capitalize:
+        generated = [(text.capitalize(), bits) for text, bits in generated]
+    return generated
+
+
+def pronounceable_entropy(password):
+    """Returns the entropy in bits of a password produced by generate_pronounceable"""
+    bits = 0.0
+    if password[-1:].isdigit():
+        password, bits = password[:-1], _DIGIT_BITS
+    return bits + get_model().entropy(password.lower())
@@ -3,12 +3,82 @@ Serializers for Password Generator API
 
 Features:
 - Validates length of password between 4 and 128 characters
+- Validates number of passwords per request between 1 and MAX_PASSWORD_COUNT
+  (GENERATOR_STREAM_MAX_COUNT for streamed NDJSON responses)
 - Sets default values for length, uppercase, lowercase, numbers, and special characters
+- Passphrase mode options: word count between 3 and 20, separator, capitalization and a digit
+- Pronounceable mode uses length, capitalization and a digit (see pronounceable.py)
+- Named (GENERATOR_PASSWORD_POLICIES) or inline password policies, compiled with policy.py
+- Validates batches of passwords for strength analysis (up to GENERATOR_STRENGTH_BATCH_MAX
+  passwords of MAX_BATCH_PASSWORD_LENGTH characters, GENERATOR_STRENGTH_BATCH_MAX_CHARS in total)
 - Error handling
 """
 
+from django.conf import settings
 from rest_framework import serializers
 
+from generator.estimator import MAX_SCORED_LENGTH
+from generator.policy import MAX_LENGTH, compile_policy, get_policy
+
+# Upper bound for passwords generated in a single request
+MAX_PASSWORD_COUNT = 1000
+MAX_BATCH_PASSWORD_LENGTH = MAX_SCORED_LENGTH
+MIN_PASSPHRASE_WORDS = 3
+MAX_PASSPHRASE_WORDS = 20
+
+
+class PasswordPolicySerializer(serializers.Serializer):
+    """Serializer for inline password policies"""
+    length = serializers.IntegerField(
+        required=False,
+        default=15,
+        min_value=4,
+        max_value=MAX_LENGTH,
+        error_messages={
+            "invalid": "Invalid password length. Must be a number between 4 and 128.",
+            "min_value": "Invalid password length. Enter a number between 4 and 128.",
+            "max_value": "Invalid password length. Enter a number between 4 and 128.",
+        },
+    )
+    uppercase = serializers.BooleanField(required=False, default=False)
+    lowercase = serializers.BooleanField(required=False, default=False)
+    numbers = serializers.BooleanField(required=False, default=False)
+    special = serializers.BooleanField(required=False, default=False)
+    min_uppercase = serializers.IntegerField(required=False, default=0, min_value=0, max_value=MAX_LENGTH)
+    min_lowercase = serializers.IntegerField(required=False, default=0, min_value=0, max_value=MAX_LENGTH)
+    min_numbers = serializers.IntegerField(required=False, default=0, min_value=0, max_value=MAX_LENGTH)
+    min_special = serializers.IntegerField(required=False, default=0, min_value=0, max_value=MAX_LENGTH)
+    exclude_ambiguous = serializers.BooleanField(required=False, default=False)
+    symbols = serializers.CharField(required=False, max_length=64, trim_whitespace=False)
+
+
+class PolicyField(serializers.Field):
+    """Accepts the name of a configured policy or an inline policy object.
+    Returns: Compiled PasswordPolicy"""
+    default_error_messages = {
+        "unknown": "Unknown password policy.",
+        "invalid": "Password policy must be a policy name or an object of policy options.",
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            try:
+                return get_policy(data)
+            except KeyError:
+                self.fail("unknown")
+        if not isinstance(data, dict):
+            self.fail("invalid")
+
+        serializer = PasswordPolicySerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            return compile_policy(**serializer.validated_data)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+    def to_representation(self, value):
+        return value.options
+
 
 class PasswordOptionsSerializer(serializers.Serializer):
     """Serializer for password generation options"""
@@ -23,13 +93,64 @@ class PasswordOptionsSerializer(serializers.Serializer):
             "max_value": "Invalid password length. Enter a number between 4 and 128.",
         },
     )
+    # The upper bound depends on stream, so it is checked in validate
+    count = serializers.IntegerField(
+        required=False,
+        default=1,
+        min_value=1,
+        error_messages={
+            "invalid": f"Invalid password count. Must be a number between 1 and {MAX_PASSWORD_COUNT}.",
+            "min_value": f"Invalid password count. Enter a number between 1 and {MAX_PASSWORD_COUNT}.",
+        },
+    )
+    stream = serializers.BooleanField(required=False, default=False)
     uppercase = serializers.BooleanField(required=False, default=False)
     lowercase = serializers.BooleanField(required=False, default=False)
     numbers = serializers.BooleanField(required=False, default=False)
     special = serializers.BooleanField(required=False, default=False)
+    mode = serializers.ChoiceField(
+        choices=["password", "passphrase", "pronounceable"],
+        required=False,
+        default="password",
+        error_messages={"invalid_choice": "Invalid mode. Choose password, passphrase or pronounceable."},
+    )
+    words = serializers.IntegerField(
+        required=False,
+        default=6,
+        min_value=MIN_PASSPHRASE_WORDS,
+        max_value=MAX_PASSPHRASE_WORDS,
+        error_messages={
+            "invalid": f"Invalid word count. Must be a number between {MIN_PASSPHRASE_WORDS} and {MAX_PASSPHRASE_WORDS}.",
+            "min_value": f"Invalid word count. Enter a number between {MIN_PASSPHRASE_WORDS} and {MAX_PASSPHRASE_WORDS}.",
+            "max_value": f"Invalid word count. Enter a number between {MIN_PASSPHRASE_WORDS} and {MAX_PASSPHRASE_WORDS}.",
+        },
+    )
+    separator = serializers.CharField(
+        required=False,
+        default="-",
+        allow_blank=True,
+        trim_whitespace=False,
+        max_length=3,
+        error_messages={"max_length": "Invalid separator. Use at most 3 characters."},
+    )
+    capitalize = serializers.BooleanField(required=False, default=False)
+    include_number = serializers.BooleanField(required=False, default=False)
+    policy = PolicyField(required=False)
 
     def validate(self, attrs):
-        """Ensure at least one character type is selected"""
+        """Ensure the count is within the limit, a policy is only given in password mode and at
+        least one character type is selected (password mode without a policy only)"""
+        max_count = settings.GENERATOR_STREAM_MAX_COUNT if attrs.get("stream") else MAX_PASSWORD_COUNT
+        if attrs.get("count", 1) > max_count:
+            raise serializers.ValidationError(
+                {"count": [f"Invalid password count. Enter a number between 1 and {max_count}."]}
+            )
+        if "policy" in attrs and attrs.get("mode", "password") != "password":
+            raise serializers.ValidationError(
+                {"policy": ["Password policies can only be used in password mode."]}
+            )
+        if attrs.get("mode") in ("passphrase", "pronounceable") or "policy" in attrs:
+            return attrs
         if not any([
             attrs.get("uppercase"),
             attrs.get("lowercase"),
@@ -40,3 +161,36 @@ class PasswordOptionsSerializer(serializers.Serializer):
                 {"non_field_errors": ["Check at least one option to generate password!"]}
             )
         return attrs
+
+
+class PasswordStrengthBatchSerializer(serializers.Serializer):
+    """Serializer for batch password strength analysis"""
+    passwords = serializers.ListField(
+        child=serializers.CharField(
+            trim_whitespace=False,
+            max_length=MAX_BATCH_PASSWORD_LENGTH,
+            error_messages={
+                "blank": "Passwords in a batch must not be empty.",
+                "max_length": f"Passwords in a batch must be at most {MAX_BATCH_PASSWORD_LENGTH} characters.",
+            },
+        ),
+        allow_empty=False,
+        error_messages={
+            "not_a_list": "Passwords must be provided as a list.",
+            "empty": "Provide at least one password to analyze.",
+        },
+    )
+
+    def validate_passwords(self, value):
+        """Ensure the batch does not exceed the configured size limits"""
+        max_size = settings.GENERATOR_STRENGTH_BATCH_MAX
+        if len(value) > max_size:
+            raise serializers.ValidationError(
+                f"Too many passwords. A batch can contain at most {max_size} passwords."
+            )
+        max_chars = settings.GENERATOR_STRENGTH_BATCH_MAX_CHARS
+        if sum(map(len, value)) > max_chars:
+            raise serializers.ValidationError(
+                f"Batch too large. Passwords in a batch can total at most {max_chars} characters."
+            )
+        return value
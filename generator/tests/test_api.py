@@ -9,9 +9,11 @@ References:
 To run test locally: python manage.py test generator.tests
 """
 
-from django.test import TestCase
+import json
+from django.test import TestCase, override_settings
 from rest_framework.test import APIClient
 from django.urls import reverse
+from generator.pronounceable import pronounceable_entropy
 
 
 class APITests(TestCase):
@@ -46,3 +48,178 @@ class APITests(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertIn('error', response.data)
         self.assertEqual(response.data['error'], 'Check at least one option to generate password!')
+
+    def test_generate_password_batch_api(self):
+        """Tests batch password generation via API call with the count option"""
+        url = reverse('password_generator_api')
+        data = {'count': 25, 'length': 10, 'lowercase': True, 'numbers': True}
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['passwords']), 25)
+        self.assertTrue(all(len(password) == 10 for password in response.data['passwords']))
+
+    def test_generate_password_invalid_count_api(self):
+        """Tests batch password generation rejects counts over the limit"""
+        url = reverse('password_generator_api')
+        data = {'count': 100000, 'lowercase': True}
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('count', response.data['error'])
+
+    def test_generate_passphrase_api(self):
+        """Tests passphrase generation via API call with all passphrase options"""
+        url = reverse('password_generator_api')
+        data = {'mode': 'passphrase', 'words': 5, 'separator': '.', 'capitalize': True, 'include_number': True}
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        words = response.data['password'].split('.')
+        self.assertEqual(len(words), 5)
+        self.assertTrue(all(word[0].isupper() for word in words))
+        self.assertEqual(sum(character.isdigit() for character in response.data['password']), 1)
+
+    def test_generate_passphrase_invalid_words_api(self):
+        """Tests passphrase generation rejects word counts out of range"""
+        url = reverse('password_generator_api')
+        response = self.client.post(url, {'mode': 'passphrase', 'words': 2}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Invalid word count. Enter a number between 3 and 20.')
+
+    def test_generate_password_named_policy_api(self):
+        """Tests password generation with a named policy from settings"""
+        url = reverse('password_generator_api')
+        response = self.client.post(url, {'policy': 'pin', 'count': 3}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(len(p) == 6 and p.isdigit() for p in response.data['passwords']))
+
+    def test_generate_password_inline_policy_api(self):
+        """Tests password generation with an inline policy"""
+        url = reverse('password_generator_api')
+        data = {'policy': {'length': 12, 'min_numbers': 5, 'lowercase': True, 'exclude_ambiguous': True}}
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        password = response.data['password']
+        self.assertEqual(len(password), 12)
+        self.assertGreaterEqual(sum(c.isdigit() for c in password), 5)
+        self.assertNotIn('0', password)
+        self.assertNotIn('l', password)
+
+    def test_generate_password_invalid_policy_api(self):
+        """Tests unknown and impossible policies are rejected"""
+        url = reverse('password_generator_api')
+        response = self.client.post(url, {'policy': 'missing'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Unknown password policy.')
+
+        data = {'policy': {'length': 4, 'min_numbers': 3, 'min_special': 3}}
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Minimum character counts (6) exceed the password length (4).')
+
+        data = {'policy': {'length': 8, 'special': True, 'symbols': '|', 'exclude_ambiguous': True}}
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['error'], 'No special characters are left after excluding ambiguous characters.'
+        )
+
+    def test_generate_password_stream_api(self):
+        """Tests streamed generation returns one NDJSON line per password above the list limit"""
+        url = reverse('password_generator_api')
+        data = {'count': 2500, 'stream': True, 'length': 10, 'numbers': True}
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2500)
+        self.assertTrue(all(len(json.loads(line)['password']) == 10 for line in lines))
+
+    def test_generate_pronounceable_stream_api(self):
+        """Tests streamed pronounceable passwords carry the entropy reported by the generator"""
+        url = reverse('password_generator_api')
+        data = {'count': 1200, 'stream': True, 'mode': 'pronounceable', 'length': 12}
+        response = self.client.post(url, data, format='json')
+
+        items = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(items), 1200)
+        self.assertTrue(all(item['entropy_bits'] == round(pronounceable_entropy(item['password']), 2) for item in items))
+
+    def test_generate_password_policy_mode_api(self):
+        """Tests policies are rejected outside password mode"""
+        url = reverse('password_generator_api')
+        for mode in ('passphrase', 'pronounceable'):
+            response = self.client.post(url, {'mode': mode, 'policy': {'length': 12, 'numbers': True}}, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data['error'], 'Password policies can only be used in password mode.')
+
+    @override_settings(GENERATOR_STREAM_MAX_COUNT=5000)
+    def test_generate_password_stream_limit_api(self):
+        """Tests streamed generation rejects counts over the stream limit"""
+        url = reverse('password_generator_api')
+        response = self.client.post(url, {'count': 5001, 'stream': True, 'numbers': True}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Invalid password count. Enter a number between 1 and 5000.')
+
+    def test_check_strength_batch_api(self):
+        """Tests batch strength analysis returns results in input order"""
+        url = reverse('password_strength_batch_api')
+        data = {'passwords': ['password1', 'Xk9#mQ2$vL7@pR4!', 'abc']}
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual(len(results), 3)
+        self.assertIn("Password is found in common passwords list.", results[0]['notes'])
+        self.assertEqual(results[1]['strength'], 'Strong')
+        self.assertEqual(results[2]['strength'], 'Weak')
+
+    @override_settings(GENERATOR_STRENGTH_BATCH_MAX=2)
+    def test_check_strength_batch_limit_api(self):
+        """Tests batch strength analysis rejects batches over the configured limit"""
+        url = reverse('password_strength_batch_api')
+        data = {'passwords': ['one', 'two', 'three']}
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Too many passwords. A batch can contain at most 2 passwords.')
+
+    @override_settings(GENERATOR_STRENGTH_BATCH_MAX_CHARS=10)
+    def test_check_strength_batch_size_limits_api(self):
+        """Tests batch strength analysis rejects overlong passwords and batches over the character limit"""
+        url = reverse('password_strength_batch_api')
+        response = self.client.post(url, {'passwords': ['a' * 129]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Passwords in a batch must be at most 128 characters.')
+
+        response = self.client.post(url, {'passwords': ['password', 'abc']}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['error'], 'Batch too large. Passwords in a batch can total at most 10 characters.'
+        )
+
+    def test_check_strength_length_limit_api(self):
+        """Tests strength analysis rejects passwords longer than the scored length"""
+        url = reverse('password_strength_api')
+        response = self.client.post(url, {'password': 'x' * 128}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(url, {'password': 'x' * 129}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Password must be at most 128 characters.')
+
+    def test_check_strength_batch_empty_password_api(self):
+        """Tests batch strength analysis rejects empty passwords in the batch"""
+        url = reverse('password_strength_batch_api')
+        data = {'passwords': ['password1', '']}
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Passwords in a batch must not be empty.')
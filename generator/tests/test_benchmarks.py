@@ -0,0 +1,96 @@
+"""
+Benchmark Baseline Tests
+
+This module contains tests for saving benchmark baselines and detecting regressions against them
+
+To run test locally: python manage.py test generator.tests
+"""
+
+import io
+import json
+import os
+import tempfile
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+from generator.benchmarks import (
+    BENCHMARKS, compare_to_baseline, load_baseline, load_references, metric_change, run_benchmark, save_baseline,
+)
+
+
+class BenchmarkBaselineTest(SimpleTestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        os.remove(self.path)
+        self.addCleanup(lambda: os.path.exists(self.path) and os.remove(self.path))
+
+    def test_metric_direction(self):
+        """Tests latencies regress when they grow and throughputs when they shrink"""
+        self.assertEqual(metric_change(15, 10, 'us'), 0.5)
+        self.assertEqual(metric_change(5, 10, 'passwords/s'), 0.5)
+        self.assertEqual(metric_change(20, 10, 'requests/s'), -1)
+        self.assertIsNone(metric_change(5, 0, 'KiB'))
+
+    def test_reference_scale(self):
+        """Tests times and rates are compared against the baseline scaled to this machine's speed"""
+        self.assertEqual(metric_change(20, 10, 'us', scale=2), 0)
+        self.assertEqual(metric_change(5, 10, 'passwords/s', scale=2), 0)
+        self.assertEqual(metric_change(20, 10, 'KiB', scale=2), 1)
+        baseline = {'utils': {'latency': {'value': 10, 'unit': 'us'}}}
+        self.assertEqual(compare_to_baseline({'utils': [('latency', 20, 'us')]}, baseline, 0.25, {'utils': 2}), [])
+
+    @patch('generator.benchmarks.reference_time', side_effect=[100, 300, 100, 100, 200, 200])
+    def test_run_benchmark_median(self, reference_time):
+        """Tests repeated runs keep the median of every metric and of the bracketing reference times"""
+        values = iter([5, 1, 3])
+        with patch.dict(BENCHMARKS, {'fake': lambda: [('latency', next(values), 'us')]}):
+            self.assertEqual(run_benchmark('fake', repeats=3), ([('latency', 3, 'us')], 200))
+
+    def test_save_merges_benchmarks(self):
+        """Tests saving a baseline replaces the benchmarks that were run and keeps the others"""
+        self.assertEqual(load_baseline(self.path), {})
+        save_baseline({'a': [('latency', 1.5, 'us')], 'b': [('rate', 10, 'passwords/s')]}, self.path, {'a': 5, 'b': 6})
+        save_baseline({'a': [('latency', 2, 'us')]}, self.path, {'a': 7})
+        self.assertEqual(load_baseline(self.path), {
+            'a': {'latency': {'value': 2, 'unit': 'us'}},
+            'b': {'rate': {'value': 10, 'unit': 'passwords/s'}},
+        })
+        self.assertEqual(load_references(self.path), {'a': 7, 'b': 6})
+
+    def test_compare_to_baseline(self):
+        """Tests only metrics that got worse past the threshold are reported"""
+        baseline = {'utils': {
+            'latency': {'value': 10, 'unit': 'us'},
+            'rate': {'value': 100, 'unit': 'passwords/s'},
+            'memory': {'value': 10, 'unit': 'MiB'},
+        }}
+        results = {'utils': [
+            ('latency', 12, 'us'), ('rate', 50, 'passwords/s'), ('memory', 10, 'KiB'), ('new metric', 1, 'us'),
+        ]}
+        self.assertEqual(compare_to_baseline(results, baseline, 0.25), [('utils', 'rate', 100, 50, 0.5)])
+        self.assertEqual(compare_to_baseline(results, baseline, 0.5), [])
+
+    @patch('generator.benchmarks.reference_time', return_value=1000.0)
+    def test_command_fails_on_regression(self, reference_time):
+        """Tests the benchmark command saves a baseline and fails once a metric regresses"""
+        latency = [1.0]
+        with patch.dict(BENCHMARKS, {'fake': lambda: [('latency', latency[0], 'us')]}):
+            call_command('benchmark_generator', only=['fake'], save_baseline=True, baseline=self.path, stdout=io.StringIO())
+            with open(self.path) as f:
+                self.assertEqual(json.load(f)['benchmarks']['fake']['latency']['value'], 1.0)
+
+            latency[0] = 1.1
+            call_command('benchmark_generator', only=['fake'], compare=True, baseline=self.path, stdout=io.StringIO())
+            latency[0] = 2.0
+            with self.assertRaises(CommandError):
+                call_command('benchmark_generator', only=['fake'], compare=True, baseline=self.path,
+                             stdout=io.StringIO(), stderr=io.StringIO())
+            call_command('benchmark_generator', only=['fake'], compare=True, threshold=1.5, baseline=self.path,
+                         stdout=io.StringIO())
+
+    def test_command_requires_baseline(self):
+        """Tests comparing without a saved baseline is an error"""
+        with self.assertRaises(CommandError):
+            call_command('benchmark_generator', only=['utils'], compare=True, baseline=self.path)
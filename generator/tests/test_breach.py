@@ -0,0 +1,152 @@
+"""
+Breach Corpus Tests
+
+This module contains tests for the k-anonymity breach corpus and range endpoint
+
+To run test locally: python manage.py test generator.tests
+"""
+
+import hashlib
+import os
+import tempfile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from generator.bloom import BloomFilter, optimal_parameters, write_bloom_filter
+from generator.breach import BreachCorpus, write_breach_index
+from generator.utils import password_strength, password_strength_batch
+
+
+def _sha1(password):
+    return hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+
+
+class BreachCorpusTest(TestCase):
+    def setUp(self):
+        """Builds a small breach corpus in a temporary file"""
+        self.counts = {'password': 1000, 'letmein': 50, 'qwerty': 700}
+        lines = sorted(f'{_sha1(password)}:{count}' for password, count in self.counts.items())
+        handle, self.path = tempfile.mkstemp(suffix='.idx')
+        os.close(handle)
+        self.assertEqual(write_breach_index(self.path, lines), 3)
+        self.corpus = BreachCorpus(self.path)
+        self.client = APIClient()
+
+    def tearDown(self):
+        self.corpus.close()
+        os.remove(self.path)
+
+    def test_range(self):
+        """Range lookups return the suffix and count for matching hashes"""
+        digest = _sha1('password')
+        self.assertIn((digest[5:], 1000), self.corpus.range(digest[:5]))
+        self.assertEqual(self.corpus.range('00000'), [])
+
+    def test_exact_lookup(self):
+        """Exact lookups return the breach count or 0"""
+        self.assertEqual(self.corpus.count_for_password('qwerty'), 700)
+        self.assertEqual(self.corpus.count_for_password('letmein'), 50)
+        self.assertEqual(self.corpus.count_for_password('not breached 9f8e'), 0)
+
+    def test_unsorted_input(self):
+        """The builder rejects input that is not ordered by hash"""
+        lines = sorted((f'{_sha1(p)}:1' for p in self.counts), reverse=True)
+        with self.assertRaises(ValueError):
+            write_breach_index(self.path, lines)
+
+    def test_range_api(self):
+        """Range endpoint returns SUFFIX:COUNT lines in plain text"""
+        digest = _sha1('letmein')
+        with override_settings(GENERATOR_BREACH_CORPUS_PATH=self.path):
+            response = self.client.get(reverse('breach_range_api', args=[digest[:5].lower()]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/plain')
+        self.assertIn(f'{digest[5:]}:50', response.content.decode().splitlines())
+
+    def test_range_api_invalid_prefix(self):
+        """Range endpoint rejects prefixes that are not 5 hex characters"""
+        with override_settings(GENERATOR_BREACH_CORPUS_PATH=self.path):
+            response = self.client.get(reverse('breach_range_api', args=['XYZ12']))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.data)
+
+    def test_range_api_not_configured(self):
+        """Range endpoint returns 503 when no corpus is configured"""
+        with override_settings(GENERATOR_BREACH_CORPUS_PATH=None):
+            response = self.client.get(reverse('breach_range_api', args=['ABCDE']))
+        self.assertEqual(response.status_code, 503)
+
+
+class BreachBloomFilterTest(TestCase):
+    def setUp(self):
+        """Builds a breach corpus and a Bloom filter over it in temporary files"""
+        self.breached = ['Summer2019!x', 'Tr0ub4dor&3', 'correcthorse']
+        lines = sorted(f'{_sha1(password)}:{i + 1}' for i, password in enumerate(self.breached))
+        handle, self.corpus_path = tempfile.mkstemp(suffix='.idx')
+        os.close(handle)
+        write_breach_index(self.corpus_path, lines)
+        handle, self.bloom_path = tempfile.mkstemp(suffix='.bloom')
+        os.close(handle)
+        corpus = BreachCorpus(self.corpus_path)
+        corpus.load()
+        write_bloom_filter(self.bloom_path, corpus.iter_digests(), corpus.count, 0.01)
+        corpus.close()
+        self.settings = override_settings(
+            GENERATOR_BREACH_CORPUS_PATH=self.corpus_path,
+            GENERATOR_BREACH_BLOOM_PATH=self.bloom_path,
+        )
+
+    def tearDown(self):
+        os.remove(self.corpus_path)
+        os.remove(self.bloom_path)
+
+    def test_optimal_parameters(self):
+        """Sizing follows the standard Bloom filter formulas"""
+        bits, hashes = optimal_parameters(1000000, 0.01)
+        self.assertEqual(hashes, 7)
+        self.assertAlmostEqual(bits / 1000000, 9.585, places=2)
+
+    def test_no_false_negatives(self):
+        """Every breached digest is reported as possibly present"""
+        bloom = BloomFilter(self.bloom_path)
+        for password in self.breached:
+            self.assertIn(hashlib.sha1(password.encode()).digest(), bloom)
+        self.assertEqual(bloom.hits, 3)
+        bloom.close()
+
+    def test_breached_password_strength(self):
+        """Breached passwords lose the uniqueness points and Bloom counters are updated"""
+        with self.settings:
+            data = password_strength('Summer2019!x')
+            self.assertIn("Password is found in known data breaches.", data['notes'])
+            self.assertEqual(data['score'], 5)
+
+            data = password_strength('Xk9#mQ2$vL7@pR4!')
+            self.assertEqual(data['score'], 10)
+
+            response = APIClient().get(reverse('generator_status_api'))
+            bloom = response.data['breach']['bloom']
+            self.assertTrue(response.data['ready'])
+            self.assertGreaterEqual(bloom['hits'], 1)
+            self.assertEqual(bloom['hits'] + bloom['misses'], 2)
+
+    def test_missing_corpus_is_skipped(self):
+        """A configured corpus that is missing is logged once and counts as not breached"""
+        missing = self.corpus_path + '.missing'
+        with override_settings(GENERATOR_BREACH_CORPUS_PATH=missing, GENERATOR_BREACH_BLOOM_PATH=None):
+            with self.assertLogs('generator.breach', 'ERROR') as logs:
+                note = "Password is found in known data breaches."
+                self.assertNotIn(note, password_strength('Summer2019!x')['notes'])
+                self.assertNotIn(note, password_strength_batch(['Summer2019!x'])[0]['notes'])
+            self.assertEqual(len(logs.records), 1)
+            response = APIClient().get(reverse('generator_status_api'))
+            self.assertIn('not found', response.data['breach']['error'])
+
+    def test_corrupt_bloom_filter_is_bypassed(self):
+        """A corrupt Bloom filter is logged once and the exact lookup is used instead"""
+        with open(self.bloom_path, 'wb') as f:
+            f.write(b'not a bloom filter' * 4)
+        with self.settings, self.assertLogs('generator.breach', 'ERROR') as logs:
+            self.assertIn("Password is found in known data breaches.", password_strength('Summer2019!x')['notes'])
+            self.assertEqual(password_strength('Xk9#mQ2$vL7@pR4!')['score'], 10)
+        self.assertEqual(len(logs.records), 1)
@@ -0,0 +1,66 @@
+"""
+Bulk Password Generation Tests
+
+This module contains tests for the bulk output formats and the generate_passwords command
+
+To run test locally: python manage.py test generator.tests
+"""
+
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from generator.bulk import chunk_sizes, format_passwords
+
+
+class BulkFormatTest(TestCase):
+    def test_formats(self):
+        """Tests every format round-trips passwords with separators and quotes"""
+        passwords = ['a,b', 'c"d', 'plain']
+        self.assertEqual(format_passwords(passwords, 'newline').splitlines(), passwords)
+        self.assertEqual([row[0] for row in csv.reader(StringIO(format_passwords(passwords, 'csv')))], passwords)
+        lines = format_passwords(passwords, 'ndjson').splitlines()
+        self.assertEqual([json.loads(line)['password'] for line in lines], passwords)
+
+    def test_chunk_sizes(self):
+        """Tests chunks add up to the total"""
+        self.assertEqual(list(chunk_sizes(25, 10)), [10, 10, 5])
+
+
+class GeneratePasswordsCommandTest(TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.csv')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_process_pool_csv(self):
+        """Tests chunks from several workers are all written after the CSV header"""
+        call_command('generate_passwords', 2500, '--length', '12', '--lowercase', '--numbers', '--format', 'csv',
+                     '--workers', '2', '--chunk-size', '1000', '--output', self.path, stderr=StringIO())
+        with open(self.path, newline='') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ['password'])
+        self.assertEqual(len(rows), 2501)
+        self.assertTrue(all(len(row[0]) == 12 and row[0].isalnum() for row in rows[1:]))
+
+    def test_named_policy_ndjson_stdout(self):
+        """Tests a named policy written to stdout as NDJSON"""
+        out = StringIO()
+        call_command('generate_passwords', 5, '--policy', 'pin', '--format', 'ndjson', '--workers', '1',
+                     stdout=out, stderr=StringIO())
+        passwords = [json.loads(line)['password'] for line in out.getvalue().splitlines()]
+        self.assertEqual(len(passwords), 5)
+        self.assertTrue(all(password.isdigit() for password in passwords))
+
+    def test_invalid_options(self):
+        """Tests unknown policies and empty inline policies are rejected"""
+        with self.assertRaises(CommandError):
+            call_command('generate_passwords', 5, '--policy', 'missing')
+        with self.assertRaises(CommandError):
+            call_command('generate_passwords', 5, '--length', '10')
@@ -0,0 +1,46 @@
+"""
+Character Class Tests
+
+This module contains tests for the byte lookup table character classifier
+
+To run test locally: python manage.py test generator.tests
+"""
+
+import string
+from django.test import SimpleTestCase
+from generator.charclasses import CHARACTER_CLASSES, CharacterClassifier, character_counts, pool_cardinality
+
+
+class CharacterClassifierTest(SimpleTestCase):
+    def test_counts(self):
+        """Tests every class is counted, with spaces and unicode counted as other"""
+        self.assertEqual(character_counts('Xk9#mQ2$vL7@pR4!'), (4, 4, 4, 4, 0))
+        counts = character_counts('Pässwörd 中文 1!')
+        self.assertEqual(counts._asdict(), {'uppercase': 1, 'lowercase': 5, 'numbers': 1, 'special': 1, 'other': 6})
+        self.assertEqual(character_counts(''), (0, 0, 0, 0, 0))
+        self.assertEqual(character_counts('a\ud800b').other, 1)
+
+    def test_matches_membership_checks(self):
+        """Tests counts agree with per-character membership checks for every Latin-1 character"""
+        text = ''.join(map(chr, range(256)))
+        alphabets = (string.ascii_uppercase, string.ascii_lowercase, string.digits, string.punctuation)
+        expected = [sum(c in alphabet for c in text) for alphabet in alphabets]
+        self.assertEqual(list(character_counts(text)), expected + [256 - sum(expected)])
+
+    def test_pool_cardinality(self):
+        """Tests the brute force pool covers the classes used"""
+        self.assertEqual(pool_cardinality(character_counts('abc')), 26)
+        self.assertEqual(pool_cardinality(character_counts('aB3!')), 95)
+        self.assertEqual(pool_cardinality(character_counts('a b')), 126)
+        self.assertEqual(pool_cardinality(character_counts('')), 1)
+
+    def test_custom_classes(self):
+        """Tests custom classes are classified and overlapping or non-ASCII classes are rejected"""
+        classifier = CharacterClassifier({'vowels': 'aeiou', 'digits': '0123'})
+        self.assertEqual(classifier.counts('audio42').vowels, 4)
+        self.assertEqual(classifier.counts('audio42').other, 2)
+        self.assertEqual(CHARACTER_CLASSES.Counts._fields, ('uppercase', 'lowercase', 'numbers', 'special', 'other'))
+        with self.assertRaises(ValueError):
+            CharacterClassifier({'a': 'abc', 'b': 'cde'})
+        with self.assertRaises(ValueError):
+            CharacterClassifier({'accents': 'é'})
@@ -0,0 +1,61 @@
+"""
+Crack Time Estimation Tests
+
+This module contains tests for rank-aware guesses and crack times per attacker model
+
+To run test locally: python manage.py test generator.tests
+"""
+
+import math
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from generator.crack_time import VARIANT_GUESSES, crack_times, display_time, guesses_log10
+from generator.estimator import estimate_guesses
+from generator.utils import password_strength
+
+
+class CrackTimeTest(TestCase):
+    def test_display_time(self):
+        """Tests durations are shown in the largest fitting unit"""
+        self.assertEqual(display_time(-0.5), 'less than a second')
+        self.assertEqual(display_time(0), '1 second')
+        self.assertEqual(display_time(1.56), '36 seconds')
+        self.assertEqual(display_time(2.16), '2 minutes')
+        self.assertEqual(display_time(6.21), '19 days')
+        self.assertEqual(display_time(8), '3 years')
+        self.assertEqual(display_time(10), 'centuries')
+
+    def test_rank_bounds_guesses(self):
+        """Tests the common password rank caps the estimator's guesses"""
+        estimate = estimate_guesses('password')
+        self.assertEqual(guesses_log10(estimate), estimate['guesses_log10'])
+        self.assertEqual(guesses_log10(estimate, common_rank=4), 0.6)
+        self.assertEqual(guesses_log10({'guesses_log10': 0.3}, common_rank=1000), 0.3)
+
+    def test_close_variant_bounds_guesses(self):
+        """Tests a close variant costs the rank of its common password times the variants tried"""
+        self.assertEqual(guesses_log10({'guesses_log10': 12}, variant_rank=4), round(math.log10(4 * VARIANT_GUESSES), 2))
+        data = password_strength('p@ssw0rd')
+        self.assertIn("Password is a close variant of a common password.", data['notes'])
+        self.assertLess(data['guesses_log10'], 4)
+        self.assertNotIn('year', data['crack_times']['online_throttled']['display'])
+
+    @override_settings(GENERATOR_ATTACKER_MODELS={'online': 10, 'offline': 1e10})
+    def test_configured_attacker_models(self):
+        """Tests crack times are reported for every configured attacker model"""
+        times = crack_times(12)
+        self.assertEqual(times['online'], {'seconds_log10': 11, 'display': 'centuries'})
+        self.assertEqual(times['offline'], {'seconds_log10': 2, 'display': '2 minutes'})
+
+    def test_strength_api_crack_times(self):
+        """Tests the strength endpoint reports crack times for the default attacker models"""
+        response = APIClient().post(reverse('password_strength_api'), {'password': '123456'}, format='json')
+        self.assertEqual(response.data['guesses_log10'], 0)
+        self.assertEqual(
+            set(response.data['crack_times']), {'online_throttled', 'offline_slow_hash', 'offline_fast_hash'},
+        )
+        self.assertEqual(response.data['crack_times']['offline_fast_hash']['display'], 'less than a second')
+
+        response = APIClient().post(reverse('password_strength_api'), {'password': 'Xk9#mQ2$vL7@pR4!'}, format='json')
+        self.assertEqual(response.data['crack_times']['offline_fast_hash']['display'], 'centuries')
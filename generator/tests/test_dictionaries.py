@@ -0,0 +1,101 @@
+"""
+Password Dictionary Provider Tests
+
+This module contains tests for the pluggable common password dictionaries
+
+To run test locally: python manage.py test generator.tests
+"""
+
+import os
+import tempfile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from generator.dictionaries import DictionaryRegistry, password_dictionaries
+from generator.utils import password_strength
+
+
+class DictionaryProviderTest(TestCase):
+    def setUp(self):
+        """Writes a small custom organisation list to a temporary file"""
+        handle, self.path = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w') as f:
+            f.write('Acme#Vq7Zk2Lx9w!\nWelcome@Acme1\n')
+        self.config = [
+            {
+                'NAME': 'ncsc-100k',
+                'BACKEND': 'generator.dictionaries.BinaryIndexProvider',
+                'OPTIONS': {'path': password_dictionaries.providers[0].index.path},
+            },
+            {
+                'NAME': 'org',
+                'BACKEND': 'generator.dictionaries.TextFileProvider',
+                'OPTIONS': {'path': self.path},
+            },
+        ]
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_registry_status(self):
+        """Registry loads every provider and reports its size"""
+        registry = DictionaryRegistry(self.config)
+        self.assertTrue(registry.load())
+        self.assertTrue(registry.ready)
+        status = registry.status()
+        self.assertEqual([s['name'] for s in status], ['ncsc-100k', 'org'])
+        self.assertEqual(status[0]['size'], 96507)
+        self.assertEqual(status[1]['size'], 2)
+
+    def test_registry_rank_across_providers(self):
+        """Lookups check every provider and return the best rank"""
+        registry = DictionaryRegistry(self.config)
+        registry.load()
+        self.assertEqual(registry.rank('123456'), 1)
+        self.assertEqual(registry.rank('Welcome@Acme1'), 2)
+        self.assertIsNone(registry.rank('not-listed-anywhere-91'))
+
+    def test_missing_file_status(self):
+        """A provider that cannot load is reported as not ready"""
+        self.config[1]['OPTIONS']['path'] = self.path + '.missing'
+        registry = DictionaryRegistry(self.config)
+        self.assertFalse(registry.load())
+        self.assertFalse(registry.ready)
+        self.assertFalse(registry.status()[1]['loaded'])
+        self.assertIsNotNone(registry.status()[1]['error'])
+
+    def test_custom_list_in_password_strength(self):
+        """Custom lists plug into password_strength without code changes"""
+        self.assertEqual(password_strength('Acme#Vq7Zk2Lx9w!')['score'], 10)
+        with override_settings(GENERATOR_PASSWORD_DICTIONARIES=self.config):
+            data = password_strength('Acme#Vq7Zk2Lx9w!')
+            self.assertIn("Password is found in common passwords list.", data['notes'])
+        self.assertEqual(password_strength('Acme#Vq7Zk2Lx9w!')['score'], 10)
+
+    def test_status_api(self):
+        """Status endpoint reports the loaded dictionaries"""
+        response = APIClient().get(reverse('generator_status_api'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['ready'])
+        self.assertEqual(response.data['dictionaries'][0]['name'], 'ncsc-100k')
+
+    def test_status_api_shared_memory(self):
+        """Status endpoint reports the dictionary structures as shared memory maps"""
+        memory = APIClient().get(reverse('generator_status_api')).data['memory']
+        self.assertTrue(memory['attached'])
+        self.assertEqual(memory['private_bytes'], 0)
+        self.assertEqual(
+            [s['name'] for s in memory['structures']],
+            ['dictionary:ncsc-100k', 'fuzzy-index', 'estimator-automaton'],
+        )
+        for structure in memory['structures']:
+            self.assertTrue(structure['mapped'])
+            self.assertGreater(structure['mapped_bytes'], 0)
+
+    def test_text_provider_private_memory(self):
+        """Text file providers are held privately by each process"""
+        registry = DictionaryRegistry(self.config)
+        registry.load()
+        memory = registry.status()[1]['memory']
+        self.assertFalse(memory['mapped'])
+        self.assertGreater(memory['private_bytes'], 0)
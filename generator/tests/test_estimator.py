@@ -0,0 +1,104 @@
+"""
+Password Guess Estimator Tests
+
+This module contains tests for the pattern matchers and guess estimation
+
+To run test locally: python manage.py test generator.tests
+"""
+
+from django.test import TestCase
+from generator.estimator import MAX_SCORED_LENGTH, Automaton, build_automaton, estimate_guesses, get_automaton
+from generator.passphrase import generate_passphrase
+from generator.utils import generate_password, password_strength
+
+
+class EstimatorTest(TestCase):
+    def patterns(self, password):
+        return [(p['pattern'], p['token']) for p in estimate_guesses(password)['patterns']]
+
+    def test_automaton_built_once(self):
+        """Tests the dictionary automaton is shared by the whole process"""
+        self.assertIs(get_automaton(), get_automaton())
+
+    def test_automaton_mapped(self):
+        """Tests the prebuilt automaton file is memory-mapped instead of copied"""
+        status = get_automaton().memory_status()
+        self.assertTrue(status['mapped'])
+        self.assertGreater(status['mapped_bytes'], 0)
+        self.assertEqual(status['private_bytes'], 0)
+
+    def test_compiled_automaton_matches(self):
+        """Tests a private automaton compiled from words finds overlapping words"""
+        automaton = Automaton(build_automaton({'pass': 2, 'password': 1, 'word': 3}))
+        self.assertFalse(automaton.memory_status()['mapped'])
+        found = {(start, end) for end, start, _ in automaton.matches('xpassword')}
+        self.assertEqual(found, {(1, 4), (1, 8), (5, 8)})
+
+    def test_invalid_automaton(self):
+        """Tests a buffer that is not an automaton is rejected"""
+        with self.assertRaises(ValueError):
+            Automaton(bytes(64))
+
+    def test_dictionary_date_repeat(self):
+        """Tests a capitalised word, year and repeated symbols are all matched"""
+        self.assertEqual(
+            self.patterns('Password2024!!!!'),
+            [('dictionary', 'Password'), ('date', '2024'), ('repeat', '!!!!')],
+        )
+
+    def test_sequence_and_repeat_block(self):
+        """Tests sequences and repeated blocks"""
+        self.assertIn(('sequence', 'lmnopq'), self.patterns('Xlmnopq'))
+        self.assertEqual(self.patterns('xyzxyzxyz'), [('repeat', 'xyzxyzxyz')])
+
+    def test_keyboard_walk(self):
+        """Tests keyboard walks that are not in the dictionary"""
+        self.assertIn(('spatial', 'xcvbnm,./'), self.patterns('Kxcvbnm,./'))
+
+    def test_date_with_separators(self):
+        """Tests day/month/year dates"""
+        self.assertIn(('date', '13/07/1985'), self.patterns('Zq13/07/1985'))
+
+    def test_random_password_entropy(self):
+        """Tests a random password keeps close to its brute force entropy"""
+        result = estimate_guesses('Xk9#mQ2$vL7@pR4!')
+        self.assertGreater(result['entropy_bits'], 90)
+        self.assertEqual(result['guesses_log10'], round(result['entropy_bits'] * 0.30103, 2))
+
+    def test_empty_password(self):
+        """Tests an empty password needs a single guess"""
+        self.assertEqual(estimate_guesses('')['guesses'], 1)
+
+    def test_maximum_length(self):
+        """Tests 128 character inputs are estimated"""
+        result = estimate_guesses(generate_password(128, True, True, True, True))
+        self.assertGreater(result['entropy_bits'], 600)
+
+    def test_long_password_tail_earns_no_credit(self):
+        """Tests only the first MAX_SCORED_LENGTH characters are scored, padding adds nothing"""
+        head = estimate_guesses('x' * MAX_SCORED_LENGTH)
+        self.assertEqual(estimate_guesses('x' * 100000), head)
+        self.assertLess(head['guesses_log10'], 4)
+
+
+class PatternStrengthTest(TestCase):
+    def test_predictable_password(self):
+        """Tests a password built from patterns loses the uniqueness points"""
+        data = password_strength('Password2024!!!!')
+        self.assertEqual(data['strength'], "Weak")
+        self.assertEqual(data['score'], 6)
+        self.assertIn("Password is built from predictable patterns (dictionary, date, repeat).", data['notes'])
+        self.assertLess(data['entropy_bits'], 30)
+
+    def test_random_password(self):
+        """Tests a random password keeps the uniqueness points"""
+        data = password_strength('Xk9#mQ2$vL7@pR4!')
+        self.assertEqual(data['score'], 10)
+        self.assertGreater(data['guesses_log10'], 25)
+
+    def test_generated_passphrases_not_weak(self):
+        """Tests high-entropy passphrases made of dictionary words keep the uniqueness points"""
+        for _ in range(200):
+            passphrase = generate_passphrase()
+            data = password_strength(passphrase)
+            self.assertNotEqual(data['strength'], "Weak", passphrase)
@@ -0,0 +1,56 @@
+"""
+Fuzzy Common Password Matching Tests
+
+This module contains tests for leetspeak normalization and edit distance 1 lookups
+
+To run test locally: python manage.py test generator.tests
+"""
+
+import os
+import tempfile
+from django.test import TestCase
+from generator.fuzzy import FuzzyIndex, close_variant_rank, fuzzy_keys, normalize
+from generator.password_index import write_ranked_index
+from generator.utils import password_strength
+
+
+class FuzzyIndexTest(TestCase):
+    def setUp(self):
+        """Writes a small fuzzy index to a temporary file"""
+        handle, self.path = tempfile.mkstemp(suffix='.idx')
+        os.close(handle)
+        write_ranked_index(self.path, fuzzy_keys(['123456', 'password', 'sunshine', 'abc']))
+        self.index = FuzzyIndex(self.path)
+
+    def tearDown(self):
+        self.index.close()
+        os.remove(self.path)
+
+    def test_normalize(self):
+        """Tests leet characters are replaced after lowercasing"""
+        self.assertEqual(normalize('P@$$w0rD'), 'password')
+
+    def test_edit_distance_one(self):
+        """Tests leetspeak, insertion, deletion and substitution variants"""
+        self.assertEqual(self.index.close_variant_rank('p@ssw0rd'), 2)
+        self.assertEqual(self.index.close_variant_rank('password!'), 2)
+        self.assertEqual(self.index.close_variant_rank('passwrd'), 2)
+        self.assertEqual(self.index.close_variant_rank('sunshime'), 3)
+
+    def test_not_close(self):
+        """Tests distant and short passwords are not matched"""
+        self.assertIsNone(self.index.close_variant_rank('pa55w0rd!!'))
+        self.assertIsNone(self.index.close_variant_rank('moonshine'))
+        self.assertIsNone(self.index.close_variant_rank('abcd'))
+
+    def test_bundled_index(self):
+        """Tests the bundled index catches variants of the most common passwords"""
+        self.assertIsNotNone(close_variant_rank('p@ssw0rd'))
+        self.assertIsNotNone(close_variant_rank('Password1!'))
+        self.assertIsNone(close_variant_rank('Xk9#mQ2$vL7@pR4!'))
+
+    def test_close_variant_in_password_strength(self):
+        """Tests close variants do not get the uniqueness points"""
+        data = password_strength('Password1!')
+        self.assertIn("Password is a close variant of a common password.", data['notes'])
+        self.assertEqual(data['score'], 5)
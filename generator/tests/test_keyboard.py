@@ -0,0 +1,74 @@
+"""
+Keyboard Walk Tests
+
+This module contains tests for keyboard walk detection on the QWERTY, AZERTY and keypad layouts
+
+To run test locally: python manage.py test generator.tests
+"""
+
+from django.test import SimpleTestCase
+from generator.keyboard import AZERTY, KEYPAD, LAYOUTS, QWERTY, KeyboardLayout, WalkScanner, keyboard_walks
+from generator.estimator import estimate_guesses
+from generator.utils import password_strength
+
+
+class KeyboardLayoutTest(SimpleTestCase):
+    def walks(self, password):
+        return [(password[start:end + 1], turns, layout.name) for end, start, turns, layout in keyboard_walks(password)]
+
+    def test_compiled_graphs(self):
+        """Tests the layouts compile to zxcvbn's starting positions and average degrees"""
+        self.assertEqual((QWERTY.starting_positions, round(QWERTY.degree, 2)), (94, 4.6))
+        self.assertEqual((KEYPAD.starting_positions, round(KEYPAD.degree, 2)), (15, 5.07))
+        self.assertEqual(AZERTY.keys, 48)
+
+    def test_merged_tables(self):
+        """Tests the merged pair table flags the layouts on which two keys are adjacent"""
+        scanner = WalkScanner(LAYOUTS)
+        self.assertEqual(len(scanner.pairs), scanner.size ** 2)
+
+        def layouts(a, b):
+            mask = scanner.pairs[scanner.table[ord(a)] * scanner.size + scanner.table[ord(b)]]
+            return [layout.name for bit, layout in enumerate(LAYOUTS) if mask & 1 << bit]
+
+        self.assertEqual(layouts('w', 'e'), ['qwerty'])
+        self.assertEqual(layouts('q', 's'), ['azerty'])
+        self.assertEqual(layouts('8', '5'), ['keypad'])
+        self.assertEqual(layouts('f', 'g'), ['qwerty', 'azerty'])
+        self.assertEqual(layouts('q', 'm'), [])
+
+    def test_walks_per_layout(self):
+        """Tests walks are found on each layout with their number of turns"""
+        walks = self.walks('1qaz2wsx')
+        self.assertIn(('1qaz', 1, 'qwerty'), walks)
+        self.assertIn(('2wsx', 1, 'qwerty'), walks)
+        self.assertIn(('azertyuiop', 1, 'azerty'), self.walks('azertyuiop'))
+        self.assertIn(('7896321', 3, 'keypad'), self.walks('Zq7896321'))
+
+    def test_shifted_and_unknown_characters(self):
+        """Tests shifted keys continue a walk and characters off every layout end it"""
+        self.assertIn(('!QAZ', 1, 'qwerty'), self.walks('!QAZ'))
+        self.assertEqual(self.walks('asüdf中gh'), [])
+
+    def test_duplicate_keys_rejected(self):
+        """Tests a layout with a character on two keys is rejected"""
+        with self.assertRaises(ValueError):
+            KeyboardLayout('broken', [('abca', '', 0)])
+
+    def test_estimator_layouts(self):
+        """Tests walks not in the common list are matched with their layout"""
+        patterns = estimate_guesses('Kwxcvbn,;:!')['patterns']
+        self.assertEqual([(p['pattern'], p['token'], p['layout']) for p in patterns],
+                         [('spatial', 'wxcvbn,;:!', 'azerty')])
+
+    def test_walk_notes(self):
+        """Tests keyboard walks are noted by layout"""
+        data = password_strength('Kx/*-+96321Qr!')
+        self.assertIn("Password contains keyboard walks (keypad).", data['notes'])
+        self.assertNotIn("Password contains keyboard walks", ' '.join(password_strength('Xk9#mQ2$vL7@pR4!')['notes']))
+
+    def test_short_walks_not_noted(self):
+        """Tests short walks, or walks covering little of a long password, are not noted"""
+        for password in ('Xk9#mQ2$vLxcvb7@pR4!Tg', 'Xk9#mQ2$vLxcvbn7@pR4!Tg'):
+            self.assertNotIn("Password contains keyboard walks", ' '.join(password_strength(password)['notes']))
+        self.assertIn("Password contains keyboard walks (qwerty).", password_strength('Xk9#xcvbn7@pR4!')['notes'])
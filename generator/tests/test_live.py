@@ -0,0 +1,119 @@
+"""
+Live Password Strength Tests
+
+This module contains tests for incremental strength scoring and the strength WebSocket
+
+To run test locally: python manage.py test generator.tests
+"""
+
+import json
+import time
+from unittest.mock import patch
+from asgiref.testing import ApplicationCommunicator
+from django.test import SimpleTestCase, override_settings
+from generator.live import LIVE_STRENGTH_PATH, LiveStrengthScorer, websocket_router
+from generator.utils import password_strength
+
+
+async def _http_application(scope, receive, send):
+    raise AssertionError("WebSocket scopes must not reach the HTTP application")
+
+
+class LiveStrengthScorerTest(SimpleTestCase):
+    def test_typing_matches_full_scoring(self):
+        """Every keystroke scores the same as password_strength and reuses the previous prefix"""
+        scorer = LiveStrengthScorer()
+        password = 'Password2024!!!!x'
+        for i in range(1, len(password) + 1):
+            self.assertEqual(scorer.update(password[:i]), password_strength(password[:i]))
+            self.assertEqual(scorer.reused, i - 1)
+
+    def test_edits_match_full_scoring(self):
+        """Deletions, edits in the middle and pastes score the same as password_strength"""
+        scorer = LiveStrengthScorer()
+        for password in ('qwerty123', 'qwerty12', 'qwXrty12', 'Xk9#mQ2$vL7@pR4!', 'password', 'p', ''):
+            self.assertEqual(scorer.update(password), password_strength(password))
+        self.assertEqual(scorer.counts, [0, 0, 0, 0, 0])
+        self.assertEqual(scorer.dictionary, [])
+
+    def test_dictionary_matches_resume(self):
+        """Dictionary matches spanning the edit point are rescanned, earlier ones are kept"""
+        scorer = LiveStrengthScorer()
+        scorer.update('xxpass')
+        kept = [match for match in scorer.dictionary if match[0] < 4]
+        scorer.update('xxpassword')
+        self.assertEqual(scorer.reused, 6)
+        self.assertEqual(scorer.dictionary[:len(kept)], kept)
+        self.assertIn((9, 2), [(end, start) for end, start, _, _ in scorer.dictionary])
+
+
+class StrengthWebSocketTest(SimpleTestCase):
+    async def connect(self, path=LIVE_STRENGTH_PATH, headers=()):
+        scope = {'type': 'websocket', 'path': path, 'headers': list(headers)}
+        communicator = ApplicationCommunicator(websocket_router(_http_application), scope)
+        await communicator.send_input({'type': 'websocket.connect'})
+        return communicator, await communicator.receive_output()
+
+    async def test_scores_messages(self):
+        """Each message is scored and its id echoed back"""
+        communicator, message = await self.connect()
+        self.assertEqual(message['type'], 'websocket.accept')
+        for i, password in enumerate(('Pass', 'Password', 'Password1'), start=1):
+            await communicator.send_input({
+                'type': 'websocket.receive', 'text': json.dumps({'id': i, 'password': password}),
+            })
+            reply = json.loads((await communicator.receive_output())['text'])
+            self.assertEqual(reply, {'id': i, **password_strength(password)})
+        await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await communicator.wait()
+
+    async def test_scoring_does_not_block_other_sockets(self):
+        """A slow score on one socket leaves the event loop free for other connections"""
+        update = LiveStrengthScorer.update
+
+        def slow_update(scorer, password):
+            time.sleep(0.5)
+            return update(scorer, password)
+
+        with patch.object(LiveStrengthScorer, 'update', slow_update):
+            slow, _ = await self.connect()
+            await slow.send_input({'type': 'websocket.receive', 'text': json.dumps({'password': 'Password1'})})
+            start = time.perf_counter()
+            other, message = await self.connect()
+            self.assertEqual(message['type'], 'websocket.accept')
+            self.assertLess(time.perf_counter() - start, 0.25)
+            reply = json.loads((await slow.receive_output(timeout=2))['text'])
+            self.assertEqual(reply, password_strength('Password1'))
+        for communicator in (slow, other):
+            await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+            await communicator.wait()
+
+    async def test_invalid_messages(self):
+        """Invalid messages get an error reply and the connection stays open"""
+        communicator, _ = await self.connect()
+        for text, error in (
+            ('not json', 'Message must be a JSON object.'),
+            (json.dumps({'password': ''}), 'Password is required. Please provide a password to analyze.'),
+            (json.dumps({'password': 'x' * 129}), 'Password must be at most 128 characters.'),
+        ):
+            await communicator.send_input({'type': 'websocket.receive', 'text': text})
+            reply = json.loads((await communicator.receive_output())['text'])
+            self.assertEqual(reply, {'error': error})
+        await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await communicator.wait()
+
+    @override_settings(CORS_ALLOW_ALL_ORIGINS=False, CORS_ALLOWED_ORIGINS=['https://app.example.com'],
+                       ALLOWED_HOSTS=['localhost'])
+    async def test_origin_check(self):
+        """Browser handshakes from other origins are rejected"""
+        _, message = await self.connect(headers=[(b'origin', b'https://evil.example.net')])
+        self.assertEqual(message['type'], 'websocket.close')
+        _, message = await self.connect(headers=[(b'origin', b'https://app.example.com')])
+        self.assertEqual(message['type'], 'websocket.accept')
+        _, message = await self.connect(headers=[(b'origin', b'http://localhost:5173')])
+        self.assertEqual(message['type'], 'websocket.accept')
+
+    async def test_unknown_path(self):
+        """WebSockets on other paths are rejected"""
+        _, message = await self.connect(path='/generator/ws/unknown/')
+        self.assertEqual(message, {'type': 'websocket.close', 'code': 4004})
@@ -0,0 +1,65 @@
+"""
+Passphrase Generator Tests
+
+This module contains tests for the packed wordlist and diceware-style passphrase generation
+
+To run test locally: python manage.py test generator.tests
+"""
+
+from collections import Counter
+from django.test import TestCase
+from generator.dictionaries import password_dictionaries
+from generator.entropy import BulkEntropy
+from generator.passphrase import PackedWordlist, generate_passphrase, generate_passphrases, get_wordlist
+
+
+class PackedWordlistTest(TestCase):
+    def test_packed_words(self):
+        """Tests words are sliced back out of the packed string"""
+        wordlist = PackedWordlist(['alpha', 'be', 'gamma'])
+        self.assertEqual(len(wordlist), 3)
+        self.assertEqual([wordlist[i] for i in range(3)], ['alpha', 'be', 'gamma'])
+        self.assertEqual(wordlist.data, 'alphabegamma')
+
+    def test_bundled_wordlist(self):
+        """Tests the bundled wordlist has one word per diceware roll of five dice"""
+        wordlist = get_wordlist()
+        self.assertEqual(len(wordlist), 7776)
+        self.assertEqual(len({wordlist[i] for i in range(len(wordlist))}), 7776)
+
+    def test_bundled_wordlist_avoids_common_passwords(self):
+        """Tests no bundled word is among the most used passwords attackers try first"""
+        wordlist = get_wordlist()
+        ranks = (password_dictionaries.rank(wordlist[i]) for i in range(len(wordlist)))
+        self.assertFalse([rank for rank in ranks if rank is not None and rank <= 1000])
+
+
+class PassphraseGeneratorTest(TestCase):
+    def test_default_passphrase(self):
+        """Tests the default passphrase has six lowercase words separated by dashes"""
+        words = generate_passphrase().split('-')
+        self.assertEqual(len(words), 6)
+        self.assertTrue(all(word.isalpha() and word.islower() for word in words))
+
+    def test_passphrase_options(self):
+        """Tests separator, capitalization and the optional digit"""
+        for passphrase in generate_passphrases(50, words=4, separator=' ', capitalize=True, include_number=True):
+            words = passphrase.split(' ')
+            self.assertEqual(len(words), 4)
+            self.assertTrue(all(word[0].isupper() for word in words))
+            self.assertEqual(sum(c.isdigit() for c in passphrase), 1)
+
+    def test_batch(self):
+        """Tests batch generation returns distinct passphrases"""
+        passphrases = generate_passphrases(1000)
+        self.assertEqual(len(passphrases), 1000)
+        self.assertEqual(len(set(passphrases)), 1000)
+        self.assertEqual(generate_passphrases(0), [])
+
+    def test_randbelow_many_unbiased(self):
+        """Tests bulk indices stay in range and cover the range evenly"""
+        values = BulkEntropy().randbelow_many(6, 60000)
+        self.assertEqual(len(values), 60000)
+        counts = Counter(values)
+        self.assertEqual(set(counts), set(range(6)))
+        self.assertTrue(all(9000 < count < 11000 for count in counts.values()))
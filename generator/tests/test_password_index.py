@@ -0,0 +1,59 @@
+"""
+Common Password Index Tests
+
+This module contains tests for the memory-mapped common password index
+
+To run test locally: python manage.py test generator.tests
+"""
+
+import os
+import tempfile
+from django.test import TestCase
+from generator.password_index import COMMON_PASSWORDS, PasswordIndex, write_index
+
+
+class PasswordIndexTest(TestCase):
+    def setUp(self):
+        """Writes a small index to a temporary file"""
+        handle, self.path = tempfile.mkstemp(suffix='.idx')
+        os.close(handle)
+        write_index(self.path, ['123456', 'password', 'qwerty', 'password'])
+        self.index = PasswordIndex(self.path)
+
+    def tearDown(self):
+        self.index.close()
+        os.remove(self.path)
+
+    def test_membership(self):
+        """Listed passwords are found and unlisted passwords are not"""
+        self.assertIn('qwerty', self.index)
+        self.assertNotIn('Qwerty', self.index)
+        self.assertEqual(len(self.index), 3)
+
+    def test_rank_uses_first_occurrence(self):
+        """Rank follows list order and duplicates keep their best rank"""
+        self.assertEqual(self.index.rank('123456'), 1)
+        self.assertEqual(self.index.rank('password'), 2)
+        self.assertEqual(self.index.rank('qwerty'), 3)
+        self.assertIsNone(self.index.rank('not-in-the-list'))
+
+    def test_missing_file(self):
+        """A missing index file raises FileNotFoundError on first lookup"""
+        index = PasswordIndex(self.path + '.missing')
+        with self.assertRaises(FileNotFoundError):
+            index.rank('password')
+
+    def test_invalid_file(self):
+        """A file with a bad header is rejected"""
+        with open(self.path, 'wb') as f:
+            f.write(b'not an index' * 10)
+        index = PasswordIndex(self.path)
+        with self.assertRaises(ValueError):
+            index.rank('password')
+
+    def test_bundled_index(self):
+        """The bundled NCSC index keeps the list's frequency order"""
+        self.assertEqual(COMMON_PASSWORDS.rank('123456'), 1)
+        self.assertEqual(COMMON_PASSWORDS.rank('qwerty'), 3)
+        self.assertIn('crossroad', COMMON_PASSWORDS)
+        self.assertEqual(len(COMMON_PASSWORDS), 96507)
@@ -0,0 +1,72 @@
+"""
+Password Policy Tests
+
+This module contains tests for compiled password policies and policy generation
+
+To run test locally: python manage.py test generator.tests
+"""
+
+import string
+from django.test import TestCase, override_settings
+from generator.policy import AMBIGUOUS_CHARACTERS, compile_policy, get_policy
+
+
+class PasswordPolicyTest(TestCase):
+    def test_policy_cached(self):
+        """Tests identical options reuse one compiled policy"""
+        first = compile_policy(length=12, uppercase=True, numbers=True)
+        self.assertIs(first, compile_policy(numbers=True, uppercase=True, length=12))
+        self.assertEqual(first.pool, string.ascii_uppercase + string.digits)
+
+    def test_minimum_counts(self):
+        """Tests every password has at least the minimum count of each class"""
+        policy = compile_policy(length=10, min_uppercase=3, min_numbers=4, lowercase=True)
+        for password in policy.generate(200):
+            self.assertEqual(len(password), 10)
+            self.assertGreaterEqual(sum(c.isupper() for c in password), 3)
+            self.assertGreaterEqual(sum(c.isdigit() for c in password), 4)
+            self.assertGreaterEqual(sum(c.islower() for c in password), 1)
+
+    def test_exact_minimum_counts(self):
+        """Tests minimum counts that fill the whole length are placed constructively"""
+        password = compile_policy(length=4, min_uppercase=2, min_numbers=2).generate()[0]
+        self.assertEqual(sorted(c.isdigit() for c in password), [False, False, True, True])
+
+    def test_exclude_ambiguous_and_symbols(self):
+        """Tests ambiguous characters are excluded and custom symbols replace punctuation"""
+        policy = compile_policy(length=40, uppercase=True, numbers=True, special=True,
+                                exclude_ambiguous=True, symbols='#-')
+        self.assertFalse(set(policy.pool) & set(AMBIGUOUS_CHARACTERS))
+        for password in policy.generate(50):
+            self.assertTrue(set(password) <= set(policy.pool))
+            self.assertTrue(set(password) & {'#', '-'})
+
+    def test_satisfied_by(self):
+        """Tests passwords are checked against the length, pool and minimum counts of a policy"""
+        policy = compile_policy(length=8, min_uppercase=2, numbers=True, exclude_ambiguous=True)
+        self.assertTrue(all(policy.satisfied_by(password) for password in policy.generate(100)))
+        self.assertTrue(policy.satisfied_by('AB234567'))
+        self.assertFalse(policy.satisfied_by('A2345678'))  # One uppercase letter
+        self.assertFalse(policy.satisfied_by('AB034567'))  # Ambiguous zero
+        self.assertFalse(policy.satisfied_by('AB23456x'))  # Lowercase not selected
+        self.assertFalse(policy.satisfied_by('AB2345'))
+
+    def test_invalid_policies(self):
+        """Tests impossible policies are rejected when compiled"""
+        with self.assertRaises(ValueError):
+            compile_policy(length=8)
+        with self.assertRaises(ValueError):
+            compile_policy(length=4, min_uppercase=3, min_numbers=3)
+        with self.assertRaises(ValueError):
+            compile_policy(length=8, special=True, symbols='ab')
+        with self.assertRaises(ValueError):
+            compile_policy(length=8, special=True, symbols='|', exclude_ambiguous=True)
+        with self.assertRaises(ValueError):
+            compile_policy(length=8, lowercase=True, colour='red')
+
+    @override_settings(GENERATOR_PASSWORD_POLICIES={'pin': {'length': 6, 'numbers': True}})
+    def test_named_policy(self):
+        """Tests named policies are read from settings"""
+        self.assertTrue(get_policy('pin').generate()[0].isdigit())
+        with self.assertRaises(KeyError):
+            get_policy('missing')
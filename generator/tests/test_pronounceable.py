@@ -0,0 +1,76 @@
+"""
+Pronounceable Password Tests
+
+This module contains tests for the Markov model and the pronounceable generation mode
+
+To run test locally: python manage.py test generator.tests
+"""
+
+import math
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from generator.pronounceable import (
+    MODEL_TOTAL, MarkovModel, _quantize, build_model, generate_pronounceable, get_model, pronounceable_entropy,
+)
+
+
+class MarkovModelTest(TestCase):
+    def test_quantize(self):
+        """Tests counts are scaled to the total without dropping rare letters"""
+        quantized = _quantize([1, 0, 100000, 3], MODEL_TOTAL)
+        self.assertEqual(sum(quantized), MODEL_TOTAL)
+        self.assertEqual(quantized[1], 0)
+        self.assertGreaterEqual(quantized[0], 1)
+
+    def test_backoff_and_entropy(self):
+        """Tests transitions never seen in training back off and the surprisal is exact"""
+        model = MarkovModel(build_model(['ab']))
+        self.assertEqual(model.entropy('ab'), 0)
+        # "ab" is never continued in training, so the next letter backs off to letter frequencies
+        self.assertEqual(model.entropy('abab'), 1)
+        self.assertEqual(model.entropy('aa'), math.inf)
+        self.assertEqual(model.entropy('abc'), math.inf)
+
+    def test_invalid_model(self):
+        """Tests a truncated model file is rejected"""
+        with self.assertRaises(ValueError):
+            MarkovModel(build_model(['ab'])[:-4])
+
+
+class PronounceableGeneratorTest(TestCase):
+    def test_generate_batch(self):
+        """Tests length, options and the entropy reported for every password"""
+        generated = generate_pronounceable(200, 16, capitalize=True, include_number=True)
+        self.assertEqual(len(generated), 200)
+        alphabet = get_model().alphabet
+        for password, bits in generated:
+            self.assertEqual(len(password), 16)
+            self.assertTrue(password[0].isupper())
+            self.assertTrue(password[-1].isdigit())
+            self.assertTrue(set(password[1:-1]) <= set(alphabet))
+            self.assertAlmostEqual(bits, pronounceable_entropy(password))
+            self.assertGreater(bits, 20)
+
+    def test_empty_batch(self):
+        """Tests no passwords are generated when no letters fit"""
+        self.assertEqual(generate_pronounceable(0, 16), [])
+        self.assertEqual(generate_pronounceable(5, 1, include_number=True), [])
+
+    def test_api_reports_entropy(self):
+        """Tests the generator endpoint reports the entropy of pronounceable passwords"""
+        url = reverse('password_generator_api')
+        response = APIClient().post(url, {'mode': 'pronounceable', 'length': 12}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['password']), 12)
+        self.assertEqual(response.data['entropy_bits'], round(pronounceable_entropy(response.data['password']), 2))
+
+        response = APIClient().post(url, {'mode': 'pronounceable', 'count': 3}, format='json')
+        self.assertEqual(len(response.data['passwords']), 3)
+        self.assertEqual(len(response.data['entropy_bits']), 3)
+
+    def test_api_invalid_mode(self):
+        """Tests unknown modes are rejected"""
+        response = APIClient().post(reverse('password_generator_api'), {'mode': 'random'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], "Invalid mode. Choose password, passphrase or pronounceable.")
@@ -9,8 +9,11 @@ References:
 To run test locally: python manage.py test generator.tests
 """
 
+import string
+from collections import Counter
 from django.test import TestCase
-from generator.utils import generate_password, password_strength, SPECIAL_CHAR
+from generator.entropy import BulkEntropy
+from generator.utils import generate_password, generate_passwords, password_strength, SPECIAL_CHAR
 
 
 class PasswordGeneratorTest(TestCase):
@@ -36,6 +39,13 @@ class PasswordGeneratorTest(TestCase):
         password = generate_password(length=7, uppercase=True)
         self.assertEqual(len(password), 7)
 
+    def test_length_below_selected_types(self):
+        """Generates one character of every selected type when the length is shorter"""
+        password = generate_password(length=2, uppercase=True, lowercase=True, numbers=True, special=True)
+        self.assertEqual(len(password), 4)
+        for alphabet in (string.ascii_uppercase, string.ascii_lowercase, string.digits, string.punctuation):
+            self.assertTrue(any(c in alphabet for c in password))
+
     def test_includes_symbols(self):
         """Generates password including special characters"""
         password = generate_password(length=17, special=True)
@@ -43,6 +53,47 @@ class PasswordGeneratorTest(TestCase):
         self.assertEqual(len(password), 17)
 
 
+class BatchPasswordGeneratorTest(TestCase):
+    def test_batch_count_and_length(self):
+        """Generates a batch of passwords with the requested count and length"""
+        passwords = generate_passwords(50, length=12, uppercase=True, numbers=True)
+        self.assertEqual(len(passwords), 50)
+        for password in passwords:
+            self.assertEqual(len(password), 12)
+            self.assertTrue(any(c in string.ascii_uppercase for c in password))
+            self.assertTrue(any(c in string.digits for c in password))
+            self.assertTrue(all(c in string.ascii_uppercase + string.digits for c in password))
+
+    def test_batch_no_options(self):
+        """Returns an empty batch when no character type is selected"""
+        self.assertEqual(generate_passwords(5), [])
+
+    def test_required_characters_positions(self):
+        """Required characters are not always placed at the start of the password"""
+        passwords = generate_passwords(200, length=8, lowercase=True, special=True)
+        first_chars = {password[0] for password in passwords}
+        self.assertTrue(any(c in string.ascii_lowercase for c in first_chars))
+        self.assertTrue(any(c in string.punctuation for c in first_chars))
+
+
+class BulkEntropyTest(TestCase):
+    def test_randbelow_range(self):
+        """randbelow stays in range for small and multi-byte bounds"""
+        entropy = BulkEntropy(buffer_size=64)
+        for bound in (1, 7, 256, 7776, 100000):
+            values = [entropy.randbelow(bound) for _ in range(200)]
+            self.assertTrue(all(0 <= value < bound for value in values))
+
+    def test_choices_is_roughly_uniform(self):
+        """Every pool character is drawn with roughly equal frequency"""
+        entropy = BulkEntropy()
+        alphabet = string.digits + string.punctuation  # 42 characters, not a divisor of 256
+        counts = Counter(entropy.choices(alphabet, 42000))
+        self.assertEqual(set(counts), set(alphabet))
+        for count in counts.values():
+            self.assertTrue(700 < count < 1300)
+
+
 class PasswordStrengthTest(TestCase):
     def test_strong_password(self):
         """Tests a strong password"""
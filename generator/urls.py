@@ -1,8 +1,18 @@
 from django.urls import path
-from .views import PasswordGeneratorHTMLView, PasswordGeneratorAPIView, PasswordStrengthAPIView
+from .views import (
+    PasswordGeneratorHTMLView,
+    PasswordGeneratorAPIView,
+    PasswordStrengthAPIView,
+    PasswordStrengthBatchAPIView,
+    GeneratorStatusAPIView,
+    BreachRangeAPIView,
+)
 
 urlpatterns = [
     path('', PasswordGeneratorHTMLView.as_view(), name='password_generator'),
     path('api/generate-password/', PasswordGeneratorAPIView.as_view(), name='password_generator_api'),
     path('api/check-strength/', PasswordStrengthAPIView.as_view(), name='password_strength_api'),
+    path('api/check-strength/batch/', PasswordStrengthBatchAPIView.as_view(), name='password_strength_batch_api'),
+    path('api/range/<str:prefix>/', BreachRangeAPIView.as_view(), name='breach_range_api'),
+    path('api/status/', GeneratorStatusAPIView.as_view(), name='generator_status_api'),
 ]
@@ -5,8 +5,11 @@ Features of Password Generator:
 - User selections includes uppercase, lowercase, numbers, and/or special characters
 - Default password length is 15 characters if length not specified by user (NIST recommended)
 - Ensures at least one character type is included in password IF selected
-- Uses secrets module for a password that is more cryptographically secure
-- Shuffles the password for additional unpredicability with secrets SystemRandom shuffle
+- Uses a bulk os.urandom buffer (see entropy.py) for a password that is cryptographically secure
+- Places required characters at random positions for additional unpredicability
+- Options are compiled into cached password policies (see policy.py), which also support
+  minimum counts, excluded ambiguous characters and custom symbols
+- Generates batches of passwords from one entropy buffer with generate_passwords
 
 Password Strength Calculator: Calculates strength of password based on length, character types,
 and uniqueness against a common passwords list.
@@ -16,58 +19,70 @@ Features of Password Strength Calculator:
 - Scoring system:
     - Length: 1 point for 8+ characters, additional 1 point for 15+ characters
     - Character Types: 1 point each for uppercase, lowercase, numbers, special characters
-    - Uniqueness: 4 points if not found in common passwords list.
+    - Uniqueness: 4 points if not found in common passwords list (or the breach corpus, if configured)
+      and not built from predictable patterns (see estimator.py).
+      Close variants of common passwords ("p@ssw0rd", "password1!") do not count as unique (see fuzzy.py).
+      Keyboard walks on QWERTY, AZERTY and keypad layouts are predictable patterns (see keyboard.py).
+- Reports the estimated guesses (log10) and entropy bits of the password, bounded by its
+  rank in the common passwords list, and crack times per attacker model (see crack_time.py)
+- Character types are counted with one byte lookup table pass (see charclasses.py)
 - Provides notes on how to improve password strength
+- Scores batches of passwords in one call with password_strength_batch
+- Dictionary structures (common password index, fuzzy index, estimator automaton) are
+  memory-mapped files shared by every worker, see dictionary_memory_status
 
 References:
 - NIST Password Guidelines: https://sprinto.com/blog/nist-password-guidelines/
-- Secrets Module: https://docs.python.org/3/library/secrets.html
+- os.urandom: https://docs.python.org/3/library/os.html#os.urandom
 - 100k Most Common Passwords:
     - https://github.com/danielmiessler/SecLists/tree/master/Passwords
+    - Stored as a memory-mapped binary index, see password_index.py
+    - Loaded through the dictionary providers in dictionaries.py
 """
 
-import secrets
-import string
-from django.conf import settings
-import os
-from generator.misc.common_passwords import COMMON_PASSWORDS
+import math
+from generator.policy import compile_policy
+from generator.breach import breached_count
+from generator.dictionaries import password_dictionaries
+from generator.crack_time import crack_times, guesses_log10
+from generator.fuzzy import FUZZY_PASSWORDS, close_variant_rank
+from generator.charclasses import character_counts, pool_cardinality
+from generator.estimator import estimate_guesses, get_automaton
 SPECIAL_CHAR = set('!@#$%^&*()-_=+[]{}|;:,.<>?/~')
+# Keyboard walks are reported in the notes when the longest has this many keys or more and
+# the walks cover this share of the password (short walks occur by chance in random passwords)
+MIN_WALK_NOTE_LENGTH = 5
+MIN_WALK_NOTE_SHARE = 0.25
+# Passwords whose patterns cut the brute force entropy by more than half are predictable
+# below this many guesses (log10), the level at which an offline attack on a slow hash
+# becomes impractical
+PREDICTABLE_GUESSES_LOG10 = 10
+
+
+def generate_passwords(count=1, length=15, uppercase=False, lowercase=False, numbers=False, special=False):
+    """Generate a batch of secure passwords based on user defined criteria.
+    The options are compiled once into a cached PasswordPolicy (see policy.py), which draws
+    all characters for the batch from one bulk entropy buffer and places one character of
+    every selected type at a random position. A length below the number of selected types
+    still yields one character of every selected type, as the original generator did.
+    Returns: List of passwords (empty if no character type is selected)"""
+    selected = [uppercase is True, lowercase is True, numbers is True, special is True]
+    if count < 1 or not any(selected):
+        return []
+    policy = compile_policy(
+        length=max(length, sum(selected)), uppercase=selected[0], lowercase=selected[1],
+        numbers=selected[2], special=selected[3],
+    )
+    return policy.generate(count)
 
 
 def generate_password(length=15, uppercase=False, lowercase=False, numbers=False, special=False):
     """Generate a secure password based on user defined criteria.
     Default length is 15 characters per NIST guidelines"""
-    password = []
-    pool = ''
-
-    # Ensure add least one character type is included in password if selected
-    # Create pool of characters to choose from
-    if uppercase is True:
-        password.append(secrets.choice(string.ascii_uppercase))
-        pool += string.ascii_uppercase
-    if lowercase is True:
-        password.append(secrets.choice(string.ascii_lowercase))
-        pool += string.ascii_lowercase
-    if numbers is True:
-        password.append(secrets.choice(string.digits))
-        pool += string.digits
-    if special is True:
-        password.append(secrets.choice(string.punctuation))
-        pool += string.punctuation
-
-    # Check pool is not empty
-    if len(pool) != 0:
-        length_left = length - len(password)
-        # Generate remaining password using secrets
-        for _ in range(length_left):
-            password.append(secrets.choice(pool))
-        # Shuffle password to ensure randomness
-        secrets.SystemRandom().shuffle(password)
-        password = ''.join(password)
-    else:
-        password = 'Check at least one option!'
-
-    return password
+    passwords = generate_passwords(1, length, uppercase, lowercase, numbers, special)
+    if not passwords:
+        return 'Check at least one option!'
+    return passwords[0]
 
 
 def password_strength(password):
@@ -76,22 +91,17 @@ def password_strength(password):
     Returns: Score, strength, and notes on how to improve password strength in dictionary format"""
     if not password:
         return "No password provided."
+    return _strength_result(password, character_counts(password), estimate_guesses(password))
+
+
+def _strength_result(password, counts, estimate):
+    """Scores a password from its character class counts (see charclasses.py) and its guess
+    estimate, shared by password_strength and live scoring (see live.py).
+    Returns: Score, strength, and notes on how to improve password strength in dictionary format"""
     score = 0
     strength = None
     notes = []
     length = len(password)
-    contains_upper, contains_lower = False, False
-    contains_number, contains_special = False, False
-
-    for c in password:
-        if c in string.ascii_uppercase:
-            contains_upper = True
-        elif c in string.ascii_lowercase:
-            contains_lower = True
-        elif c in string.digits:
-            contains_number = True
-        elif c in string.punctuation:
-            contains_special = True
 
     # Scoring system for length and character types
     if length >= 8:
@@ -102,34 +112,50 @@ def password_strength(password):
         score += 1
     else:
         notes.append("NIST recommends 15 characters to increase password strength.")
-    if contains_upper:
+    if counts.uppercase:
         score += 1
     else:
         notes.append("Password does not contain uppercase letters.")
-    if contains_lower:
+    if counts.lowercase:
         score += 1
     else:
         notes.append("Password does not contain lowercase letters.")
-    if contains_number:
+    if counts.numbers:
         score += 1
     else:
         notes.append("Password does not contain numbers.")
-    if contains_special:
+    if counts.special:
         score += 1
     else:
         notes.append("Password does not contain special characters.")
 
-    # Check uniquess against common passwords list
-    file = os.path.join(settings.BASE_DIR, 'generator', 'misc', 'common_passwords.py')
+    # Check uniquess against the common passwords dictionaries (loaded at app ready)
+    common_rank = password_dictionaries.rank(password)
+    variant_rank = close_variant_rank(password) if common_rank is None else None
+    bruteforce_bits = length * math.log2(pool_cardinality(counts))
+    predictable = (
+        estimate['entropy_bits'] < bruteforce_bits / 2 and estimate['guesses_log10'] < PREDICTABLE_GUESSES_LOG10
+    )
 
-    if not os.path.exists(file):
-        raise FileNotFoundError(f"Common passwords file not found at: {file}")
-
-    if password in COMMON_PASSWORDS:
+    if common_rank is not None:
         notes.append("Password is found in common passwords list.")
+    elif variant_rank is not None:
+        notes.append("Password is a close variant of a common password.")
+    elif breached_count(password):
+        notes.append("Password is found in known data breaches.")
+    elif predictable:
+        found = ', '.join(dict.fromkeys(pattern['pattern'] for pattern in estimate['patterns']))
+        notes.append(f"Password is built from predictable patterns ({found}).")
     else:
         score += 4
 
+    # Keyboard walks (qwerty, azerty, keypad) are named by layout, never by the walked keys
+    walks = [pattern for pattern in estimate['patterns'] if pattern['pattern'] == 'spatial']
+    walk_lengths = [len(pattern['token']) for pattern in walks]
+    if walks and max(walk_lengths) >= MIN_WALK_NOTE_LENGTH and sum(walk_lengths) >= length * MIN_WALK_NOTE_SHARE:
+        layouts = dict.fromkeys(pattern['layout'] for pattern in walks)
+        notes.append(f"Password contains keyboard walks ({', '.join(layouts)}).")
+
     # Total score
     if score == 10:
         strength = "Strong"
@@ -138,10 +164,42 @@ def password_strength(password):
     else:
         strength = "Weak"
 
+    # Guesses to crack are bounded by the rank of the whole password, or the common password
+    # it is a close variant of, in the common lists
+    guesses = guesses_log10(estimate, common_rank, variant_rank)
     data = {
         "score": score,
         "strength": strength,
-        "notes": notes
+        "notes": notes,
+        "guesses_log10": guesses,
+        "entropy_bits": round(guesses / math.log10(2), 2),
+        "crack_times": crack_times(guesses),
     }
 
     return data
+
+
+def password_strength_batch(passwords):
+    """Calculates the strength of each password in a batch.
+    All passwords share the already loaded common passwords dictionaries.
+    Returns: List of strength results in the same order as the input"""
+    return [password_strength(password) for password in passwords]
+
+
+def dictionary_memory_status():
+    """Reports which password dictionary structures are attached as shared memory maps.
+    Mapped bytes are shared by every worker process through the OS page cache, private bytes
+    are held separately by each process.
+    Returns: Attachment flag, byte totals and per-structure memory status in dictionary format"""
+    structures = [
+        dict(name=f'dictionary:{provider.name}', shared=provider.shared, **provider.memory_status())
+        for provider in password_dictionaries.providers
+    ]
+    structures.append(dict(name='fuzzy-index', shared=True, **FUZZY_PASSWORDS.memory_status()))
+    structures.append(dict(name='estimator-automaton', shared=True, **get_automaton().memory_status()))
+    return {
+        'attached': all(structure['mapped'] for structure in structures if structure['shared']),
+        'mapped_bytes': sum(structure['mapped_bytes'] for structure in structures),
+        'private_bytes': sum(structure['private_bytes'] for structure in structures),
+        'structures': structures,
+    }
@@ -7,6 +7,15 @@ secure password based on criteria defined by the user.
 It also calculates the strength of the password based on the criteria defined by the user.
 
 It can be generated for HTML form submission or as a REST API endpoint.
+The API endpoint can also generate a batch of passwords per request with the count option,
+diceware-style passphrases with mode set to passphrase, and pronounceable passwords with mode
+set to pronounceable (reported with their entropy in bits). With stream set, large counts are
+streamed as NDJSON lines ({"password": ...}) chunk by chunk instead of one JSON list.
+Passwords can follow a named or inline password policy (see policy.py) instead of the flat options.
+The status endpoint reports the load status and size of the common password dictionaries
+and breach corpus, including Bloom filter hit and miss counters, and whether the shared
+dictionary memory maps are attached.
+The range endpoint serves k-anonymity breach lookups by SHA-1 hash prefix from a local corpus.
 
 ** GenAI Citation for Becky: **
 Portions of this code related to error handling for the API endpoints were generated with
@@ -18,14 +27,73 @@ References:
 - HTML render: https://www.geeksforgeeks.org/python/how-to-render-data-in-django/
 """
 from django.shortcuts import render
-from .utils import generate_password, password_strength
-from .serializers import PasswordOptionsSerializer
+from .utils import (
+    dictionary_memory_status, generate_password, generate_passwords, password_strength, password_strength_batch,
+)
+from .passphrase import generate_passphrases
+from .pronounceable import generate_pronounceable
+from .policy import get_policy
+from .serializers import PasswordOptionsSerializer, PasswordStrengthBatchSerializer
+from .dictionaries import password_dictionaries
+from .estimator import MAX_SCORED_LENGTH
+from .breach import breach_status, get_breach_corpus, is_valid_prefix
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from django.views import View
+from django.http import HttpResponse, StreamingHttpResponse
+from .bulk import iter_chunks
+
+
+def _first_error(detail):
+    """Returns the first error message from nested DRF serializer errors"""
+    if isinstance(detail, dict):
+        if 'non_field_errors' in detail:
+            return _first_error(detail['non_field_errors'])
+        detail = list(detail.values())
+    if isinstance(detail, list):
+        return _first_error(detail[0]) if detail else None
+    return str(detail)
+
+
+def _password_generator(opts):
+    """Returns a function generating n passwords for validated PasswordOptionsSerializer data,
+    (password, entropy bits) pairs in pronounceable mode"""
+    if opts['mode'] == 'passphrase':
+        return lambda n: generate_passphrases(
+            n, opts['words'], opts['separator'], opts['capitalize'], opts['include_number']
+        )
+    if opts['mode'] == 'pronounceable':
+        return lambda n: generate_pronounceable(n, opts['length'], opts['capitalize'], opts['include_number'])
+    if 'policy' in opts:
+        return opts['policy'].generate
+    return lambda n: generate_passwords(
+        n, opts['length'], opts['uppercase'], opts['lowercase'], opts['numbers'], opts['special']
+    )
+
+
+def _generated_passwords_data(opts, passwords):
+    """Returns the response body for generated passwords, pronounceable passwords include
+    the entropy in bits reported by the generator (see pronounceable.py)"""
+    single = opts['count'] == 1
+    bits = None
+    if opts['mode'] == 'pronounceable':
+        bits = [round(entropy, 2) for _, entropy in passwords]
+        passwords = [password for password, _ in passwords]
+    data = {'password': passwords[0]} if single else {'passwords': passwords}
+    if bits is not None:
+        data['entropy_bits'] = bits[0] if single else bits
+    return data
+
+
+def _validation_error_response(e):
+    """Normalize DRF serializer errors to simple {'error': 'message'} format"""
+    return Response(
+        {'error': _first_error(e.detail) or 'Validation error occurred'},
+        status=status.HTTP_400_BAD_REQUEST
+    )
 
 
 class PasswordGeneratorHTMLView(View):
@@ -38,6 +106,18 @@ class PasswordGeneratorHTMLView(View):
     def post(self, request):
         """Generates secure password based on user criteria and handles form submission.
         Returns: Generated password to HTML template"""
+        # A named policy replaces the individual options
+        policy_name = request.POST.get('policy')
+        if policy_name:
+            try:
+                policy = get_policy(policy_name)
+            except KeyError:
+                return render(request, 'generator/generator.html', {'error': 'Unknown password policy.'})
+            return render(request, 'generator/generator.html', {
+                'password': policy.generate()[0],
+                'length': policy.length,
+            })
+
         # Save user selections in variables
         try:
             length = int(request.POST.get('length', 15))
@@ -72,38 +152,31 @@ class PasswordGeneratorAPIView(APIView):
 
     def post(self, request):
         """REST API endpoint for generating secure password
-        Returns: Generated password or error message in JSON format"""
+        Returns: Generated password (or list of passwords when count > 1) or error message in JSON format"""
         serializer = PasswordOptionsSerializer(data=request.data)
 
         try:
             serializer.is_valid(raise_exception=True)
         except ValidationError as e:
-            # Normalize DRF serializer errors to simple {'error': 'message'} format
-            error_message = None
-            if 'non_field_errors' in e.detail:
-                error_message = str(e.detail['non_field_errors'][0])
-            else:
-                # If there are field-specific errors, get the first one
-                for field, errors in e.detail.items():
-                    error_message = str(errors[0]) if isinstance(errors, list) else str(errors)
-                    break
+            return _validation_error_response(e)
 
-            return Response(
-                {'error': error_message or 'Validation error occurred'},
-                status=status.HTTP_400_BAD_REQUEST
+        opts = serializer.validated_data  # {'count': ..., 'length': ..., 'uppercase': ..., ...}
+        generate = _password_generator(opts)
+        if opts['stream']:
+            # One NDJSON line per password, generated and sent one chunk at a time
+            return StreamingHttpResponse(
+                iter_chunks(generate, opts['count'], 'ndjson'), content_type='application/x-ndjson'
             )
-
-        opts = serializer.validated_data  # {'length': ..., 'uppercase': ..., ...}
-        password = generate_password(**opts)
+        passwords = generate(opts['count'])
 
         # Check if password generation failed (shouldn't happen after validation, but just in case)
-        if password == 'Check at least one option!':
+        if not passwords:
             return Response(
                 {'error': 'Check at least one option to generate password!'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        return Response({'password': password}, status=status.HTTP_200_OK)
+        return Response(_generated_passwords_data(opts, passwords), status=status.HTTP_200_OK)
 
 
 class PasswordStrengthAPIView(APIView):
@@ -124,6 +197,13 @@ class PasswordStrengthAPIView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
+            # Only the first MAX_SCORED_LENGTH characters can be scored
+            if len(password) > MAX_SCORED_LENGTH:
+                return Response(
+                    {'error': f'Password must be at most {MAX_SCORED_LENGTH} characters.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
             # Calculate password strength using utils function
             result = password_strength(password)
 
@@ -147,3 +227,77 @@ class PasswordStrengthAPIView(APIView):
                 {'error': f'An error occurred while calculating password strength: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class PasswordStrengthBatchAPIView(APIView):
+    """REST API endpoint for calculating the strength of a batch of passwords"""
+    permission_classes = [AllowAny]  # Allow unauthenticated access
+
+    def post(self, request):
+        """REST API endpoint for calculating password strength for many passwords in one request
+        Returns: List of strength analyses in the same order as the input passwords in JSON format"""
+        serializer = PasswordStrengthBatchSerializer(data=request.data)
+
+        try:
+            serializer.is_valid(raise_exception=True)
+        except ValidationError as e:
+            return _validation_error_response(e)
+
+        try:
+            results = password_strength_batch(serializer.validated_data['passwords'])
+        except FileNotFoundError as e:
+            return Response(
+                {'error': f'Password strength analysis unavailable: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+class GeneratorStatusAPIView(APIView):
+    """REST API endpoint reporting whether the password dictionaries are loaded"""
+    permission_classes = [AllowAny]  # Allow unauthenticated access (readiness checks)
+
+    def get(self, request):
+        """REST API endpoint for the generator readiness check
+        Returns: Load status and size of every dictionary and the breach corpus, and whether the
+        shared dictionary structures are attached (bytes mapped vs private), 503 if any failed to load"""
+        breach = breach_status()
+        memory = dictionary_memory_status()
+        ready = password_dictionaries.ready and (breach['loaded'] or not breach['configured']) and memory['attached']
+        return Response(
+            {'ready': ready, 'dictionaries': password_dictionaries.status(), 'breach': breach, 'memory': memory},
+            status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+
+class BreachRangeAPIView(APIView):
+    """REST API endpoint for k-anonymity breach lookups by SHA-1 hash prefix"""
+    permission_classes = [AllowAny]  # Allow unauthenticated access
+
+    def get(self, request, prefix):
+        """REST API endpoint for breached password ranges, in the style of the Pwned Passwords range API
+        Returns: One "SUFFIX:COUNT" line per breached hash starting with the prefix in plain text"""
+        if not is_valid_prefix(prefix):
+            return Response(
+                {'error': 'Invalid hash prefix. Provide the first 5 hex characters of the SHA-1 hash.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        corpus = get_breach_corpus()
+        if corpus is None:
+            return Response(
+                {'error': 'Breach lookups are not configured on this server.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        try:
+            matches = corpus.range(prefix)
+        except (OSError, ValueError) as e:
+            return Response(
+                {'error': f'Breach lookups unavailable: {str(e)}'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        body = ''.join(f'{suffix}:{count}\r\n' for suffix, count in matches)
+        return HttpResponse(body, content_type='text/plain')
@@ -2,6 +2,7 @@
 ASGI config for password_manager project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+WebSocket connections are routed to the live password strength scorer (see generator/live.py).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -15,4 +16,9 @@ os.environ.setdefault(
     "DJANGO_SETTINGS_MODULE", "password_manager.settings.deployment"
 )
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after the app registry is ready
+from generator.live import websocket_router  # noqa: E402
+
+application = websocket_router(django_application)
@@ -169,3 +169,74 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Custom User model for authentication
 AUTH_USER_MODEL = "auth_service.User"
+
+# Vault key KDF for new accounts (see auth_service/utils/kdf.py), pick the parameters for the
+# deployment hardware with `manage.py calibrate_kdf`. Existing accounts keep their own.
+AUTH_KDF_ALGORITHM = env("AUTH_KDF_ALGORITHM", default="pbkdf2_sha256")
+AUTH_KDF_PARAMS = env.json("AUTH_KDF_PARAMS", default={"iterations": 600000})
+
+# Cache of authenticated users (see auth_service/utils/user_cache.py). Users kept per process
+# (0 disables the cache) and seconds an entry is trusted, capped at the access token lifetime
+AUTH_USER_CACHE_SIZE = env.int("AUTH_USER_CACHE_SIZE", default=1024)
+AUTH_USER_CACHE_TTL = env.int("AUTH_USER_CACHE_TTL", default=300)
+# Alias in CACHES of a shared backend for multi-instance deployments, empty for a per-process cache
+AUTH_USER_CACHE_BACKEND = env("AUTH_USER_CACHE_BACKEND", default="")
+
+# AUTH_VERIFIER_KEY, the key of the HMAC auth key verifiers (see auth_service/utils/hashing.py),
+# is set per environment like SECRET_KEY: local.py has a development default and deployment.py
+# requires it. It is a pepper kept out of the database; changing it invalidates every stored verifier.
+
+# Key derivation executor for login and registration (see auth_service/utils/kdf_executor.py).
+# The executor is per process and assumes a threaded or ASGI server; under sync gunicorn
+# workers each process submits one derivation at a time and the queue bound does nothing.
+# Concurrent derivations per process, keep this times the process count at or below the
+# instance vCPU count (one on the 1-vCPU F2 in app.yaml)
+AUTH_KDF_MAX_WORKERS = env.int("AUTH_KDF_MAX_WORKERS", default=1)
+# Derivations allowed to wait for a worker, further logins are rejected with 503. Each
+# waits up to a derivation time per queued login ahead of it, so keep this small
+AUTH_KDF_MAX_QUEUE = env.int("AUTH_KDF_MAX_QUEUE", default=4)
+# Seconds a derivation may wait for a worker before it is rejected with 503
+AUTH_KDF_QUEUE_TIMEOUT = env.float("AUTH_KDF_QUEUE_TIMEOUT", default=5.0)
+# Retry-After seconds sent with 503 responses when the executor is saturated
+AUTH_KDF_RETRY_AFTER = env.int("AUTH_KDF_RETRY_AFTER", default=5)
+
+# Password generator configuration
+# Maximum number of passwords accepted by the batch strength endpoint
+GENERATOR_STRENGTH_BATCH_MAX = env.int("GENERATOR_STRENGTH_BATCH_MAX", default=500)
+# Maximum number of characters across all passwords of a strength batch
+GENERATOR_STRENGTH_BATCH_MAX_CHARS = env.int("GENERATOR_STRENGTH_BATCH_MAX_CHARS", default=32768)
+# Common password corpora used by the strength calculator (see generator/dictionaries.py)
+GENERATOR_PASSWORD_DICTIONARIES = [
+    {
+        "NAME": "ncsc-100k",
+        "BACKEND": "generator.dictionaries.BinaryIndexProvider",
+        "OPTIONS": {"path": BASE_DIR / "generator" / "misc" / "common_passwords.idx"},
+    },
+]
+# Breach corpus built with `manage.py build_breach_index` (k-anonymity range endpoint)
+GENERATOR_BREACH_CORPUS_PATH = env("GENERATOR_BREACH_CORPUS_PATH", default=None)
+# Optional Bloom filter built with `manage.py build_bloom_filter` in front of the breach corpus
+GENERATOR_BREACH_BLOOM_PATH = env("GENERATOR_BREACH_BLOOM_PATH", default=None)
+# Named password policies accepted by the generator API (see generator/policy.py)
+GENERATOR_PASSWORD_POLICIES = {
+    "default": {"length": 15, "uppercase": True, "lowercase": True, "numbers": True, "special": True},
+    "pin": {"length": 6, "numbers": True},
+    "readable": {
+        "length": 20, "uppercase": True, "lowercase": True, "numbers": True, "exclude_ambiguous": True,
+    },
+    "strict": {
+        "length": 24, "min_uppercase": 2, "min_lowercase": 2, "min_numbers": 2, "min_special": 2,
+        "symbols": "!@#$%^&*-_=+?",
+    },
+}
+# Maximum count for streamed (NDJSON) generation requests, non-streamed requests allow 1000
+GENERATOR_STREAM_MAX_COUNT = env.int("GENERATOR_STREAM_MAX_COUNT", default=5000)
+# Attacker models for crack-time estimates in guesses per second (see generator/crack_time.py)
+GENERATOR_ATTACKER_MODELS = {
+    # Rate-limited login form
+    "online_throttled": 100 / 3600,
+    # Stolen hashes with a slow, salted hash (bcrypt, scrypt, Argon2, high-iteration PBKDF2)
+    "offline_slow_hash": 1e4,
+    # Stolen unsalted fast hashes (MD5, SHA-1) on a GPU cluster
+    "offline_fast_hash": 1e10,
+}
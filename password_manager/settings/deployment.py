@@ -6,6 +6,7 @@ Uses Cloud SQL (PostgreSQL) and enforces security settings.
 from .base import *
 
 import logging
+from django.core.exceptions import ImproperlyConfigured
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -61,6 +62,18 @@ if not SECRET_KEY:
     logger.error(error_msg)
     raise RuntimeError(error_msg)
 
+# SECURITY WARNING: keep the auth verifier key used in production secret!
+AUTH_VERIFIER_KEY = _get_secret_or_env("AUTH_VERIFIER_KEY")
+
+if not AUTH_VERIFIER_KEY:
+    error_msg = (
+        "CRITICAL ERROR: AUTH_VERIFIER_KEY is not set! "
+        "Please ensure the AUTH_VERIFIER_KEY secret exists in Google Secret Manager; "
+        "auth key verifiers must not be stored without a pepper."
+    )
+    logger.error(error_msg)
+    raise ImproperlyConfigured(error_msg)
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = False
 
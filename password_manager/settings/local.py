@@ -17,6 +17,12 @@ SECRET_KEY = env(
     default="django-insecure-dev-key-change-in-production-do-not-use-in-production",
 )
 
+# SECURITY WARNING: keep the auth verifier key used in production secret!
+AUTH_VERIFIER_KEY = env(
+    "AUTH_VERIFIER_KEY",
+    default="django-insecure-dev-verifier-key-do-not-use-in-production",
+)
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = env.bool("DEBUG", default=True)
 